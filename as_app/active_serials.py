@@ -0,0 +1,59 @@
+import threading
+
+from .utils.cache_version import bump_version, get_version
+
+# ──────────────────────────────────────────────
+# 활성 티켓 (장비, 시리얼) 집합 — 프로세스 메모리 캐시
+# 바코드 스캔 입고는 스캔마다 "이미 입고/수리 중인 장비인지"를 바로 알려줘야 하므로
+# 활성 티켓의 {tool_id: {시리얼, ...}}을 프로세스 메모리에 올려 두고 티켓 테이블 조회 없이 판정한다.
+# 여러 프로세스가 같은 데이터를 보도록 공유 캐시에 버전을 두고, 티켓 저장/삭제 시그널과
+# ASTicket QuerySet의 일괄 변경에서 bump_active_serials_version()으로 버전을 올린다.
+# 버전이 바뀌면 다음 조회 때 활성 티켓을 쿼리 1회로 다시 읽는다.
+# 최종 중복 방지는 DB 유일 제약(asticket_active_serial_uniq)이 담당한다.
+# ──────────────────────────────────────────────
+
+ACTIVE_SERIALS_VERSION_KEY = "as_app:active_serials_version"
+
+# 이 필드가 바뀌면 활성 (장비, 시리얼) 집합이 달라진다
+TRACKED_FIELDS = frozenset({"status", "tool", "tool_id", "serial_number"})
+
+_lock = threading.Lock()
+_snapshot = (None, {})
+
+
+def bump_active_serials_version():
+    """활성 시리얼 집합 무효화 (트랜잭션 커밋 이후 실행)"""
+    bump_version(ACTIVE_SERIALS_VERSION_KEY)
+
+
+def _load_active_serials():
+    from .models import ASTicket
+
+    serials = {}
+    rows = (
+        ASTicket.objects.filter(status__in=ASTicket.ACTIVE_STATUSES)
+        .exclude(serial_number__startswith=ASTicket.NO_SERIAL_PREFIX)
+        .order_by()
+        .values_list("tool_id", "serial_number")
+        .iterator(chunk_size=5000)
+    )
+    for tool_id, serial in rows:
+        serials.setdefault(tool_id, set()).add(serial)
+    return serials
+
+
+def active_serials():
+    """현재 버전의 {tool_id: {시리얼, ...}} (버전이 같으면 메모리 값 재사용)"""
+    global _snapshot
+
+    version = get_version(ACTIVE_SERIALS_VERSION_KEY)
+    if _snapshot[0] != version:
+        with _lock:
+            if _snapshot[0] != version:
+                _snapshot = (version, _load_active_serials())
+    return _snapshot[1]
+
+
+def is_active_serial(tool_id, serial):
+    """(장비, 시리얼)이 입고/수리의뢰/수리완료/수리보류 티켓에 이미 있는지"""
+    return serial.strip() in active_serials().get(tool_id, ())
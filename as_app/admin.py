@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import IntegrityError, transaction
 from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse, path
 from django.utils import timezone
@@ -102,6 +103,50 @@ class CompositeDisplayMixin:
         )
 
 
+class TicketTransitionMixin:
+    """상태 변경 액션 공용 — as_app.transitions의 전이를 적용하고 결과를 메시지로 안내"""
+
+    def _apply_transition(self, request, queryset, name, on=None, strict=True):
+        """전이 적용 후 변경 건수 반환 (거부/충돌로 변경하지 않았으면 None)
+
+        strict=True(기본)면 출발 상태가 아닌 항목이 섞여 있을 때 전체를 처리하지 않는다.
+        """
+        from django.contrib import messages
+
+        result = queryset.apply_transition(name, on=on, strict=strict)
+        transition = result.transition
+        if result.rejected:
+            invalid_items = ", ".join(
+                f"{t.tool} (S/N: {t.serial_number}, 현재: {t.get_status_display()})"
+                for t in result.rejected
+            )
+            remaining = result.rejected_count - len(result.rejected)
+            extra = f" 외 {remaining}건" if remaining > 0 else ""
+            sources = "/".join(ASTicket.Status(status).label for status in transition.sources)
+            if strict:
+                messages.error(
+                    request,
+                    f"'{transition.label}' 처리할 수 없는 상태의 항목이 포함되어 있습니다: {invalid_items}{extra}. "
+                    f"{sources} 상태인 항목만 선택해 주세요."
+                )
+                return None
+            messages.warning(
+                request,
+                f"{sources} 상태가 아닌 항목은 제외되었습니다: {invalid_items}{extra}"
+            )
+        if result.blocked:
+            if result.conflicts:
+                messages.error(
+                    request,
+                    "이미 입고/수리 중인 장비가 있어 되돌릴 수 없습니다: %s"
+                    % ", ".join("%s (S/N: %s)" % (t.tool, t.serial_number) for t in result.conflicts)
+                )
+            else:
+                messages.error(request, "선택 항목 중 같은 장비/시리얼 번호가 중복되어 있어 함께 되돌릴 수 없습니다.")
+            return None
+        return result.updated
+
+
 from .models import (
     ASHistory,
     ASTicket,
@@ -124,6 +169,8 @@ from .models import (
     Tool,
 )
 from .forms import ASTicketForm, PartForm
+from .utils.keyset_pagination import KeysetPaginationMixin
+from .utils.xlsx_export import XlsxColumn, xlsx_response
 
 
 
@@ -294,21 +341,24 @@ class PartAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
         return tuple(fs)
 
     def save_related(self, request, form, formsets, change):
+        """단가 그룹별 금액 저장 — 입력된 단가는 일괄 upsert 1회, 비운 단가는 DELETE 1회"""
         super().save_related(request, form, formsets, change)
         if isinstance(form, PartForm):
+            from .models import PartPrice
+            from .pricing import upsert_part_prices
+            entries = []
+            cleared = []
             for cat in form.categories:
-                field_name = f'price_group_{cat.id}'
-                price_val = form.cleaned_data.get(field_name)
+                price_val = form.cleaned_data.get(f'price_group_{cat.id}')
                 if price_val is not None:
-                    from .models import PartPrice
-                    PartPrice.objects.update_or_create(
-                        part=form.instance,
-                        category=cat,
-                        defaults={'price': price_val}
-                    )
+                    entries.append((form.instance.pk, cat.id, price_val))
                 else:
-                    from .models import PartPrice
-                    PartPrice.objects.filter(part=form.instance, category=cat).delete()
+                    cleared.append(cat.id)
+            upsert_part_prices(entries)
+            if cleared:
+                PartPrice.objects.filter(part=form.instance, category_id__in=cleared).delete()
+            # 저장 메시지/변경 이력(LogEntry)에 갱신된 기본 단가가 표시되도록 다시 읽음
+            form.instance.refresh_from_db(fields=["default_price"])
 
 
 
@@ -317,7 +367,7 @@ class PartAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
     @admin.display(description="적용 장비")
     def display_tools(self, obj):
         tools = obj.tools.all()
-        count = tools.count()
+        count = len(tools)
         if count == 0:
             return "공용 (전체 적용)"
         elif count == 1:
@@ -341,7 +391,8 @@ class PartAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
 
     @admin.display(description="단가")
     def formatted_price(self, obj):
-        group_prices = list(obj.group_prices.select_related('category').all().order_by('category__name'))
+        # get_queryset에서 prefetch한 단가 그룹을 사용 (행마다 추가 쿼리 없음)
+        group_prices = sorted(obj.group_prices.all(), key=lambda gp: gp.category.name)
         
         # 1. 단가가 한 개도 없을 경우 (기본값)
         if not group_prices:
@@ -372,11 +423,93 @@ class PartAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
         """
         return format_html(html)
 
+    def get_queryset(self, request):
+        """브랜드/단가 그룹/적용 장비를 함께 읽어 목록 행마다 추가 쿼리가 없도록 함"""
+        from django.db.models import Prefetch
+        from .models import PartPrice
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("brand")
+            .prefetch_related(
+                Prefetch("group_prices", queryset=PartPrice.objects.select_related("category")),
+                Prefetch("tools", queryset=Tool.objects.select_related("brand")),
+            )
+        )
+
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
         extra_context["active_tab"] = "part"
         return super().changelist_view(request, extra_context)
 
+    def get_urls(self):
+        """단가표 일괄 등록 / 단가표 양식 다운로드 엔드포인트 추가"""
+        custom_urls = [
+            path(
+                "import-prices/",
+                self.admin_site.admin_view(self.import_prices_view),
+                name="as_app_part_import_prices",
+            ),
+            path(
+                "export-prices/",
+                self.admin_site.admin_view(self.export_prices_view),
+                name="as_app_part_export_prices",
+            ),
+        ]
+        return custom_urls + super().get_urls()
+
+    def import_prices_view(self, request):
+        """단가표(CSV/XLSX: 부품코드 × 단가 그룹 열) 업로드 → PartPrice 일괄 upsert"""
+        from django.contrib import messages
+        from django.core.exceptions import PermissionDenied
+        from django.template.response import TemplateResponse
+        from .utils.price_sheet import PriceSheetError, import_price_sheet, read_price_sheet
+
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        if request.method == "POST":
+            uploaded = request.FILES.get("price_sheet")
+            if not uploaded:
+                messages.error(request, "업로드할 단가표 파일을 선택해주세요.")
+                return HttpResponseRedirect(request.get_full_path())
+            try:
+                with transaction.atomic():
+                    result = import_price_sheet(read_price_sheet(uploaded))
+            except PriceSheetError as exc:
+                messages.error(request, f"⚠️ {exc}")
+                return HttpResponseRedirect(request.get_full_path())
+
+            messages.success(request, result.summary())
+            for warning in result.warnings():
+                messages.warning(request, f"⚠️ {warning}")
+            return HttpResponseRedirect(reverse("admin:as_app_part_changelist"))
+
+        context = dict(
+            self.admin_site.each_context(request),
+            title="단가표 일괄 등록",
+            opts=self.model._meta,
+            categories=CompanyCategory.objects.order_by("name").values_list("name", flat=True),
+        )
+        return TemplateResponse(request, "admin/as_app/part/import_prices.html", context)
+
+    def export_prices_view(self, request):
+        """현재 단가표를 일괄 등록 양식(부품코드 × 단가 그룹 열)으로 다운로드"""
+        from .pricing import get_price_matrix
+
+        categories = list(CompanyCategory.objects.order_by("name"))
+        matrix = get_price_matrix()
+        columns = [
+            XlsxColumn("부품코드", lambda p: p.code, width=18),
+            XlsxColumn("부품명", lambda p: p.name, width=30),
+        ] + [
+            XlsxColumn(cat.name, lambda p, cat_id=cat.id: matrix.price(p.pk, cat_id), width=12)
+            for cat in categories
+        ]
+        parts = Part.objects.exclude(code="").order_by("code").only("pk", "code", "name")
+        filename = f"단가표_{timezone.now().strftime('%Y%m%d_%H%M')}.xlsx"
+        return xlsx_response(filename, columns, parts, sheet_title="단가표")
+
 
 @admin.register(RepairPreset)
 class RepairPresetAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
@@ -431,7 +564,7 @@ class RepairPresetAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
     @admin.display(description="적용 장비")
     def display_tools(self, obj):
         tools = obj.tools.all()
-        count = tools.count()
+        count = len(tools)
         if count == 0:
             return "공용 (전체 적용)"
         elif count == 1:
@@ -451,6 +584,23 @@ class RepairPresetAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
             """
             return format_html(html)
 
+    def get_queryset(self, request):
+        """포함 부품/적용 장비를 함께 읽어 목록 행마다 추가 쿼리가 없도록 함
+
+        합계 금액은 with_totals()가 서브쿼리로 annotate한 parts_total을 사용한다.
+        """
+        from django.db.models import Prefetch
+        return (
+            super()
+            .get_queryset(request)
+            .with_totals()
+            .select_related("brand")
+            .prefetch_related(
+                Prefetch("parts", queryset=Part.objects.only("id", "name", "part_type", "default_price")),
+                Prefetch("tools", queryset=Tool.objects.select_related("brand")),
+            )
+        )
+
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
         extra_context["active_tab"] = "preset"
@@ -594,21 +744,165 @@ class InboundBatchAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
         ),
     )
 
-    @admin.display(description="품목 수")
+    @admin.display(description="품목 수", ordering="ticket_count")
     def display_ticket_count(self, obj):
-        count = obj.tickets.count()
-        return "%d건" % count
+        return "%d건" % obj.ticket_count
 
     @admin.display(description="입고 장비")
     def display_tools_summary(self, obj):
-        tools = obj.tickets.select_related("tool", "tool__brand").values_list(
-            "tool__brand__name", "tool__model_name"
-        ).distinct()
-        if tools:
-            items = ["%s > %s" % (b, m) for b, m in tools[:3]]
-            suffix = " 외 %d건" % (tools.count() - 3) if tools.count() > 3 else ""
-            return ", ".join(items) + suffix
-        return "-"
+        return obj.tools_summary or "-"
+
+    # ── 바코드 스캔 입고 ──
+    # 스캔 화면은 시리얼을 브라우저에 모아 두고 스캔마다 scan/check/로 중복만 확인한 뒤
+    # scan/commit/으로 배치 + 티켓 전체를 한 트랜잭션에 등록한다.
+    # 스캔 확인은 프로세스 메모리의 활성 시리얼 집합(as_app.active_serials)만 보고 티켓 테이블은 조회하지 않는다.
+
+    SCAN_COMMIT_LIMIT = 1000
+
+    def get_urls(self):
+        """바코드 스캔 입고 화면 / 스캔 확인 / 일괄 등록 엔드포인트 추가"""
+        custom_urls = [
+            path(
+                "scan/",
+                self.admin_site.admin_view(self.scan_intake_view),
+                name="as_app_inboundbatch_scan",
+            ),
+            path(
+                "scan/check/",
+                self.admin_site.admin_view(self.scan_check_view),
+                name="as_app_inboundbatch_scan_check",
+            ),
+            path(
+                "scan/commit/",
+                self.admin_site.admin_view(self.scan_commit_view),
+                name="as_app_inboundbatch_scan_commit",
+            ),
+        ]
+        return custom_urls + super().get_urls()
+
+    def scan_intake_view(self, request):
+        """바코드 스캔 입고 화면 (입고 공통 정보 + 장비 선택 + 스캔 목록)"""
+        from django.core.exceptions import PermissionDenied
+        from django.template.response import TemplateResponse
+
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = self.get_form(request)()
+        context = dict(
+            self.admin_site.each_context(request),
+            title="바코드 스캔 입고",
+            opts=self.model._meta,
+            form=form,
+            media=form.media,
+            brands=Brand.objects.order_by("name").values_list("id", "name"),
+        )
+        return TemplateResponse(request, "admin/as_app/inboundbatch/scan_intake.html", context)
+
+    def scan_check_view(self, request):
+        """스캔 1건 확인 — ?tool=<장비 id>&serial=<시리얼> → {"ok", "serial", "message"}"""
+        from django.core.exceptions import PermissionDenied
+        from .active_serials import is_active_serial
+
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        serial = request.GET.get("serial", "").strip()
+        try:
+            tool_id = int(request.GET.get("tool", ""))
+        except ValueError:
+            return JsonResponse({"ok": False, "serial": serial, "message": "장비를 먼저 선택해 주세요."}, status=400)
+        if not serial:
+            return JsonResponse({"ok": False, "serial": serial, "message": "시리얼 번호가 비어 있습니다."}, status=400)
+        if is_active_serial(tool_id, serial):
+            return JsonResponse({"ok": False, "serial": serial, "message": "이미 입고/수리 중인 장비입니다."})
+        return JsonResponse({"ok": True, "serial": serial})
+
+    def scan_commit_view(self, request):
+        """스캔 목록 일괄 등록 — JSON {inbound_date, company, manager, items: [{tool, serial}, ...]}
+
+        배치 생성 + 티켓 bulk_create + 배치 카운터 갱신을 한 트랜잭션으로 처리한다.
+        활성 티켓과 겹치는 항목이 있으면 아무것도 저장하지 않고 409와 충돌 목록을 반환한다.
+        """
+        import json
+        from django.core.exceptions import PermissionDenied
+        from django.http import HttpResponseNotAllowed
+        from .active_serials import is_active_serial
+
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        try:
+            payload = json.loads(request.body)
+            items = [(int(item["tool"]), str(item["serial"]).strip()) for item in payload.get("items", [])]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return JsonResponse({"error": "요청 형식이 올바르지 않습니다."}, status=400)
+
+        form = self.get_form(request)(data=payload)
+        if not form.is_valid():
+            errors = "; ".join(
+                "%s: %s" % (form.fields[name].label if name in form.fields else name, " ".join(field_errors))
+                for name, field_errors in form.errors.items()
+            )
+            return JsonResponse({"error": errors}, status=400)
+        if not items:
+            return JsonResponse({"error": "등록할 스캔 항목이 없습니다."}, status=400)
+        if len(items) > self.SCAN_COMMIT_LIMIT:
+            return JsonResponse(
+                {"error": "한 번에 %d건까지 등록할 수 있습니다." % self.SCAN_COMMIT_LIMIT}, status=400
+            )
+        if any(not serial for _, serial in items) or len(set(items)) != len(items):
+            return JsonResponse({"error": "비어 있거나 중복된 시리얼이 있습니다."}, status=400)
+
+        tools = Tool.objects.select_related("brand").in_bulk({tool_id for tool_id, _ in items})
+        if len(tools) != len({tool_id for tool_id, _ in items}):
+            return JsonResponse({"error": "존재하지 않는 장비가 포함되어 있습니다."}, status=400)
+
+        def conflict_response(pairs):
+            return JsonResponse({
+                "error": "이미 입고/수리 중인 장비가 있어 저장하지 않았습니다.",
+                "conflicts": [
+                    {"tool": tool_id, "serial": serial, "label": "%s (S/N: %s)" % (tools[tool_id], serial)}
+                    for tool_id, serial in items
+                    if (tool_id, serial) in pairs
+                ],
+            }, status=409)
+
+        conflicts = {(tool_id, serial) for tool_id, serial in items if is_active_serial(tool_id, serial)}
+        if conflicts:
+            return conflict_response(conflicts)
+
+        try:
+            with transaction.atomic():
+                batch = form.save()
+                tickets = [
+                    ASTicket(
+                        inbound_batch=batch,
+                        inbound_date=batch.inbound_date,
+                        company=batch.company,
+                        manager=batch.manager,
+                        tool=tools[tool_id],
+                        serial_number=serial,
+                        status=ASTicket.Status.INBOUND,
+                    )
+                    for tool_id, serial in items
+                ]
+                self._bulk_create_tickets(request, batch, tickets)
+                batch.refresh_counters()
+        except IntegrityError as exc:
+            # 메모리 집합 갱신 전에 다른 입고와 겹친 경우 — DB 유일 제약 기준으로 다시 안내
+            if not ASTicket.is_duplicate_serial_error(exc):
+                raise
+            return conflict_response(ASTicket.objects.active_serial_conflicts(items))
+
+        self.log_addition(request, batch, [{"added": {}}])
+        return JsonResponse({
+            "batch": batch.pk,
+            "created": len(tickets),
+            "message": "입고 등록이 완료되었습니다. (%s)" % batch,
+        })
 
     def response_add(self, request, obj, post_url_continue=None):
         """저장 후 목록 대신 새 입고 등록 폼으로 리다이렉트"""
@@ -649,6 +943,45 @@ class InboundBatchAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
         messages.error(request, error_message)
         request._formset_validation_failed = True
 
+    def _active_serial_conflict_labels(self, expanded, created):
+        """저장 실패 후 기존 활성 티켓과 겹치는 품목 라벨 목록 (단일 쿼리)
+
+        롤백된 bulk_create 행의 pk는 남아 있을 수 있으므로 기존 티켓 pk만 제외 대상으로 쓴다.
+        """
+        created_ids = {id(instance) for instance in created}
+        conflict_pairs = ASTicket.objects.active_serial_conflicts(
+            ((instance.tool_id, instance.serial_number.strip()) for instance in expanded),
+            exclude_pks=[instance.pk for instance in expanded if id(instance) not in created_ids],
+        )
+        return [
+            "%s (S/N: %s)" % (instance.tool, instance.serial_number)
+            for instance in expanded
+            if (instance.tool_id, instance.serial_number.strip()) in conflict_pairs
+        ]
+
+    def _bulk_create_tickets(self, request, batch, tickets):
+        """신규 티켓 일괄 INSERT + 후속 처리(LogEntry, 시그널)를 묶음 단위로 실행
+
+        bulk_create는 post_save 시그널과 admin 로그를 남기지 않으므로
+        LogEntry는 log_actions로 한 번에 기록하고 tickets_bulk_created 시그널을 1회 보낸다.
+        (대시보드 캐시 무효화는 ASTicketQuerySet.bulk_create에서 처리)
+        """
+        if not tickets:
+            return
+        from django.contrib.admin.models import ADDITION, LogEntry
+        from .signals import tickets_bulk_created
+
+        ASTicket.objects.bulk_create(tickets, batch_size=500)
+        LogEntry.objects.log_actions(
+            user_id=request.user.pk,
+            queryset=tickets,
+            action_flag=ADDITION,
+            change_message=[{"added": {}}],
+        )
+        tickets_bulk_created.send(
+            sender=ASTicket, tickets=tickets, batch=batch, user=request.user,
+        )
+
     def save_formset(self, request, form, formset, change):
         """인라인 저장 시 배치의 공통 정보를 각 티켓에 자동 복사 + 쉼표 시리얼 분리 + 중복 검증"""
         instances = formset.save(commit=False)
@@ -674,14 +1007,14 @@ class InboundBatchAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
 
             if no_sn:
                 # 첫 번째는 원래 인스턴스에 할당
-                instance.serial_number = f"없음-{uuid.uuid4().hex[:6]}"
+                instance.serial_number = f"{ASTicket.NO_SERIAL_PREFIX}{uuid.uuid4().hex[:6]}"
                 expanded.append(instance)
                 # 나머지는 새 티켓으로 생성
                 for _ in range(qty - 1):
                     new_ticket = ASTicket(
                         inbound_batch=batch,
                         tool=instance.tool,
-                        serial_number=f"없음-{uuid.uuid4().hex[:6]}",
+                        serial_number=f"{ASTicket.NO_SERIAL_PREFIX}{uuid.uuid4().hex[:6]}",
                     )
                     expanded.append(new_ticket)
             elif instance.serial_number:
@@ -723,46 +1056,37 @@ class InboundBatchAdmin(CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
             )
             return
 
-        # 2) 기존 활성 티켓과 중복 체크
-        active_statuses = [
-            ASTicket.Status.INBOUND,
-            ASTicket.Status.OUTSOURCED,
-            ASTicket.Status.REPAIRED,
-            ASTicket.Status.HOLD,
-        ]
-        conflicts = []
-        for instance in expanded:
-            if instance.tool_id and instance.serial_number:
-                qs = ASTicket.objects.filter(
-                    tool=instance.tool,
-                    serial_number=instance.serial_number.strip(),
-                    status__in=active_statuses,
-                )
-                if instance.pk:
-                    qs = qs.exclude(pk=instance.pk)
-                if qs.exists():
-                    conflicts.append(
-                        "%s (S/N: %s)" % (instance.tool, instance.serial_number)
-                    )
-
-        if conflicts:
-            self._fail_formset_validation(
-                request, form,
-                "이미 입고/수리 중인 장비가 있어 저장할 수 없습니다: %s" % ", ".join(conflicts)
-            )
-            return
-
         # ── 검증 통과 → 저장 ──
-        saved_count = 0
+        # 2) 기존 활성 티켓과의 중복은 DB 유일 제약(asticket_active_serial_uniq)이 막는다.
+        #    동시 입고로 충돌해도 배치 전체가 롤백되고 충돌 항목만 다시 조회해 안내한다.
         for instance in expanded:
             instance.inbound_date = batch.inbound_date
             instance.company = batch.company
             instance.manager = batch.manager
             instance.status = ASTicket.Status.INBOUND
-            instance.save()
-            saved_count += 1
+        saved_count = len(expanded)
+        created = [instance for instance in expanded if not instance.pk]
 
-        formset.save_m2m()
+        try:
+            with transaction.atomic():
+                # 수정 화면의 기존 티켓만 개별 저장, 신규 티켓은 일괄 INSERT
+                for instance in expanded:
+                    if instance.pk:
+                        instance.save()
+                self._bulk_create_tickets(request, batch, created)
+                formset.save_m2m()
+                batch.refresh_counters()
+        except IntegrityError as exc:
+            if not ASTicket.is_duplicate_serial_error(exc):
+                raise
+            conflicts = self._active_serial_conflict_labels(expanded, created)
+            self._fail_formset_validation(
+                request, form,
+                "이미 입고/수리 중인 장비가 있어 저장할 수 없습니다: %s" % ", ".join(conflicts)
+                if conflicts else
+                "다른 입고 등록과 동시에 같은 장비가 저장되었습니다. 다시 시도해 주세요."
+            )
+            return
 
         # 쉼표 분리로 추가 생성된 경우 안내 메시지
         original_count = len(instances)
@@ -910,10 +1234,7 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
         from .widgets import PartsTableWidget
         form = super().get_form(request, obj, **kwargs)
         if obj and obj.tool_id:
-            from django.db.models import Q
-            parts_qs = Part.objects.filter(
-                Q(tools=obj.tool) | Q(tools__isnull=True)
-            ).distinct().order_by("part_type", "name")
+            parts_qs = Part.objects.for_tool(obj.tool_id).order_by("part_type", "name")
             form.base_fields["selected_parts"].queryset = parts_qs
 
             # 단가 그룹 유무 체크
@@ -930,12 +1251,15 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
                 form.base_fields["selected_parts"].widget = PartsTableWidget(disabled_message=msg)
             else:
                 # 부품 메타데이터 구성 (업체 단가 그룹 반영)
+                from .pricing import get_price_matrix
+                parts = list(parts_qs)
+                part_prices = get_price_matrix().prices_for_company([p.id for p in parts], obj.company)
                 parts_data = {}
-                for p in parts_qs:
+                for p in parts:
                     parts_data[p.id] = {
                         "name": p.name,
                         "code": p.code,
-                        "price": p.get_price_for_company(obj.company),
+                        "price": part_prices[p.id],
                         "part_type": p.part_type,
                     }
 
@@ -981,15 +1305,8 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
         obj = form.instance
 
         if "selected_parts" in form.cleaned_data:
-            selected_parts = form.cleaned_data["selected_parts"]
-            current_parts = set(obj.used_parts.all())
-            new_parts = set(selected_parts)
-
-            # ── 미설정 단가 부품 차단 ──
-            missing_price_parts = [
-                p for p in new_parts
-                if p.get_price_for_company(obj.company) is None
-            ]
+            # ── 미설정 단가 부품 차단 (단가 미설정 부품은 저장하지 않고 기존 등록분도 제거) ──
+            missing_price_parts = obj.snapshot_used_parts(form.cleaned_data["selected_parts"])
             if missing_price_parts:
                 group_name = obj.company.price_group.name if (obj.company and obj.company.price_group) else "미지정"
                 part_names = ", ".join(p.name for p in missing_price_parts)
@@ -999,25 +1316,9 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
                     f"⚠️ 다음 부품의 [{group_name}] 단가가 설정되지 않았습니다: {part_names}. "
                     f"부품 관리에서 해당 단가 그룹의 가격을 먼저 입력해주세요."
                 )
-                # 단가 미설정 부품은 저장하지 않음 — 기존에 이미 등록된 것도 제거
-                obj.ticket_used_parts.filter(part__in=missing_price_parts).delete()
-                new_parts -= set(missing_price_parts)
-
-            # Remove unselected parts
-            to_remove = current_parts - new_parts
-            if to_remove:
-                obj.ticket_used_parts.filter(part__in=to_remove).delete()
-            
-            # Add newly selected parts with current snapshot price
-            to_add = new_parts - current_parts
-            for part in to_add:
-                price = part.get_price_for_company(obj.company)
-                obj.ticket_used_parts.create(part=part, applied_price=price)
-
-        # 기존 부품 선택 로직 (수리완료) - 스냅샷 단가 기준 합산
-        total_parts = sum(tup.applied_price for tup in obj.ticket_used_parts.all())
-        nego_price = int(total_parts * 0.9)  # 네고가 (10% 할인)
-        total_with_vat = int(nego_price * 1.1)  # 부가세 10% 포함
+
+        # 기존 부품 선택 로직 (수리완료) - 스냅샷 단가 기준 합산 (네고가 10% 할인 + 부가세 10%)
+        total_with_vat = obj.parts_repair_cost()
         update_fields = []
         if obj.repair_cost != total_with_vat:
             obj.repair_cost = total_with_vat
@@ -1045,16 +1346,15 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
         context["show_save_and_continue"] = False
         # 프리셋 데이터를 context에 추가
         if obj and obj.tool_id:
-            from django.db.models import Q
-            presets = RepairPreset.objects.filter(
-                Q(tools=obj.tool) | Q(tools__isnull=True)
-            ).distinct().prefetch_related("parts")
+            presets = RepairPreset.objects.for_tool(obj.tool_id).prefetch_related("parts")
+            from .pricing import get_price_matrix
+            matrix = get_price_matrix()
             preset_data = []
             for preset in presets:
                 parts = preset.parts.all()
                 part_ids = [p.id for p in parts if p.part_type == 'part']
                 labor_ids = [p.id for p in parts if p.part_type == 'labor']
-                company_total = sum((p.get_price_for_company(obj.company) or 0) for p in parts)
+                company_total = matrix.total_for_company([p.id for p in parts], obj.company)
                 preset_data.append({
                     "id": preset.id,
                     "name": preset.name,
@@ -1064,14 +1364,11 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
                 })
             context["repair_presets"] = preset_data
             # 부품/공임 구분 정보를 별도로 전달 (체크박스에 data 속성 부여용)
-            from django.db.models import Q as Q2
-            all_parts = Part.objects.filter(
-                Q2(tools=obj.tool) | Q2(tools__isnull=True)
-            ).distinct().prefetch_related('group_prices')
+            all_parts = Part.objects.for_tool(obj.tool_id).only("id", "part_type")
             
             parts_meta = []
             for p in all_parts:
-                p_price = p.get_price_for_company(obj.company)
+                p_price = matrix.price(p.id, obj.company.price_group_id if obj.company else None)
                 parts_meta.append({"id": p.id, "part_type": p.part_type, "price": p_price})
             context["parts_meta"] = parts_meta
         else:
@@ -1097,19 +1394,48 @@ class RepairTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixi
         custom_urls = [
             path(
                 "api/parts-for-tool/<int:tool_id>/",
-                self.admin_site.admin_view(self.api_parts_for_tool),
+                # cacheable: admin_view 기본 never_cache(no-store) 대신 ETag 재검증을 사용
+                self.admin_site.admin_view(self.api_parts_for_tool, cacheable=True),
                 name="api_parts_for_tool",
             ),
         ]
         return custom_urls + super().get_urls()
 
     def api_parts_for_tool(self, request, tool_id):
-        """특정 장비에 적용 가능한 부품 목록을 JSON으로 반환"""
-        from django.db.models import Q
-        parts = Part.objects.filter(
-            Q(tools__id=tool_id) | Q(tools__isnull=True)
-        ).distinct().values("id", "name", "code", "price")
-        return JsonResponse({"parts": list(parts)})
+        """특정 장비에 적용 가능한 부품 목록을 JSON으로 반환
+
+        ?company=<매출처 id> 또는 ?price_group=<단가 그룹 id>를 주면 해당 단가 그룹 단가를,
+        없으면 기본 단가를 price로 반환한다.
+        카탈로그 버전 기반 ETag/Last-Modified를 제공하므로 변경이 없으면 304로 응답한다.
+        """
+        from django.http import HttpResponseBadRequest
+        from django.utils.cache import get_conditional_response, patch_cache_control
+        from django.utils.http import http_date
+        from .catalog import get_catalog_version, tool_parts_payload
+
+        try:
+            company_id = int(request.GET.get("company") or 0)
+            category_id = int(request.GET.get("price_group") or 0)
+        except ValueError:
+            return HttpResponseBadRequest("company / price_group 파라미터는 숫자여야 합니다.")
+        if company_id:
+            category_id = Company.objects.filter(pk=company_id).values_list("price_group_id", flat=True).first() or 0
+
+        version = get_catalog_version()
+        etag = f'"parts-{tool_id}-{category_id}-{version}"'
+        last_modified = version // 1_000_000
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = JsonResponse({
+                "tool_id": tool_id,
+                "price_group": category_id or None,
+                "parts": tool_parts_payload(tool_id, category_id, version=version),
+            })
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # 브라우저 캐시는 유지하되 매번 재검증(조건부 요청)하도록 지정
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 
 @admin.register(HoldTicket)
@@ -1190,10 +1516,7 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
         from .widgets import PartsTableWidget
         form = super().get_form(request, obj, **kwargs)
         if obj and obj.tool_id:
-            from django.db.models import Q
-            parts_qs = Part.objects.filter(
-                Q(tools=obj.tool) | Q(tools__isnull=True)
-            ).distinct().order_by("part_type", "name")
+            parts_qs = Part.objects.for_tool(obj.tool_id).order_by("part_type", "name")
             form.base_fields["selected_parts"].queryset = parts_qs
 
             has_category = obj.company and obj.company.price_group
@@ -1207,12 +1530,15 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
                 )
                 form.base_fields["selected_parts"].widget = PartsTableWidget(disabled_message=msg)
             else:
+                from .pricing import get_price_matrix
+                parts = list(parts_qs)
+                part_prices = get_price_matrix().prices_for_company([p.id for p in parts], obj.company)
                 parts_data = {}
-                for p in parts_qs:
+                for p in parts:
                     parts_data[p.id] = {
                         "name": p.name,
                         "code": p.code,
-                        "price": p.get_price_for_company(obj.company),
+                        "price": part_prices[p.id],
                         "part_type": p.part_type,
                     }
                 form.base_fields["selected_parts"].widget = PartsTableWidget(
@@ -1253,15 +1579,8 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
         obj = form.instance
 
         if "selected_parts" in form.cleaned_data:
-            selected_parts = form.cleaned_data["selected_parts"]
-            current_parts = set(obj.used_parts.all())
-            new_parts = set(selected_parts)
-
-            # ── 미설정 단가 부품 차단 ──
-            missing_price_parts = [
-                p for p in new_parts
-                if p.get_price_for_company(obj.company) is None
-            ]
+            # ── 미설정 단가 부품 차단 (단가 미설정 부품은 저장하지 않고 기존 등록분도 제거) ──
+            missing_price_parts = obj.snapshot_used_parts(form.cleaned_data["selected_parts"])
             if missing_price_parts:
                 group_name = obj.company.price_group.name if (obj.company and obj.company.price_group) else "미지정"
                 part_names = ", ".join(p.name for p in missing_price_parts)
@@ -1271,24 +1590,9 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
                     f"⚠️ 다음 부품의 [{group_name}] 단가가 설정되지 않았습니다: {part_names}. "
                     f"부품 관리에서 해당 단가 그룹의 가격을 먼저 입력해주세요."
                 )
-                obj.ticket_used_parts.filter(part__in=missing_price_parts).delete()
-                new_parts -= set(missing_price_parts)
-
-            # Remove unselected parts
-            to_remove = current_parts - new_parts
-            if to_remove:
-                obj.ticket_used_parts.filter(part__in=to_remove).delete()
-
-            # Add newly selected parts with current snapshot price
-            to_add = new_parts - current_parts
-            for part in to_add:
-                price = part.get_price_for_company(obj.company)
-                obj.ticket_used_parts.create(part=part, applied_price=price)
 
         # 수리보류 비용 계산 (수리기록과 동일 계산식)
-        total_parts = sum(tup.applied_price for tup in obj.ticket_used_parts.all())
-        nego_price = int(total_parts * 0.9)
-        total_with_vat = int(nego_price * 1.1)
+        total_with_vat = obj.parts_repair_cost()
         update_fields = []
         if obj.repair_cost != total_with_vat:
             obj.repair_cost = total_with_vat
@@ -1309,16 +1613,15 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
         context["show_save_and_continue"] = False
         # 프리셋 데이터를 context에 추가
         if obj and obj.tool_id:
-            from django.db.models import Q
-            presets = RepairPreset.objects.filter(
-                Q(tools=obj.tool) | Q(tools__isnull=True)
-            ).distinct().prefetch_related("parts")
+            presets = RepairPreset.objects.for_tool(obj.tool_id).prefetch_related("parts")
+            from .pricing import get_price_matrix
+            matrix = get_price_matrix()
             preset_data = []
             for preset in presets:
                 parts = preset.parts.all()
                 part_ids = [p.id for p in parts if p.part_type == 'part']
                 labor_ids = [p.id for p in parts if p.part_type == 'labor']
-                company_total = sum((p.get_price_for_company(obj.company) or 0) for p in parts)
+                company_total = matrix.total_for_company([p.id for p in parts], obj.company)
                 preset_data.append({
                     "id": preset.id,
                     "name": preset.name,
@@ -1327,14 +1630,11 @@ class HoldTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin,
                     "total_price": company_total,
                 })
             context["repair_presets"] = preset_data
-            from django.db.models import Q as Q2
-            all_parts = Part.objects.filter(
-                Q2(tools=obj.tool) | Q2(tools__isnull=True)
-            ).distinct().prefetch_related('group_prices')
+            all_parts = Part.objects.for_tool(obj.tool_id).only("id", "part_type")
 
             parts_meta = []
             for p in all_parts:
-                p_price = p.get_price_for_company(obj.company)
+                p_price = matrix.price(p.id, obj.company.price_group_id if obj.company else None)
                 parts_meta.append({"id": p.id, "part_type": p.part_type, "price": p_price})
             context["parts_meta"] = parts_meta
         else:
@@ -1561,7 +1861,7 @@ class OutsourcedTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitle
 
 
 @admin.register(OutboundTicket)
-class OutboundTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
+class OutboundTicketAdmin(TicketTransitionMixin, CompositeDisplayMixin, StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
     custom_title = "출고 등록"
     """출고 등록 - 수리완료 목록에서 선택하여 출고 처리"""
 
@@ -1733,11 +2033,10 @@ class OutboundTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMi
 
     @unfold_action(description="✅ 선택 항목 출고 처리 (오늘 날짜)")
     def mark_as_shipped_today(self, request, queryset):
-        today = timezone.now().date()
-        updated = queryset.update(
-            status=ASTicket.Status.SHIPPED,
-            outbound_date=today,
-        )
+        today = timezone.localdate()
+        updated = self._apply_transition(request, queryset, "ship", on=today, strict=False)
+        if updated is None:
+            return
         from django.contrib import messages
         messages.success(
             request,
@@ -1760,10 +2059,9 @@ class OutboundTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMi
                 messages.error(request, "올바른 날짜 형식이 아닙니다.")
                 return None
 
-            updated = queryset.update(
-                status=ASTicket.Status.SHIPPED,
-                outbound_date=outbound_date,
-            )
+            updated = self._apply_transition(request, queryset, "ship", on=outbound_date, strict=False)
+            if updated is None:
+                return None
             from django.contrib import messages
             messages.success(
                 request,
@@ -1798,7 +2096,7 @@ class TicketUsedPartInline(TabularInline):
     verbose_name_plural = "수리 사용 부품/공임 (스냅샷)"
 
 @admin.register(ASHistory)
-class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
+class ASHistoryAdmin(KeysetPaginationMixin, TicketTransitionMixin, StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin, ModelAdmin):
     custom_title = "통합 이력"
     """AS 통합 이력 조회 + 상태 정정 액션"""
 
@@ -1828,6 +2126,8 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
     ]
     autocomplete_fields = ["company", "tool"]
     list_per_page = 30
+    # 기본 정렬(입고일 ↓, 생성일 ↓)로 볼 때는 OFFSET 대신 키셋 페이지 이동
+    keyset_ordering = ("-inbound_date", "-created_at", "-pk")
     inlines = [TicketUsedPartInline]
     actions = [
         "revert_shipped_to_repaired",
@@ -1839,6 +2139,30 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
         "reset_estimate_status",
         "reset_tax_invoice",
         "mark_as_disposed",
+        "preview_reprice",
+        "reprice_selected",
+        "export_to_excel",
+    ]
+
+    # 엑셀 내보내기 컬럼 (export_to_excel)
+    xlsx_columns = [
+        XlsxColumn("상태", lambda t: t.get_status_display(), width=10),
+        XlsxColumn("입고일", lambda t: t.inbound_date, width=12),
+        XlsxColumn("매출처", lambda t: t.company.name, width=20),
+        XlsxColumn("담당자/부서", lambda t: t.manager, width=15),
+        XlsxColumn("브랜드", lambda t: t.tool.brand.name, width=15),
+        XlsxColumn("모델명", lambda t: t.tool.model_name, width=25),
+        XlsxColumn("시리얼 번호", lambda t: t.serial_number, width=20),
+        XlsxColumn("요청사항 및 증상", lambda t: t.symptom, width=30),
+        XlsxColumn(
+            "사용 부품/공임",
+            lambda t: ", ".join(used.part.name for used in t.ticket_used_parts.all()),
+            width=30,
+        ),
+        XlsxColumn("AS 비용", lambda t: t.repair_cost, width=12),
+        XlsxColumn("의뢰업체", lambda t: t.outsource_company.name if t.outsource_company else "", width=15),
+        XlsxColumn("출고일", lambda t: t.outbound_date, width=12),
+        XlsxColumn("비고", lambda t: t.repair_content, width=30),
     ]
 
     fieldsets = (
@@ -1905,6 +2229,17 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
             .prefetch_related("ticket_used_parts", "ticket_used_parts__part")
         )
 
+    def get_search_results(self, request, queryset, search_term):
+        """PostgreSQL은 전문 검색/트라이그램 검색 백엔드(as_app.search), 그 외 DB는 기본 icontains 검색
+
+        검색 백엔드 결과는 search_rank 순으로 정렬된다. (KeysetChangeList.get_ordering)
+        """
+        from .search import search_tickets
+        results = search_tickets(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        return results, False
+
     def has_add_permission(self, request):
         return False
 
@@ -1914,71 +2249,40 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
         return True
 
     # ── 상태 정정 액션 ──
-
-    def _validate_status(self, request, queryset, required_status, status_label):
-        """선택된 티켓들이 모두 지정된 상태인지 검증. 혼합 선택 시 에러 반환."""
-        invalid = queryset.exclude(status=required_status)
-        if invalid.exists():
-            invalid_items = ", ".join(
-                f"{t.tool} (S/N: {t.serial_number}, 현재: {t.get_status_display()})"
-                for t in invalid[:5]
-            )
-            extra = f" 외 {invalid.count() - 5}건" if invalid.count() > 5 else ""
-            from django.contrib import messages
-            messages.error(
-                request,
-                f"'{status_label}' 상태가 아닌 항목이 포함되어 있습니다: {invalid_items}{extra}. "
-                f"'{status_label}' 상태인 항목만 선택해 주세요."
-            )
-            return False
-        return True
+    # 상태 검증과 변경은 as_app.transitions의 전이 선언을 따른다. (TicketTransitionMixin._apply_transition)
 
     @unfold_action(description="⏪ 출고 취소 → 수리완료로 되돌리기")
     def revert_shipped_to_repaired(self, request, queryset):
-        if not self._validate_status(request, queryset, ASTicket.Status.SHIPPED, "출고"):
+        updated = self._apply_transition(request, queryset, "revert_shipped")
+        if updated is None:
             return
-        updated = queryset.update(
-            status=ASTicket.Status.REPAIRED,
-            outbound_date=None,
-        )
         from django.contrib import messages
         messages.success(request, f"{updated}건이 수리완료 상태로 되돌려졌습니다. (출고일 초기화)")
 
     @unfold_action(description="⏪ 수리완료 취소 → 입고로 되돌리기")
     def revert_repaired_to_inbound(self, request, queryset):
-        if not self._validate_status(request, queryset, ASTicket.Status.REPAIRED, "수리완료"):
+        updated = self._apply_transition(request, queryset, "revert_repaired")
+        if updated is None:
             return
-        # M2M(ticket_used_parts) clear는 개별 처리 필요
-        for ticket in queryset:
-            ticket.ticket_used_parts.all().delete()
-        queryset.update(
-            status=ASTicket.Status.INBOUND,
-            repair_cost=0,
-            repair_content="",
-        )
         from django.contrib import messages
         messages.success(
             request,
-            f"{queryset.count()}건이 입고 상태로 되돌려졌습니다. (사용 부품/공임 초기화, 수리 비용 0원)"
+            f"{updated}건이 입고 상태로 되돌려졌습니다. (사용 부품/공임 초기화, 수리 비용 0원)"
         )
 
     @unfold_action(description="⏪ 수리의뢰 취소 → 입고로 되돌리기")
     def revert_outsourced_to_inbound(self, request, queryset):
-        if not self._validate_status(request, queryset, ASTicket.Status.OUTSOURCED, "수리의뢰"):
+        updated = self._apply_transition(request, queryset, "revert_outsourced")
+        if updated is None:
             return
-        updated = queryset.update(
-            status=ASTicket.Status.INBOUND,
-            outsource_company=None,
-            outsource_date=None,
-        )
         from django.contrib import messages
         messages.success(request, f"{updated}건이 입고 상태로 되돌려졌습니다. (의뢰업체/날짜 초기화)")
 
     @unfold_action(description="⏪ 자체폐기 취소 → 입고로 되돌리기")
     def revert_disposed_to_inbound(self, request, queryset):
-        if not self._validate_status(request, queryset, ASTicket.Status.DISPOSED, "자체폐기"):
+        updated = self._apply_transition(request, queryset, "revert_disposed")
+        if updated is None:
             return
-        updated = queryset.update(status=ASTicket.Status.INBOUND)
         from django.contrib import messages
         messages.success(request, f"{updated}건이 입고 상태로 되돌려졌습니다.")
 
@@ -1997,40 +2301,18 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
     @unfold_action(description="⏸️ 선택 항목 → 수리보류 처리")
     def mark_as_hold(self, request, queryset):
         """선택된 티켓들을 수리보류 상태로 변경 (수리완료/수리의뢰/입고 상태 모두 가능)"""
-        valid_statuses = [
-            ASTicket.Status.INBOUND,
-            ASTicket.Status.OUTSOURCED,
-            ASTicket.Status.REPAIRED,
-        ]
-        invalid = queryset.exclude(status__in=valid_statuses)
-        if invalid.exists():
-            invalid_items = ", ".join(
-                f"{t.tool} (S/N: {t.serial_number}, 현재: {t.get_status_display()})"
-                for t in invalid[:5]
-            )
-            from django.contrib import messages
-            messages.error(
-                request,
-                f"수리보류로 변경할 수 없는 상태의 항목이 포함되어 있습니다: {invalid_items}. "
-                f"입고/수리의뢰/수리완료 상태인 항목만 선택해 주세요."
-            )
+        updated = self._apply_transition(request, queryset, "hold")
+        if updated is None:
             return
-        updated = queryset.filter(status__in=valid_statuses).update(
-            status=ASTicket.Status.HOLD,
-            hold_date=timezone.localdate(),
-        )
         from django.contrib import messages
         messages.success(request, f"{updated}건이 수리보류 처리되었습니다.")
 
     @unfold_action(description="▶️ 수리보류 해제 → 수리완료로 변경")
     def revert_hold_to_previous(self, request, queryset):
         """수리보류 상태를 수리완료로 전환 (단가 변동 경고 필수)"""
-        if not self._validate_status(request, queryset, ASTicket.Status.HOLD, "수리보류"):
+        updated = self._apply_transition(request, queryset, "release_hold")
+        if updated is None:
             return
-        updated = queryset.update(
-            status=ASTicket.Status.REPAIRED,
-            hold_date=None,
-        )
         from django.contrib import messages
         messages.warning(
             request,
@@ -2040,12 +2322,39 @@ class ASHistoryAdmin(StatusColorMixin, CustomTitleMixin, NoRelatedButtonsMixin,
 
     @unfold_action(description="🗑️ 입고 → 자체폐기 처리")
     def mark_as_disposed(self, request, queryset):
-        if not self._validate_status(request, queryset, ASTicket.Status.INBOUND, "입고"):
+        updated = self._apply_transition(request, queryset, "dispose")
+        if updated is None:
             return
-        updated = queryset.update(status=ASTicket.Status.DISPOSED)
         from django.contrib import messages
         messages.success(request, f"{updated}건이 자체폐기 처리되었습니다.")
 
+    @unfold_action(description="💱 단가 재계산 미리보기 (출고 전 항목)")
+    def preview_reprice(self, request, queryset):
+        """선택 항목 중 출고 전 티켓을 현재 단가 그룹 단가로 재계산했을 때의 변경 내역만 표시"""
+        from .pricing import reprice_open_tickets
+        report = reprice_open_tickets(queryset, dry_run=True)
+        from django.contrib import messages
+        messages.info(request, report.summary())
+
+    @unfold_action(description="💱 선택 항목 현재 단가로 재계산 (출고 전 항목)")
+    def reprice_selected(self, request, queryset):
+        """단가표 개정/매출처 단가 그룹 변경 후 사용 부품 단가와 AS 비용을 일괄 재계산"""
+        from .pricing import reprice_open_tickets
+        report = reprice_open_tickets(queryset)
+        from django.contrib import messages
+        messages.success(request, report.summary())
+        if report.parts_missing_price:
+            messages.warning(
+                request,
+                f"⚠️ 현재 단가 그룹에 단가가 없는 부품 {report.parts_missing_price:,}건은 기존 단가를 유지했습니다. "
+                f"부품 관리에서 해당 단가 그룹의 가격을 확인해주세요."
+            )
+
+    @unfold_action(description="📊 선택한 이력 엑셀 다운로드", attrs={"style": "background-color: #10b981; color: white; border: none;"})
+    def export_to_excel(self, request, queryset):
+        filename = f"AS_통합이력_{timezone.now().strftime('%Y%m%d_%H%M')}.xlsx"
+        return xlsx_response(filename, self.xlsx_columns, queryset, sheet_title="통합이력")
+
     # ── 복합 컬럼 display 메서드 ──
 
     @admin.display(description="입고일 / 출고일")
@@ -2485,7 +2794,7 @@ class EstimateTicketAdmin(CompositeDisplayMixin, StatusColorMixin, CustomTitleMi
                 "serial_number": serial_number,
                 "parts": parts,
                 "total_price": part_sum,
-                "nego_price": int(part_sum * 0.9)
+                "nego_price": ASTicket.calculate_nego_price(part_sum)
             })
 
         context = {
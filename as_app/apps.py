@@ -5,3 +5,6 @@ class AsAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "as_app"
     verbose_name = "대시보드"
+
+    def ready(self):
+        from . import signals  # noqa: F401
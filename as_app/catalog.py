@@ -0,0 +1,96 @@
+from django.core.cache import cache
+
+from .utils.cache_version import bump_version, get_version
+
+# ──────────────────────────────────────────────
+# 장비별 적용 부품/세트 카탈로그
+# "장비 X에 적용 가능한 부품/세트" = 공용(적용 장비 미지정) + X에 연결된 항목.
+# OR + M2M LEFT JOIN + DISTINCT 쿼리 대신 장비별 id 목록을 캐시에 보관하고
+# 호출 측은 pk__in 조회로 처리한다.
+# 캐시 키에 카탈로그 버전을 포함하므로 버전만 갱신하면 전체가 무효화된다.
+# (Part/RepairPreset의 tools m2m_changed, 저장/삭제 시그널, 단가 변경에서 bump_catalog_version 호출)
+# 버전은 부품 목록 API의 ETag/Last-Modified 기준으로도 사용된다.
+# ──────────────────────────────────────────────
+
+CATALOG_VERSION_KEY = "as_app:catalog_version"
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_catalog_version():
+    """현재 카탈로그 버전 (마이크로초 단위 타임스탬프)"""
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """카탈로그 버전 갱신 (트랜잭션 커밋 이후 실행)"""
+    bump_version(CATALOG_VERSION_KEY)
+
+
+def _cached(name, compute, version=None):
+    key = f"as_app:catalog:{version or get_catalog_version()}:{name}"
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, CATALOG_CACHE_TIMEOUT)
+    return value
+
+
+def _cached_ids(name, compute):
+    return _cached(name, lambda: tuple(compute()))
+
+
+def _common_ids(model):
+    return _cached_ids(
+        f"{model._meta.model_name}:common",
+        lambda: model.objects.order_by().filter(tools__isnull=True).values_list("pk", flat=True),
+    )
+
+
+def _tool_ids(model, tool_id):
+    through = model.tools.through
+    source = f"{model._meta.model_name}_id"
+    return _cached_ids(
+        f"{model._meta.model_name}:tool:{tool_id}",
+        lambda: through.objects.filter(tool_id=tool_id).values_list(source, flat=True),
+    )
+
+
+def applicable_part_ids(tool_id):
+    """장비에 적용 가능한 부품 id 집합 (공용 부품 포함)"""
+    from .models import Part
+
+    return frozenset(_common_ids(Part)).union(_tool_ids(Part, tool_id))
+
+
+def applicable_preset_ids(tool_id):
+    """장비에 적용 가능한 수리 세트 id 집합 (공용 세트 포함)"""
+    from .models import RepairPreset
+
+    return frozenset(_common_ids(RepairPreset)).union(_tool_ids(RepairPreset, tool_id))
+
+
+def tool_parts_payload(tool_id, category_id=None, version=None):
+    """장비 적용 부품 목록 (API 응답용 dict 리스트, 카탈로그 버전별 캐시)
+
+    price는 단가 그룹(category_id)이 주어지면 그룹 단가(미설정 시 None),
+    아니면 기본 단가(default_price)다.
+    """
+    from .models import Part
+    from .pricing import get_price_matrix
+
+    def compute():
+        parts = list(
+            Part.objects.for_tool(tool_id)
+            .order_by("part_type", "name")
+            .values("id", "name", "code", "part_type", "default_price")
+        )
+        if category_id:
+            prices = get_price_matrix().prices_for([p["id"] for p in parts], category_id)
+            for p in parts:
+                p["price"] = prices[p["id"]]
+        else:
+            for p in parts:
+                p["price"] = p["default_price"]
+        return parts
+
+    return _cached(f"parts_payload:{tool_id}:{category_id or 0}", compute, version)
@@ -1,120 +1,247 @@
 from datetime import timedelta
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Sum
+from django.db.models import Count, Q, Sum
 from django.urls import reverse
 
+from .models import ASTicket
+from .utils.cache_version import bump_version, get_version
 
-def dashboard_callback(request, context):
-    """
-    Django Unfold 대시보드 콜백 함수
-    KPI 통계, 수리 매출 요약, 수리 대기 목록, 최근 출고 목록 데이터를 생성하여 컨텍스트에 추가합니다.
+
+# ──────────────────────────────────────────────
+# KPI 지표 레지스트리
+# 등록된 모든 지표는 ASTicket 테이블에 대한 단 한 번의 aggregate() 호출
+# (조건부 집계: Count(filter=...) / Sum(filter=...))로 함께 계산된다.
+# ──────────────────────────────────────────────
+
+DASHBOARD_METRICS = {}
+
+
+def register_metric(name):
+    """대시보드 지표 등록 데코레이터
+
+    등록 함수는 기간 정보(dict)를 받아 집계식(Count/Sum 등)을 반환해야 한다.
     """
-    from .models import ASTicket
+    def decorator(func):
+        DASHBOARD_METRICS[name] = func
+        return func
+    return decorator
+
 
-    today = timezone.localdate()
-    thirty_days_ago = today - timedelta(days=30)
-    
+def get_periods(today=None):
+    """KPI/매출 집계에 사용하는 기준 날짜 구간"""
+    today = today or timezone.localdate()
     start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
     start_of_month = today.replace(day=1)
+    next_month = (start_of_month + timedelta(days=32)).replace(day=1)
     start_of_year = today.replace(month=1, day=1)
+    return {
+        "today": today,
+        "thirty_days_ago": today - timedelta(days=30),
+        "start_of_week": start_of_week,
+        "end_of_week": start_of_week + timedelta(days=6),
+        "start_of_month": start_of_month,
+        "end_of_month": next_month - timedelta(days=1),
+        "start_of_year": start_of_year,
+        "end_of_year": today.replace(month=12, day=31),
+    }
+
+
+def _status_count(status, **extra):
+    return Count("pk", filter=Q(status=status, **extra))
+
+
+def _shipped_revenue(start, end):
+    return Sum(
+        "repair_cost",
+        filter=Q(status=ASTicket.Status.SHIPPED, outbound_date__range=(start, end)),
+        default=0,
+    )
+
+
+@register_metric("long_pending_count")
+def _long_pending_count(periods):
+    """장기 미처리 (30일 이상 경과한 입고 상태)"""
+    return _status_count(ASTicket.Status.INBOUND, inbound_date__lte=periods["thirty_days_ago"])
+
+
+@register_metric("waiting_count")
+def _waiting_count(periods):
+    return _status_count(ASTicket.Status.INBOUND)
+
+
+@register_metric("outsourced_count")
+def _outsourced_count(periods):
+    return _status_count(ASTicket.Status.OUTSOURCED)
+
+
+@register_metric("repaired_count")
+def _repaired_count(periods):
+    return _status_count(ASTicket.Status.REPAIRED)
+
+
+@register_metric("hold_count")
+def _hold_count(periods):
+    return _status_count(ASTicket.Status.HOLD)
+
 
-    # ── KPI 통계 ──
-    # 1. 장기 미처리 (30일 이상 경과)
-    long_pending_count = ASTicket.objects.filter(
-        inbound_date__lte=thirty_days_ago,
-        status=ASTicket.Status.INBOUND,
-    ).count()
+@register_metric("week_revenue")
+def _week_revenue(periods):
+    return _shipped_revenue(periods["start_of_week"], periods["end_of_week"])
 
-    # 2. 수리 대기 (입고 상태이거나 수리대기 상태)
-    waiting_count = ASTicket.objects.filter(
-        status=ASTicket.Status.INBOUND,
-    ).count()
 
+@register_metric("month_revenue")
+def _month_revenue(periods):
+    return _shipped_revenue(periods["start_of_month"], periods["end_of_month"])
 
 
-    # 4. 수리 완료 (미출고)
-    repaired_count = ASTicket.objects.filter(
-        status=ASTicket.Status.REPAIRED,
-    ).count()
+@register_metric("year_revenue")
+def _year_revenue(periods):
+    return _shipped_revenue(periods["start_of_year"], periods["end_of_year"])
 
-    # 4-1. 수리의뢰 중 (외주 의뢰 중)
-    outsourced_count = ASTicket.objects.filter(
-        status=ASTicket.Status.OUTSOURCED,
-    ).count()
 
-    # 4-2. 수리보류 중
-    hold_count = ASTicket.objects.filter(
-        status=ASTicket.Status.HOLD,
-    ).count()
+def compute_dashboard_metrics(today=None):
+    """등록된 모든 지표를 단일 쿼리로 계산하여 {지표명: 값} dict로 반환"""
+    periods = get_periods(today)
+    expressions = {name: factory(periods) for name, factory in DASHBOARD_METRICS.items()}
+    return ASTicket.objects.order_by().aggregate(**expressions)
 
 
+# ──────────────────────────────────────────────
+# 지표 캐시 (버전 + 일자별 키)
+# 티켓 저장/삭제 시그널과 ASTicket QuerySet의 일괄 변경(update/bulk_update/
+# bulk_create)에서 invalidate_dashboard_metrics()로 버전을 올려 무효화한다. (as_app.utils.cache_version)
+# ──────────────────────────────────────────────
 
-    # ── KPI 카드 링크 생성 ──
+DASHBOARD_VERSION_KEY = "as_app:dashboard_metrics_version"
+DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _metrics_cache_key(today):
+    return f"as_app:dashboard_metrics:{get_version(DASHBOARD_VERSION_KEY)}:{today.isoformat()}"
+
+
+def get_dashboard_metrics(today=None):
+    """캐시된 대시보드 지표 반환 (캐시 미스 시 단일 쿼리로 계산 후 저장)"""
+    today = today or timezone.localdate()
+    key = _metrics_cache_key(today)
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = compute_dashboard_metrics(today)
+        cache.set(key, metrics, DASHBOARD_CACHE_TIMEOUT)
+    return metrics
+
+
+def warm_dashboard_metrics(today=None):
+    """지표를 새로 계산하여 캐시에 저장 (관리 명령 warm_dashboard_cache에서 사용)"""
+    today = today or timezone.localdate()
+    key = _metrics_cache_key(today)
+    metrics = compute_dashboard_metrics(today)
+    cache.set(key, metrics, DASHBOARD_CACHE_TIMEOUT)
+    return metrics
+
+
+def invalidate_dashboard_metrics():
+    """지표 캐시 버전 갱신 (트랜잭션 커밋 이후 실행)"""
+    bump_version(DASHBOARD_VERSION_KEY)
+
+
+# ──────────────────────────────────────────────
+# KPI / 매출 카드 정의
+# 새 카드는 지표를 register_metric으로 등록한 뒤 아래 목록에 추가한다.
+# link: 기간 정보를 받아 통합 이력 필터 쿼리스트링을 반환 (None이면 링크 없음)
+# ──────────────────────────────────────────────
+
+KPI_CARDS = [
+    {
+        "title": "장기 미처리 대기",
+        "metric": "long_pending_count",
+        "footer": "30일 이상 방치된 건수",
+        "icon": "warning",
+        "color": "#ef4444",  # red
+        "link": lambda p: f"status__exact=inbound&inbound_date__lte={p['thirty_days_ago'].isoformat()}",
+    },
+    {
+        "title": "수리 대기",
+        "metric": "waiting_count",
+        "footer": "현재 수리 대기 중",
+        "icon": "pending_actions",
+        "color": "#f59e0b",  # amber
+        "link": lambda p: "status__exact=inbound",
+    },
+    {
+        "title": "수리의뢰 중",
+        "metric": "outsourced_count",
+        "footer": "현재 외주 의뢰 중인 건수",
+        "icon": "send",
+        "color": "#eab308",  # yellow
+        "link": lambda p: "status__exact=outsourced",
+    },
+    {
+        "title": "수리 완료 (미출고)",
+        "metric": "repaired_count",
+        "footer": "출고 대기 중인 건수",
+        "icon": "check_circle",
+        "color": "#10b981",  # emerald
+        "link": lambda p: "status__exact=repaired",
+    },
+    {
+        "title": "수리보류",
+        "metric": "hold_count",
+        "footer": "견적 발송 후 결정 대기 중",
+        "icon": "pause_circle",
+        "color": "#9333ea",  # purple
+        "link": lambda p: "status__exact=hold",
+    },
+]
+
+# ── 수리 매출 요약 (출고 완료 기준) ──
+REVENUE_CARDS = [
+    {"title": "이번 주 수리매출", "metric": "week_revenue", "icon": "date_range", "color": "#3b82f6"},  # blue
+    {"title": "이번 달 수리매출", "metric": "month_revenue", "icon": "calendar_month", "color": "#8b5cf6"},  # violet
+    {"title": "이번 년도 수리매출", "metric": "year_revenue", "icon": "event_note", "color": "#6366f1"},  # indigo
+]
+
+
+def build_kpi_cards(metrics, periods):
     history_url = reverse("admin:as_app_ashistory_changelist")
-    long_pending_url = f"{history_url}?status__exact=inbound&inbound_date__lte={thirty_days_ago.isoformat()}"
-    waiting_url = f"{history_url}?status__exact=inbound"
-    outsourced_url = f"{history_url}?status__exact=outsourced"
-    repaired_url = f"{history_url}?status__exact=repaired"
-    hold_url = f"{history_url}?status__exact=hold"
+    kpi = []
+    for card in KPI_CARDS:
+        link = card.get("link")
+        kpi.append({
+            "title": card["title"],
+            "metric": metrics.get(card["metric"]) or 0,
+            "footer": card["footer"],
+            "icon": card["icon"],
+            "color": card["color"],
+            "link": f"{history_url}?{link(periods)}" if link else None,
+        })
+    return kpi
 
-    kpi = [
-        {
-            "title": "장기 미처리 대기",
-            "metric": long_pending_count,
-            "footer": "30일 이상 방치된 건수",
-            "icon": "warning",
-            "color": "#ef4444",  # red
-            "link": long_pending_url,
-        },
-        {
-            "title": "수리 대기",
-            "metric": waiting_count,
-            "footer": "현재 수리 대기 중",
-            "icon": "pending_actions",
-            "color": "#f59e0b",  # amber
-            "link": waiting_url,
-        },
-        {
-            "title": "수리의뢰 중",
-            "metric": outsourced_count,
-            "footer": "현재 외주 의뢰 중인 건수",
-            "icon": "send",
-            "color": "#eab308",  # yellow
-            "link": outsourced_url,
-        },
-        {
-            "title": "수리 완료 (미출고)",
-            "metric": repaired_count,
-            "footer": "출고 대기 중인 건수",
-            "icon": "check_circle",
-            "color": "#10b981",  # emerald
-            "link": repaired_url,
-        },
+
+def build_revenue_cards(metrics):
+    return [
         {
-            "title": "수리보류",
-            "metric": hold_count,
-            "footer": "견적 발송 후 결정 대기 중",
-            "icon": "pause_circle",
-            "color": "#9333ea",  # purple
-            "link": hold_url,
-        },
+            "title": card["title"],
+            "amount": f"{metrics.get(card['metric']) or 0:,}",
+            "icon": card["icon"],
+            "color": card["color"],
+        }
+        for card in REVENUE_CARDS
     ]
 
-    # ── 수리 매출 요약 (출고 완료 기준) ──
-    shipped_qs = ASTicket.objects.filter(status=ASTicket.Status.SHIPPED)
-
 
-    week_rev = shipped_qs.filter(outbound_date__gte=start_of_week, outbound_date__lte=end_of_week).aggregate(Sum('repair_cost'))['repair_cost__sum'] or 0
-    # "이번 달" 통계 기준을 출고 건수 조회 기준과 동일하게 맞춤 (outbound_date__lte=today -> __month=today.month)
-    month_rev = shipped_qs.filter(outbound_date__month=today.month, outbound_date__year=today.year).aggregate(Sum('repair_cost'))['repair_cost__sum'] or 0
-    year_rev = shipped_qs.filter(outbound_date__year=today.year).aggregate(Sum('repair_cost'))['repair_cost__sum'] or 0
+def dashboard_callback(request, context):
+    """
+    Django Unfold 대시보드 콜백 함수
+    KPI 통계, 수리 매출 요약, 수리 대기 목록, 최근 출고 목록 데이터를 생성하여 컨텍스트에 추가합니다.
+    """
+    periods = get_periods()
 
-    revenue_data = [
-        {"title": "이번 주 수리매출", "amount": f"{week_rev:,}", "icon": "date_range", "color": "#3b82f6"},  # blue
-        {"title": "이번 달 수리매출", "amount": f"{month_rev:,}", "icon": "calendar_month", "color": "#8b5cf6"},  # violet
-        {"title": "이번 년도 수리매출", "amount": f"{year_rev:,}", "icon": "event_note", "color": "#6366f1"},     # indigo
-    ]
+    # ── KPI 통계 + 수리 매출 요약 (단일 집계 쿼리, 캐시) ──
+    metrics = get_dashboard_metrics(periods["today"])
+    kpi = build_kpi_cards(metrics, periods)
+    revenue_data = build_revenue_cards(metrics)
 
     # ── ③ 수리 대기 목록 (최근 10건) ──
     pending_tickets = (
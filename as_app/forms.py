@@ -109,10 +109,11 @@ class PartForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.categories = list(CompanyCategory.objects.all().order_by('name'))
+        current_prices = {}
+        if self.instance and self.instance.pk:
+            current_prices = dict(self.instance.group_prices.values_list('category_id', 'price'))
         for cat in self.categories:
             field_name = f'price_group_{cat.id}'
-            if self.instance and self.instance.pk:
-                pp = self.instance.group_prices.filter(category=cat).first()
-                if pp:
-                    self.initial[field_name] = pp.price
+            if cat.id in current_prices:
+                self.initial[field_name] = current_prices[cat.id]
 
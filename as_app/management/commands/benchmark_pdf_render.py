@@ -0,0 +1,76 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from as_app.utils.pdf_export import generate_custom_pdf_estimate
+from as_app.utils.pdf_fonts import get_estimate_styles, get_pdf_fonts, get_report_styles, load_font
+
+
+SAMPLE_ESTIMATE = {
+    "company_name": "벤치마크 매출처",
+    "model_name": "BENCH-MODEL",
+    "serial_number": "SN-0000",
+    "parts": [
+        {"name": f"부품 {i}", "code": f"P-{i:03d}", "quantity": 1, "unit_price": 10000, "amount": 10000}
+        for i in range(8)
+    ],
+    "total_price": 80000,
+    "nego_price": 80000,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "PDF 출력 1건당 소요 시간을 측정합니다. "
+        "최초 호출(폰트 등록 + 스타일 생성)과 캐시 적용 후 반복 호출, "
+        "요청마다 TTF를 다시 읽던 기존 방식의 비용을 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="반복 출력 횟수")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        iterations = options["iterations"]
+
+        # ── 최초 호출: 폰트 등록 + 스타일 생성 ──
+        get_pdf_fonts.cache_clear()
+        get_report_styles.cache_clear()
+        get_estimate_styles.cache_clear()
+        started = time.perf_counter()
+        font_name, font_bold = get_pdf_fonts()
+        get_report_styles()
+        get_estimate_styles()
+        cold_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f"사용 폰트: {font_name} / {font_bold}")
+        if font_name == "Helvetica":
+            self.stdout.write(self.style.WARNING(
+                "한글 폰트를 찾지 못했습니다. settings.PDF_FONT_PATHS 경로 또는 fontconfig(fc-list :lang=ko)를 확인하세요."
+            ))
+        self.stdout.write(f"폰트 등록 + 스타일 생성 (프로세스당 1회): {cold_ms:.1f} ms")
+
+        # ── 기존 방식: 요청마다 폰트 탐색 + TTF 파싱 ──
+        if font_name != "Helvetica":
+            timings = []
+            for _ in range(min(iterations, 10)):
+                started = time.perf_counter()
+                load_font("BenchmarkFont", getattr(settings, "PDF_FONT_PATHS", []))
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(f"폰트 탐색 + TTF 파싱 1회 (기존 방식의 요청당 추가 비용): {statistics.mean(timings):.1f} ms")
+
+        # ── 캐시 적용 후 견적서 PDF 반복 출력 ──
+        timings = []
+        size = 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            buffer = generate_custom_pdf_estimate([SAMPLE_ESTIMATE])
+            timings.append((time.perf_counter() - started) * 1000)
+            size = buffer.getbuffer().nbytes
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"견적서 PDF {iterations}회 ({size:,} bytes): "
+            f"평균 {statistics.mean(timings):.1f} ms / 중앙값 {statistics.median(timings):.1f} ms / p95 {p95:.1f} ms"
+        )
+        self.stdout.write(self.style.SUCCESS("PDF 출력 벤치마크 완료"))
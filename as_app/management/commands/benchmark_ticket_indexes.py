@@ -0,0 +1,148 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from as_app.models import ASTicket
+from master_data.models import Brand, Company, Tool
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 AS 티켓 데이터(기본 100만 건)를 트랜잭션 안에서 생성한 뒤, "
+        "업무 큐 쿼리의 실행 계획을 복합 인덱스 적용 전/후로 비교합니다. "
+        "종료 시 모든 데이터와 스키마 변경은 롤백됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1_000_000, help="생성할 합성 티켓 수")
+        parser.add_argument("--tools", type=int, default=500, help="합성 장비 수")
+        parser.add_argument("--companies", type=int, default=200, help="합성 매출처 수")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE 사용 (PostgreSQL)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write(self.style.SUCCESS("벤치마크 종료 — 합성 데이터 및 인덱스 변경을 롤백했습니다."))
+
+    # ── 데이터 생성 ──
+
+    def _seed(self, options):
+        brand = Brand.objects.create(name=f"__bench_{timezone.now().timestamp()}")
+        tools = Tool.objects.bulk_create(
+            [Tool(brand=brand, model_name=f"BENCH-{i:05d}") for i in range(options["tools"])]
+        )
+        companies = Company.objects.bulk_create(
+            [
+                Company(name=f"BENCH 매출처 {i}", business_number="000-00-00000", representative="-", address="-")
+                for i in range(options["companies"])
+            ]
+        )
+
+        statuses = [choice for choice, _ in ASTicket.Status.choices]
+        # 실제 분포에 가깝게: 대부분 출고 완료, 일부만 활성 큐에 남아 있음
+        weights = [4, 1, 2, 90, 1, 2]
+        today = timezone.localdate()
+        count, batch_size = options["count"], options["batch_size"]
+        created = 0
+        started = time.monotonic()
+        while created < count:
+            size = min(batch_size, count - created)
+            batch = []
+            for status in random.choices(statuses, weights=weights, k=size):
+                inbound = today - timedelta(days=random.randint(0, 365 * 6))
+                batch.append(ASTicket(
+                    inbound_date=inbound,
+                    company=random.choice(companies),
+                    tool=random.choice(tools),
+                    serial_number=f"SN{created + len(batch):09d}",
+                    status=status,
+                    repair_cost=random.randint(0, 300) * 1000,
+                    outbound_date=inbound + timedelta(days=random.randint(1, 30))
+                    if status == ASTicket.Status.SHIPPED else None,
+                ))
+            ASTicket.objects.bulk_create(batch, batch_size=batch_size)
+            created += size
+        self.stdout.write(f"합성 티켓 {created:,}건 생성 ({time.monotonic() - started:.1f}s)")
+        return tools, companies
+
+    # ── 측정 대상 쿼리 ──
+
+    def _queries(self, tools, companies):
+        today = timezone.localdate()
+        active = [
+            ASTicket.Status.INBOUND,
+            ASTicket.Status.OUTSOURCED,
+            ASTicket.Status.REPAIRED,
+            ASTicket.Status.HOLD,
+        ]
+        order = ["-inbound_date", "-created_at"]
+        return [
+            ("수리 기록 큐 (입고/수리의뢰)",
+             ASTicket.objects.filter(status__in=[ASTicket.Status.INBOUND, ASTicket.Status.OUTSOURCED]).order_by(*order)[:30]),
+            ("출고 큐 (수리완료)",
+             ASTicket.objects.filter(status=ASTicket.Status.REPAIRED).order_by(*order)[:30]),
+            ("통합 이력 상태 필터",
+             ASTicket.objects.filter(status=ASTicket.Status.HOLD).order_by(*order)[:30]),
+            ("대시보드 월 매출 (출고일 범위)",
+             ASTicket.objects.filter(
+                 status=ASTicket.Status.SHIPPED,
+                 outbound_date__range=(today.replace(day=1), today),
+             ).order_by().values("repair_cost")),
+            ("중복 시리얼 검증",
+             ASTicket.objects.filter(tool=tools[0], serial_number="SN000000001", status__in=active).order_by()),
+            ("매출처 + 상태",
+             ASTicket.objects.filter(company=companies[0], status=ASTicket.Status.REPAIRED).order_by()),
+        ]
+
+    def _explain(self, queries, options):
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+        for label, qs in queries:
+            started = time.monotonic()
+            list(qs.all())  # 이전 평가 결과 캐시를 쓰지 않도록 복제 후 실행
+            elapsed = (time.monotonic() - started) * 1000
+            self.stdout.write(self.style.MIGRATE_LABEL(f"\n▶ {label}  ({elapsed:.1f} ms)"))
+            self.stdout.write(qs.explain(**explain_options))
+
+    def _analyze_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ASTicket._meta.db_table}")
+
+    def _drop_indexes(self):
+        # schema_editor 컨텍스트는 SQLite에서 트랜잭션 내부 진입이 불가하므로 DDL을 직접 실행
+        with connection.cursor() as cursor:
+            for index in ASTicket._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def _create_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for index in ASTicket._meta.indexes:
+                cursor.execute(str(index.create_sql(ASTicket, editor)))
+
+    def _run(self, options):
+        tools, companies = self._seed(options)
+        queries = self._queries(tools, companies)
+
+        self._drop_indexes()
+        self._analyze_table()
+        self.stdout.write(self.style.WARNING("\n════ 복합 인덱스 적용 전 ════"))
+        self._explain(queries, options)
+
+        self._create_indexes()
+        self._analyze_table()
+        self.stdout.write(self.style.WARNING("\n════ 복합 인덱스 적용 후 ════"))
+        self._explain(queries, options)
@@ -0,0 +1,124 @@
+import random
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from as_app.catalog import CATALOG_VERSION_KEY, applicable_part_ids, applicable_preset_ids
+from as_app.models import Part, RepairPreset
+from master_data.models import Brand, Tool
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 부품(기본 1만 개)과 장비(기본 2천 개)를 트랜잭션 안에서 생성한 뒤, "
+        "장비별 적용 부품/세트 조회를 기존 OR + DISTINCT 쿼리와 카탈로그 캐시로 비교합니다. "
+        "종료 시 모든 데이터는 롤백됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--parts", type=int, default=10_000, help="합성 부품 수")
+        parser.add_argument("--tools", type=int, default=2_000, help="합성 장비 수")
+        parser.add_argument("--presets", type=int, default=1_000, help="합성 수리 세트 수")
+        parser.add_argument("--common-ratio", type=float, default=0.1, help="공용 부품(적용 장비 없음) 비율")
+        parser.add_argument("--samples", type=int, default=200, help="측정할 장비 수")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            # 합성 장비 id로 채워진 카탈로그 캐시를 버리도록 버전 초기화
+            cache.delete(CATALOG_VERSION_KEY)
+        self.stdout.write(self.style.SUCCESS("벤치마크 종료 — 합성 데이터를 롤백했습니다."))
+
+    # ── 데이터 생성 ──
+
+    def _seed(self, options):
+        started = time.monotonic()
+        brand = Brand.objects.create(name=f"__bench_{timezone.now().timestamp()}")
+        tools = Tool.objects.bulk_create(
+            [Tool(brand=brand, model_name=f"BENCH-{i:05d}") for i in range(options["tools"])]
+        )
+        parts = Part.objects.bulk_create(
+            [Part(brand=brand, name=f"BENCH 부품 {i:05d}") for i in range(options["parts"])],
+            batch_size=2000,
+        )
+        presets = RepairPreset.objects.bulk_create(
+            [RepairPreset(brand=brand, name=f"BENCH 세트 {i:05d}") for i in range(options["presets"])],
+            batch_size=2000,
+        )
+
+        # 공용 비율만큼은 적용 장비 없이 두고, 나머지는 1~5개 장비에 연결
+        common_ratio = options["common_ratio"]
+        for model, objs in ((Part, parts), (RepairPreset, presets)):
+            through = model.tools.through
+            source = f"{model._meta.model_name}_id"
+            links = []
+            for obj in objs:
+                if random.random() < common_ratio:
+                    continue
+                for tool in random.sample(tools, random.randint(1, 5)):
+                    links.append(through(**{source: obj.pk, "tool_id": tool.pk}))
+            through.objects.bulk_create(links, batch_size=5000)
+        self.stdout.write(
+            f"합성 데이터 생성: 부품 {len(parts):,} / 세트 {len(presets):,} / 장비 {len(tools):,} "
+            f"({time.monotonic() - started:.1f}s)"
+        )
+        return tools
+
+    # ── 측정 ──
+
+    def _measure(self, label, tools, fetch):
+        timings = []
+        for tool in tools:
+            started = time.perf_counter()
+            fetch(tool.pk)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"  {label:<28} 평균 {statistics.mean(timings):7.2f} ms / "
+            f"중앙값 {statistics.median(timings):7.2f} ms / p95 {p95:7.2f} ms"
+        )
+
+    def _run(self, options):
+        tools = self._seed(options)
+        samples = random.sample(tools, min(options["samples"], len(tools)))
+
+        for model, lookup_ids in ((Part, applicable_part_ids), (RepairPreset, applicable_preset_ids)):
+            def legacy(tool_id):
+                return set(
+                    model.objects.filter(Q(tools=tool_id) | Q(tools__isnull=True))
+                    .distinct().values_list("pk", flat=True)
+                )
+
+            def catalog(tool_id):
+                return set(model.objects.for_tool(tool_id).values_list("pk", flat=True))
+
+            for tool in samples[:20]:
+                if legacy(tool.pk) != catalog(tool.pk):
+                    raise CommandError(f"{model._meta.verbose_name}: 장비 {tool.pk}의 카탈로그 결과가 기존 쿼리와 다릅니다.")
+
+            self.stdout.write(self.style.MIGRATE_LABEL(f"\n▶ {model._meta.verbose_name} (장비 {len(samples)}개)"))
+            self._measure("기존 OR + DISTINCT", samples, legacy)
+            cache.delete(CATALOG_VERSION_KEY)
+            self._measure("카탈로그 (캐시 미스)", samples, catalog)
+            self._measure("카탈로그 (캐시 적중)", samples, catalog)
+            self._measure("카탈로그 id 조회만 (캐시 적중)", samples, lookup_ids)
+
+        self.stdout.write(self.style.MIGRATE_LABEL("\n▶ 기존 쿼리 실행 계획"))
+        self.stdout.write(
+            Part.objects.filter(Q(tools=samples[0].pk) | Q(tools__isnull=True)).distinct().explain()
+        )
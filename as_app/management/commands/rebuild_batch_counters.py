@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from as_app.models import InboundBatch
+from tool_inventory.models import InventoryBatch, OutboundBatch
+
+BATCH_MODELS = {
+    "inbound": InboundBatch,
+    "inventory": InventoryBatch,
+    "outbound": OutboundBatch,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "입고 배치(AS)와 툴 입고/출고 배치의 품목 수·장비 요약 컬럼을 "
+        "하위 행 기준으로 다시 계산합니다. 데이터 이관이나 SQL 직접 수정 후 값이 어긋났을 때 사용합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", choices=sorted(BATCH_MODELS), action="append", default=[],
+            help="대상 배치 종류 (여러 번 지정 가능, 기본: 전체)",
+        )
+
+    def handle(self, *args, **options):
+        for key in options["only"] or BATCH_MODELS:
+            model = BATCH_MODELS[key]
+            started = time.monotonic()
+            with transaction.atomic():
+                count = model.objects.all().refresh_counters()
+            self.stdout.write(
+                f"{model._meta.app_label}.{model._meta.object_name}: 배치 {count:,}건 갱신 "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        self.stdout.write(self.style.SUCCESS("배치 카운터 재계산 완료"))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from as_app.serials import rebuild_serial_index
+
+
+class Command(BaseCommand):
+    help = (
+        "AS 티켓과 툴 재고의 시리얼 번호로 통합 시리얼 색인(SerialIndex)을 다시 만듭니다. "
+        "데이터 이관이나 SQL 직접 수정 후 포탈 시리얼 조회 결과가 어긋났을 때 사용합니다."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            counts = rebuild_serial_index()
+        self.stdout.write(
+            f"AS 티켓 {counts['ticket']:,}건, 툴 재고 {counts['inventory']:,}건 색인 "
+            f"({time.monotonic() - started:.1f}s)"
+        )
+        self.stdout.write(self.style.SUCCESS("시리얼 색인 재생성 완료"))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from as_app.models import ASTicket
+from as_app.pricing import REPRICE_CHUNK_SIZE, reprice_open_tickets
+
+
+class Command(BaseCommand):
+    help = (
+        "출고 전(입고/수리의뢰/수리완료/수리보류) 티켓의 사용 부품 단가와 AS 비용을 "
+        "매출처의 현재 단가 그룹 단가로 일괄 재계산합니다. "
+        "--dry-run으로 변경 예정 내역만 확인할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="변경하지 않고 변경 예정 내역만 출력")
+        parser.add_argument("--company", type=int, action="append", default=[], help="대상 매출처 id (여러 번 지정 가능)")
+        parser.add_argument("--price-group", type=int, action="append", default=[], help="대상 단가 그룹 id (여러 번 지정 가능)")
+        parser.add_argument("--chunk-size", type=int, default=REPRICE_CHUNK_SIZE, help="한 트랜잭션에서 처리할 티켓 수")
+
+    def handle(self, *args, **options):
+        tickets = ASTicket.objects.all()
+        if options["company"]:
+            tickets = tickets.filter(company_id__in=options["company"])
+        if options["price_group"]:
+            tickets = tickets.filter(company__price_group_id__in=options["price_group"])
+
+        started = time.monotonic()
+        report = reprice_open_tickets(tickets, dry_run=options["dry_run"], chunk_size=options["chunk_size"])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(report.summary())
+        if report.parts_missing_price:
+            self.stdout.write(self.style.WARNING(
+                "현재 단가 그룹에 단가가 없는 부품은 기존 스냅샷 단가를 유지했습니다. 부품 관리에서 단가를 확인하세요."
+            ))
+        if report.dry_run:
+            self.stdout.write(self.style.SUCCESS(f"미리보기 완료 ({elapsed:.1f}s) — 변경 사항은 저장되지 않았습니다."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"재계산 완료 ({elapsed:.1f}s)"))
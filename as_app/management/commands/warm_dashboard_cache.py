@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from as_app.dashboard import warm_dashboard_metrics
+
+
+class Command(BaseCommand):
+    help = "AS 대시보드 KPI/매출 지표를 미리 계산하여 캐시에 저장합니다."
+
+    def handle(self, *args, **options):
+        metrics = warm_dashboard_metrics()
+        for name, value in metrics.items():
+            self.stdout.write(f"  {name}: {value:,}")
+        self.stdout.write(self.style.SUCCESS(f"대시보드 지표 {len(metrics)}개를 캐시에 저장했습니다."))
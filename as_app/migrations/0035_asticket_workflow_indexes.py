@@ -0,0 +1,30 @@
+# Generated by Django 5.2.11 on 2026-10-17 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0034_add_hold_status_and_hold_date'),
+        ('master_data', '0002_company_estimate_company_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asticket',
+            index=models.Index(fields=['status', 'inbound_date', 'created_at'], name='asticket_status_inbound_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asticket',
+            index=models.Index(fields=['status', 'outbound_date'], name='asticket_status_outbound_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asticket',
+            index=models.Index(fields=['tool', 'serial_number', 'status'], name='asticket_tool_serial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asticket',
+            index=models.Index(fields=['company', 'status'], name='asticket_company_status_idx'),
+        ),
+    ]
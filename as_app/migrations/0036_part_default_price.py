@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-17 14:45
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_default_prices(apps, schema_editor):
+    Part = apps.get_model("as_app", "Part")
+    PartPrice = apps.get_model("as_app", "PartPrice")
+
+    # 다스 그룹 단가를 기본 단가 컬럼으로 복사 (단일 UPDATE)
+    default_price = PartPrice.objects.filter(
+        part=OuterRef("pk"), category__name="다스"
+    ).values("price")[:1]
+    Part.objects.update(default_price=Coalesce(Subquery(default_price), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0035_asticket_workflow_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalpart',
+            name='default_price',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='다스 그룹 단가 (단가 그룹별 금액에서 자동 반영)', verbose_name='기본 단가'),
+        ),
+        migrations.AddField(
+            model_name='part',
+            name='default_price',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='다스 그룹 단가 (단가 그룹별 금액에서 자동 반영)', verbose_name='기본 단가'),
+        ),
+        migrations.RunPython(fill_default_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.11 on 2026-10-17 14:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# 마이그레이션 시점의 카운터 계산 (as_app.utils.batch_counters 복사본 — 이후 변경과 무관하게 고정)
+def _refresh_batch_counters(batch_model, child_model, fk_name, count_field, chunk_size=1000):
+    children = child_model._base_manager.order_by()
+    batch_ids = list(batch_model._base_manager.order_by().values_list("pk", flat=True))
+    for start in range(0, len(batch_ids), chunk_size):
+        chunk = batch_ids[start:start + chunk_size]
+        rows = children.filter(**{f"{fk_name}__in": chunk})
+        counts = dict(
+            rows.values(fk_name).annotate(total=Count("pk")).values_list(fk_name, "total")
+        )
+        labels = {}
+        tools = (
+            rows.values_list(fk_name, "tool__brand__name", "tool__model_name")
+            .order_by(fk_name, "tool__brand__name", "tool__model_name")
+            .distinct()
+        )
+        for batch_id, brand_name, model_name in tools:
+            labels.setdefault(batch_id, []).append("%s > %s" % (brand_name, model_name))
+
+        updated = []
+        for pk in chunk:
+            batch_labels = labels.get(pk, [])
+            summary = ", ".join(batch_labels[:3])
+            if len(batch_labels) > 3:
+                summary += " 외 %d건" % (len(batch_labels) - 3)
+            updated.append(batch_model(pk=pk, **{count_field: counts.get(pk, 0), "tools_summary": summary}))
+        batch_model._base_manager.bulk_update(updated, [count_field, "tools_summary"])
+
+
+def fill_batch_counters(apps, schema_editor):
+    InboundBatch = apps.get_model("as_app", "InboundBatch")
+    ASTicket = apps.get_model("as_app", "ASTicket")
+    _refresh_batch_counters(InboundBatch, ASTicket, "inbound_batch", "ticket_count")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0036_part_default_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inboundbatch',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='품목 수'),
+        ),
+        migrations.AddField(
+            model_name='inboundbatch',
+            name='tools_summary',
+            field=models.TextField(blank=True, editable=False, verbose_name='입고 장비'),
+        ),
+        migrations.RunPython(fill_batch_counters, migrations.RunPython.noop),
+    ]
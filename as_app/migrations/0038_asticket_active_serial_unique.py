@@ -0,0 +1,41 @@
+# Generated by Django 5.2.11 on 2026-10-17 14:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ACTIVE_STATUSES = ["inbound", "outsourced", "repaired", "hold"]
+
+
+def check_active_duplicates(apps, schema_editor):
+    ASTicket = apps.get_model("as_app", "ASTicket")
+
+    # 기존 데이터에 활성 중복이 있으면 제약 생성이 실패하므로 정리 대상을 먼저 안내
+    duplicates = list(
+        ASTicket.objects.filter(status__in=ACTIVE_STATUSES)
+        .values("tool_id", "serial_number")
+        .annotate(total=Count("pk"))
+        .filter(total__gt=1)
+        .order_by("tool_id", "serial_number")[:20]
+    )
+    if duplicates:
+        rows = ", ".join("tool=%(tool_id)s S/N=%(serial_number)s (%(total)d건)" % d for d in duplicates)
+        raise RuntimeError(
+            "출고/폐기 전 상태의 동일 툴+시리얼 티켓이 중복되어 있어 유일 제약을 만들 수 없습니다. "
+            "중복 티켓을 정리한 뒤 다시 실행하세요: " + rows
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0037_batch_counters'),
+        ('master_data', '0002_company_estimate_company_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_active_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='asticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['inbound', 'outsourced', 'repaired', 'hold'])), fields=('tool', 'serial_number'), name='asticket_active_serial_uniq', violation_error_code='duplicate_active_serial', violation_error_message='현재 입고/수리 중인 티켓이 있습니다. 출고 완료 후 재입고해 주세요.'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.11 on 2026-10-17 15:02
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# 이력 검색 트리거/인덱스 (PostgreSQL 전용 — 그 외 DB는 search_vector 컬럼만 추가되고 기본 검색 사용)
+# 가중치: 시리얼 번호(A) / 요청사항·증상, 비고(B) / 담당자(C)
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}serial_number, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}symptom, '') || ' ' || coalesce({row}repair_content, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}manager, '')), 'C')
+"""
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE OR REPLACE FUNCTION as_app_asticket_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {vector};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """.format(vector=SEARCH_VECTOR_SQL.format(row="NEW.")),
+    """
+    CREATE TRIGGER as_app_asticket_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF serial_number, symptom, repair_content, manager
+    ON as_app_asticket
+    FOR EACH ROW EXECUTE FUNCTION as_app_asticket_search_vector_update()
+    """,
+    "UPDATE as_app_asticket SET search_vector = {vector}".format(vector=SEARCH_VECTOR_SQL.format(row="")),
+    "CREATE INDEX asticket_search_vector_idx ON as_app_asticket USING gin (search_vector)",
+    # admin icontains는 UPPER(col::text) LIKE로 변환되므로 같은 식으로 트라이그램 인덱스 생성
+    "CREATE INDEX asticket_serial_trgm_idx ON as_app_asticket USING gin (UPPER(serial_number::text) gin_trgm_ops)",
+    "CREATE INDEX tool_model_name_trgm_idx ON as_app_tool USING gin (UPPER(model_name::text) gin_trgm_ops)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS tool_model_name_trgm_idx",
+    "DROP INDEX IF EXISTS asticket_serial_trgm_idx",
+    "DROP INDEX IF EXISTS asticket_search_vector_idx",
+    "DROP TRIGGER IF EXISTS as_app_asticket_search_vector_trigger ON as_app_asticket",
+    "DROP FUNCTION IF EXISTS as_app_asticket_search_vector_update()",
+]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0038_asticket_active_serial_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(_run_on_postgresql(FORWARD_SQL), _run_on_postgresql(BACKWARD_SQL)),
+    ]
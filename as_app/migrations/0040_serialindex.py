@@ -0,0 +1,75 @@
+# Generated by Django 5.2.11 on 2026-10-17 15:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# 마이그레이션 시점의 색인 생성 (as_app.serials 복사본 — 이후 변경과 무관하게 고정)
+def _build_serial_index(index_model, source_model, field, serial_field, exclude_prefix=None, chunk_size=2000):
+    empty = models.Q(**{f"{serial_field}__isnull": True}) | models.Q(**{serial_field: ""})
+    if exclude_prefix:
+        empty |= models.Q(**{f"{serial_field}__startswith": exclude_prefix})
+    rows = (
+        source_model._base_manager.exclude(empty)
+        .order_by()
+        .values_list("pk", serial_field)
+        .iterator(chunk_size=chunk_size)
+    )
+    pending = []
+    for pk, serial in rows:
+        key = "".join((serial or "").split()).upper()
+        if key:
+            pending.append(index_model(**{f"{field}_id": pk, "serial_key": key}))
+        if len(pending) >= chunk_size:
+            index_model._base_manager.bulk_create(pending)
+            pending = []
+    if pending:
+        index_model._base_manager.bulk_create(pending)
+
+
+def fill_serial_index(apps, schema_editor):
+    SerialIndex = apps.get_model("as_app", "SerialIndex")
+    _build_serial_index(
+        SerialIndex, apps.get_model("as_app", "ASTicket"), "ticket", "serial_number", exclude_prefix="없음-"
+    )
+    _build_serial_index(SerialIndex, apps.get_model("tool_inventory", "Inventory"), "inventory", "serial")
+
+
+def create_trigram_index(apps, schema_editor):
+    # 부분 일치(LIKE '%...%')용 pg_trgm 인덱스 — PostgreSQL 전용 (확장은 0039에서 생성)
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX serialindex_key_trgm_idx ON as_app_serialindex USING gin (serial_key gin_trgm_ops)"
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS serialindex_key_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0039_asticket_search_vector'),
+        ('tool_inventory', '0017_batch_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerialIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serial_key', models.CharField(db_index=True, max_length=200, verbose_name='시리얼 번호(정규화)')),
+                ('inventory', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='serial_index', to='tool_inventory.inventory', verbose_name='툴 재고')),
+                ('ticket', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='serial_index', to='as_app.asticket', verbose_name='AS 티켓')),
+            ],
+            options={
+                'verbose_name': '시리얼 색인',
+                'verbose_name_plural': '시리얼 색인',
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('inventory__isnull', True), ('ticket__isnull', False)), models.Q(('inventory__isnull', False), ('ticket__isnull', True)), _connector='OR'), name='serialindex_single_source')],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(fill_serial_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# 이력 검색 부분 일치용 트라이그램 인덱스 (PostgreSQL 전용)
+# 요청사항·증상/비고 icontains는 UPPER(col::text) LIKE로 변환되므로 같은 식으로 인덱스 생성
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX asticket_symptom_trgm_idx ON as_app_asticket USING gin (UPPER(symptom::text) gin_trgm_ops)",
+    "CREATE INDEX asticket_repair_content_trgm_idx ON as_app_asticket USING gin (UPPER(repair_content::text) gin_trgm_ops)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS asticket_repair_content_trgm_idx",
+    "DROP INDEX IF EXISTS asticket_symptom_trgm_idx",
+]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0040_serialindex'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgresql(FORWARD_SQL), _run_on_postgresql(BACKWARD_SQL)),
+    ]
@@ -0,0 +1,60 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+# 이력 검색 tsvector 제거 (PostgreSQL 전용 트리거/함수/인덱스 삭제 후 컬럼 삭제)
+# 검색은 icontains + pg_trgm 인덱스(0039, 0041), 순위는 트라이그램 유사도만 사용한다.
+# 되돌리기용 SQL은 0039 시점의 정의를 그대로 옮겨 둔다.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}serial_number, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}symptom, '') || ' ' || coalesce({row}repair_content, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.simple', coalesce({row}manager, '')), 'C')
+"""
+
+DROP_SQL = [
+    "DROP INDEX IF EXISTS asticket_search_vector_idx",
+    "DROP TRIGGER IF EXISTS as_app_asticket_search_vector_trigger ON as_app_asticket",
+    "DROP FUNCTION IF EXISTS as_app_asticket_search_vector_update()",
+]
+
+RESTORE_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION as_app_asticket_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {vector};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """.format(vector=SEARCH_VECTOR_SQL.format(row="NEW.")),
+    """
+    CREATE TRIGGER as_app_asticket_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF serial_number, symptom, repair_content, manager
+    ON as_app_asticket
+    FOR EACH ROW EXECUTE FUNCTION as_app_asticket_search_vector_update()
+    """,
+    "UPDATE as_app_asticket SET search_vector = {vector}".format(vector=SEARCH_VECTOR_SQL.format(row="")),
+    "CREATE INDEX asticket_search_vector_idx ON as_app_asticket USING gin (search_vector)",
+]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('as_app', '0041_asticket_text_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgresql(DROP_SQL), _run_on_postgresql(RESTORE_SQL)),
+        migrations.RemoveField(
+            model_name='asticket',
+            name='search_vector',
+        ),
+    ]
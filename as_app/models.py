@@ -1,5 +1,6 @@
-from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 
 # ──────────────────────────────────────────────
 # 공용 기준정보 (master_data 앱에서 re-export)
@@ -20,9 +21,39 @@ from simple_history.models import HistoricalRecords
 # ──────────────────────────────────────────────
 
 
+class PartQuerySet(models.QuerySet):
+    def refresh_default_prices(self):
+        """기본 단가(default_price) 컬럼을 단가 그룹 단가에서 다시 계산 (단일 UPDATE)"""
+        default_price = PartPrice.objects.filter(
+            part=models.OuterRef("pk"),
+            category__name=Part.DEFAULT_PRICE_GROUP_NAME,
+        ).values("price")[:1]
+        return self.update(default_price=Coalesce(models.Subquery(default_price), 0))
+
+    refresh_default_prices.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create는 post_save를 보내지 않으므로 카탈로그(공용 부품 목록) 버전을 직접 갱신
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            from .catalog import bump_catalog_version
+            bump_catalog_version()
+        return created
+
+    bulk_create.alters_data = True
+
+    def for_tool(self, tool_id):
+        """장비에 적용 가능한 부품 (공용 부품 포함) — 카탈로그 캐시 기반 pk 조회"""
+        from .catalog import applicable_part_ids
+        return self.filter(pk__in=applicable_part_ids(tool_id))
+
+
 class Part(models.Model):
     """수리부품/공임 관리"""
 
+    # 기본 단가(default_price)의 기준이 되는 단가 그룹명
+    DEFAULT_PRICE_GROUP_NAME = "다스"
+
     PART_TYPE_CHOICES = [
         ('part', '부품'),
         ('labor', '공임'),
@@ -50,19 +81,22 @@ class Part(models.Model):
     name = models.CharField("부품명", max_length=200)
     code = models.CharField("부품코드", max_length=100, blank=True)
     remarks = models.TextField("비고", blank=True)
+    # 비정규화 컬럼: PartPrice/단가 그룹 변경 시 as_app.pricing.part_prices_changed()가 갱신
+    default_price = models.PositiveIntegerField(
+        "기본 단가",
+        default=0,
+        editable=False,
+        help_text="다스 그룹 단가 (단가 그룹별 금액에서 자동 반영)",
+    )
     history = HistoricalRecords()
 
+    objects = PartQuerySet.as_manager()
+
     class Meta:
         verbose_name = "수리부품"
         verbose_name_plural = "수리부품 관리"
         ordering = ["name"]
 
-    @property
-    def default_price(self):
-        """기본 단가 (다스 그룹 단가 기준)"""
-        default_group = self.group_prices.filter(category__name="다스").first()
-        return default_group.price if default_group else 0
-
     def __str__(self):
         return f"{self.name} ({self.default_price:,}원)"
 
@@ -73,13 +107,61 @@ class Part(models.Model):
             return ", ".join(str(t) for t in tools)
         return "공용 (전체 적용)"
 
-    def get_price_for_company(self, company):
-        """업체의 단가 그룹에 맞는 부품 단가를 반환. 미설정 시 None 반환 (fallback 없음)"""
-        if company and company.price_group:
-            group_price = self.group_prices.filter(category=company.price_group).first()
-            if group_price:
-                return group_price.price
-        return None
+    def get_price_for_company(self, company, matrix=None):
+        """업체의 단가 그룹에 맞는 부품 단가를 반환. 미설정 시 None 반환 (fallback 없음)
+
+        prefetch_related('group_prices')가 되어 있으면 그 결과를, 아니면 단가 매트릭스를 사용한다.
+        여러 부품을 조회할 때는 as_app.pricing.get_price_matrix()의 prices_for_company()를 쓴다.
+        """
+        if not (company and company.price_group_id):
+            return None
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("group_prices")
+        if prefetched is not None:
+            for group_price in prefetched:
+                if group_price.category_id == company.price_group_id:
+                    return group_price.price
+            return None
+        if matrix is None:
+            from .pricing import get_price_matrix
+            matrix = get_price_matrix()
+        return matrix.price(self.pk, company.price_group_id)
+
+
+class PartPriceQuerySet(models.QuerySet):
+    """일괄 변경(update/bulk_create/bulk_update) 시 부품 기본 단가와 단가 매트릭스를 갱신하는 QuerySet
+
+    queryset.update()와 bulk 계열 메서드는 post_save 시그널을 보내지 않으므로
+    여기서 직접 처리한다. (개별 save/delete는 as_app.signals에서 처리)
+    """
+
+    def update(self, **kwargs):
+        part_ids = set(self.values_list("part_id", flat=True))
+        updated = super().update(**kwargs)
+        if updated:
+            from .pricing import part_prices_changed
+            part_prices_changed(part_ids)
+        return updated
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            from .pricing import part_prices_changed
+            part_prices_changed({obj.part_id for obj in created})
+        return created
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, *args, **kwargs):
+        updated = super().bulk_update(objs, *args, **kwargs)
+        if updated:
+            from .pricing import part_prices_changed
+            part_prices_changed({obj.part_id for obj in objs})
+        return updated
+
+    bulk_update.alters_data = True
+
 
 class PartPrice(models.Model):
     """수리부품의 단가 그룹별 차등 단가"""
@@ -97,6 +179,8 @@ class PartPrice(models.Model):
     )
     price = models.PositiveIntegerField("그룹 단가", default=0)
 
+    objects = PartPriceQuerySet.as_manager()
+
     class Meta:
         verbose_name = "단가 그룹별 금액"
         verbose_name_plural = "단가 그룹별 금액"
@@ -136,6 +220,24 @@ class TicketUsedPart(models.Model):
         return f"{self.ticket_id}번 티켓 - {self.part.name} ({self.applied_price:,}원)"
 
 
+class RepairPresetQuerySet(models.QuerySet):
+    def for_tool(self, tool_id):
+        """장비에 적용 가능한 수리 세트 (공용 세트 포함) — 카탈로그 캐시 기반 pk 조회"""
+        from .catalog import applicable_preset_ids
+        return self.filter(pk__in=applicable_preset_ids(tool_id))
+
+    def with_totals(self):
+        """세트 합계 금액(부품 기본 단가 합)을 서브쿼리로 함께 조회 — __str__/합계 금액을 표시하는 화면용"""
+        parts_total = (
+            Part.objects.filter(presets=models.OuterRef("pk"))
+            .order_by()
+            .values("presets")
+            .annotate(total=models.Sum("default_price"))
+            .values("total")
+        )
+        return self.annotate(parts_total=Coalesce(models.Subquery(parts_total), 0))
+
+
 class RepairPreset(models.Model):
     """수리 세트 - 자주 사용하는 부품 조합을 프리셋으로 관리"""
 
@@ -160,6 +262,8 @@ class RepairPreset(models.Model):
         help_text="이 세트에 포함되는 부품과 공임을 선택하세요.",
     )
 
+    objects = RepairPresetQuerySet.as_manager()
+
     class Meta:
         verbose_name = "수리 세트"
         verbose_name_plural = "수리 세트 관리"
@@ -170,7 +274,9 @@ class RepairPreset(models.Model):
 
     @property
     def total_price(self):
-        """세트에 포함된 부품/공임의 합계 금액"""
+        """세트에 포함된 부품/공임의 합계 금액 (with_totals()로 조회한 경우 추가 쿼리 없음)"""
+        if hasattr(self, "parts_total"):
+            return self.parts_total
         return sum(p.default_price for p in self.parts.all())
 
 
@@ -179,6 +285,14 @@ class RepairPreset(models.Model):
 # ──────────────────────────────────────────────
 
 
+class InboundBatchQuerySet(models.QuerySet):
+    def refresh_counters(self):
+        """품목 수(ticket_count)/입고 장비 요약(tools_summary) 컬럼을 티켓 기준으로 다시 계산"""
+        from .utils.batch_counters import refresh_batch_counters
+
+        return refresh_batch_counters(self, "tickets", "ticket_count")
+
+
 class InboundBatch(models.Model):
     """입고 배치 - 동일 업체/날짜의 여러 품목을 한 번에 입고 등록"""
 
@@ -193,6 +307,12 @@ class InboundBatch(models.Model):
     memo = models.TextField("메모", blank=True, help_text="이번 입고 건에 대한 참고 메모")
     created_at = models.DateTimeField("생성일", auto_now_add=True)
 
+    # ── 비정규화 카운터 (배치 저장/티켓 삭제 시 refresh_counters()로 갱신) ──
+    ticket_count = models.PositiveIntegerField("품목 수", default=0, editable=False)
+    tools_summary = models.TextField("입고 장비", blank=True, editable=False)
+
+    objects = InboundBatchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "입고 배치"
         verbose_name_plural = "입고 등록"
@@ -200,14 +320,73 @@ class InboundBatch(models.Model):
 
     def __str__(self):
         company_name = self.company.name if self.company_id else "미지정"
-        count = self.tickets.count() if self.pk else 0
-        return f"{self.inbound_date} | {company_name} ({count}건)"
+        return f"{self.inbound_date} | {company_name} ({self.ticket_count}건)"
 
-    @property
-    def ticket_count(self):
+    def refresh_counters(self):
+        """이 배치의 카운터 컬럼을 다시 계산하고 인스턴스 값도 갱신"""
         if not self.pk:
-            return 0
-        return self.tickets.count()
+            return
+        InboundBatch.objects.filter(pk=self.pk).refresh_counters()
+        self.refresh_from_db(fields=["ticket_count", "tools_summary"])
+
+
+class ASTicketQuerySet(models.QuerySet):
+    """일괄 변경(update/bulk_update/bulk_create) 시 대시보드 지표 캐시와 활성 시리얼 집합을 무효화하는 QuerySet
+
+    queryset.update()와 bulk 계열 메서드는 post_save 시그널을 보내지 않으므로
+    여기서 직접 무효화한다. (개별 save/delete는 as_app.signals에서 처리)
+    """
+
+    def update(self, **kwargs):
+        updated = super().update(**kwargs)
+        if updated:
+            from .active_serials import TRACKED_FIELDS, bump_active_serials_version
+            from .dashboard import invalidate_dashboard_metrics
+            invalidate_dashboard_metrics()
+            if TRACKED_FIELDS.intersection(kwargs):
+                bump_active_serials_version()
+        return updated
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            from .active_serials import bump_active_serials_version
+            from .dashboard import invalidate_dashboard_metrics
+            invalidate_dashboard_metrics()
+            bump_active_serials_version()
+        return created
+
+    bulk_create.alters_data = True
+
+    def apply_transition(self, name, on=None, strict=False):
+        """상태 전이(as_app.transitions)를 가드 조건부 일괄 UPDATE로 적용 — TransitionResult 반환"""
+        from .transitions import apply_transition
+        return apply_transition(self, name, on=on, strict=strict)
+
+    apply_transition.alters_data = True
+
+    def active_serial_conflicts(self, pairs, exclude_pks=()):
+        """(tool_id, serial_number) 쌍 중 활성 티켓과 겹치는 쌍의 집합을 단일 쿼리로 반환
+
+        tool_id/시리얼 각각의 IN 조건으로 후보를 좁힌 뒤 정확한 쌍 일치는 Python에서 판정한다.
+        중복 방지 자체는 DB 유일 제약(asticket_active_serial_uniq)이 담당하므로,
+        저장이 제약 위반으로 실패한 뒤 충돌 항목을 안내할 때 사용한다.
+        """
+        pairs = {(tool_id, serial) for tool_id, serial in pairs if tool_id and serial}
+        if not pairs:
+            return set()
+        qs = self.filter(
+            status__in=ASTicket.ACTIVE_STATUSES,
+            tool_id__in={tool_id for tool_id, _ in pairs},
+            serial_number__in={serial for _, serial in pairs},
+        )
+        exclude_pks = [pk for pk in exclude_pks if pk]
+        if exclude_pks:
+            qs = qs.exclude(pk__in=exclude_pks)
+        existing = set(qs.order_by().values_list("tool_id", "serial_number"))
+        return pairs & existing
 
 
 class ASTicket(models.Model):
@@ -221,6 +400,14 @@ class ASTicket(models.Model):
         DISPOSED = "disposed", "자체폐기"
         HOLD = "hold", "수리보류"
 
+    # 출고/폐기 전 활성 상태 (동일 툴+시리얼 중복 입고 금지 대상)
+    ACTIVE_STATUSES = [Status.INBOUND, Status.OUTSOURCED, Status.REPAIRED, Status.HOLD]
+    # 활성 티켓 툴+시리얼 유일 제약 (Meta.constraints)
+    ACTIVE_SERIAL_CONSTRAINT = "asticket_active_serial_uniq"
+    DUPLICATE_SERIAL_CODE = "duplicate_active_serial"
+    # 시리얼 없는 장비 입고 시 자동 부여하는 임시 시리얼 접두어 (통합 시리얼 색인 제외 대상)
+    NO_SERIAL_PREFIX = "없음-"
+
     # ── 입고 정보 ──
     inbound_batch = models.ForeignKey(
         InboundBatch,
@@ -285,34 +472,127 @@ class ASTicket(models.Model):
     created_at = models.DateTimeField("생성일", auto_now_add=True)
     updated_at = models.DateTimeField("수정일", auto_now=True)
 
+    objects = ASTicketQuerySet.as_manager()
+
     class Meta:
         verbose_name = "AS 티켓"
         verbose_name_plural = "AS 티켓"
         ordering = ["-inbound_date", "-created_at"]
+        indexes = [
+            # 업무 큐(수리/보류/의뢰/출고/통합 이력): status 필터 + 입고일·생성일 역순 정렬
+            models.Index(fields=["status", "inbound_date", "created_at"], name="asticket_status_inbound_idx"),
+            # 대시보드 매출/최근 출고: status + 출고일 범위
+            models.Index(fields=["status", "outbound_date"], name="asticket_status_outbound_idx"),
+            # 툴+시리얼 조회 (이력 검색 / 출고·폐기 티켓 포함)
+            models.Index(fields=["tool", "serial_number", "status"], name="asticket_tool_serial_idx"),
+            # 매출처 필터 + 상태
+            models.Index(fields=["company", "status"], name="asticket_company_status_idx"),
+        ]
+        constraints = [
+            # 동일 툴+시리얼은 출고/폐기 전(활성) 티켓 1건만 허용 — 조건은 ACTIVE_STATUSES와 동일하게 유지
+            # 동시 입고 등록에서도 DB가 중복을 막으며, 저장 경로는 IntegrityError를 안내 메시지로 변환한다.
+            models.UniqueConstraint(
+                fields=["tool", "serial_number"],
+                condition=models.Q(status__in=["inbound", "outsourced", "repaired", "hold"]),
+                name="asticket_active_serial_uniq",
+                violation_error_code="duplicate_active_serial",
+                violation_error_message="현재 입고/수리 중인 티켓이 있습니다. 출고 완료 후 재입고해 주세요.",
+            ),
+        ]
+
+    # 입고 배치 카운터(품목 수/장비 요약)에 반영되는 필드 — 값이 바뀌면 이전/새 배치를 다시 계산
+    BATCH_COUNTER_FIELDS = ("inbound_batch_id", "tool_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """DB에서 읽은 시점의 배치/장비 값 기록 (as_app.signals에서 저장 후 비교)"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_batch_values = instance.batch_counter_values()
+        return instance
+
+    def batch_counter_values(self):
+        # 지연 로딩(defer)된 필드는 조회하지 않고 None으로 둔다.
+        return {name: self.__dict__.get(name) for name in self.BATCH_COUNTER_FIELDS}
+
+    def validate_constraints(self, exclude=None):
+        """활성 티켓 툴+시리얼 유일 제약 위반은 시리얼 번호 필드 에러로 안내
+
+        단건 폼 저장 전 검증은 Django 제약 검증(쿼리 1회)에 맡기고 메시지만 기존 형식으로 바꾼다.
+        """
+        try:
+            super().validate_constraints(exclude=exclude)
+        except ValidationError as exc:
+            non_field = exc.error_dict.get(NON_FIELD_ERRORS, [])
+            if any(error.code == self.DUPLICATE_SERIAL_CODE for error in non_field):
+                non_field[:] = [error for error in non_field if error.code != self.DUPLICATE_SERIAL_CODE]
+                if not non_field:
+                    del exc.error_dict[NON_FIELD_ERRORS]
+                exc.error_dict.setdefault("serial_number", []).append(self.duplicate_serial_error())
+            raise
+
+    def duplicate_serial_error(self):
+        """시리얼 번호 중복 안내 에러 (툴/시리얼 포함)"""
+        return ValidationError(
+            "이 장비(%(tool)s)의 시리얼 번호 '%(sn)s'은(는) "
+            "현재 입고/수리 중인 티켓이 있습니다. 출고 완료 후 재입고해 주세요.",
+            code=self.DUPLICATE_SERIAL_CODE,
+            params={"tool": self.tool, "sn": self.serial_number},
+        )
 
-    def clean(self):
-        """동일 툴+시리얼 번호가 출고 전(활성) 상태로 이미 존재하면 중복 방지"""
-        super().clean()
-        if self.tool_id and self.serial_number:
-            active_statuses = [
-                self.Status.INBOUND,
-                self.Status.OUTSOURCED,
-                self.Status.REPAIRED,
-                self.Status.HOLD,
-            ]
-            qs = ASTicket.objects.filter(
-                tool=self.tool,
-                serial_number=self.serial_number,
-                status__in=active_statuses,
-            )
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            if qs.exists():
-                raise ValidationError(
-                    {"serial_number": "이 장비(%(tool)s)의 시리얼 번호 '%(sn)s'은(는) "
-                     "현재 입고/수리 중인 티켓이 있습니다. 출고 완료 후 재입고해 주세요."},
-                    params={"tool": self.tool, "sn": self.serial_number},
-                )
+    @classmethod
+    def is_duplicate_serial_error(cls, exc):
+        """IntegrityError가 활성 티켓 툴+시리얼 유일 제약 위반인지 판별"""
+        diag = getattr(exc.__cause__, "diag", None)
+        if diag is not None:
+            # PostgreSQL: 위반한 제약 이름이 그대로 전달됨
+            return diag.constraint_name == cls.ACTIVE_SERIAL_CONSTRAINT
+        # SQLite: "UNIQUE constraint failed: <table>.tool_id, <table>.serial_number"
+        table = cls._meta.db_table
+        return f"{table}.tool_id, {table}.serial_number" in str(exc)
+
+    # ── 사용 부품 단가 스냅샷 / 비용 계산 ──
+
+    @staticmethod
+    def calculate_nego_price(parts_total):
+        """부품/공임 합계 → 최종 네고가 (10% 할인, 부가세 별도, 원 단위 절사)"""
+        return parts_total * 9 // 10
+
+    @staticmethod
+    def calculate_repair_cost(parts_total):
+        """부품/공임 합계 → AS 비용 (네고가 10% 할인 후 부가세 10% 포함, 원 단위 절사)"""
+        return ASTicket.calculate_nego_price(parts_total) * 11 // 10
+
+    def snapshot_used_parts(self, parts, matrix=None):
+        """선택된 부품/공임을 업체 단가 스냅샷(TicketUsedPart)으로 반영
+
+        - 기존 스냅샷과 선택 목록을 비교해 빠진 부품은 DELETE 1회, 새 부품은 bulk_create 1회
+        - 이미 등록된 부품의 스냅샷 단가는 유지
+        - 업체 단가 그룹에 단가가 없는 부품은 등록하지 않으며 기존 스냅샷도 제거
+        반환: 단가 미설정으로 제외된 부품 리스트
+        """
+        if matrix is None:
+            from .pricing import get_price_matrix
+            matrix = get_price_matrix()
+        selected = {part.pk: part for part in parts}
+        prices = matrix.prices_for_company(selected, self.company)
+        missing = [part for pk, part in selected.items() if prices[pk] is None]
+        keep = {pk for pk, price in prices.items() if price is not None}
+
+        with transaction.atomic(savepoint=False):
+            existing = set(self.ticket_used_parts.values_list("part_id", flat=True))
+            removed = existing - keep
+            if removed:
+                self.ticket_used_parts.filter(part_id__in=removed).delete()
+            TicketUsedPart.objects.bulk_create([
+                TicketUsedPart(ticket=self, part_id=pk, applied_price=prices[pk])
+                for pk in sorted(keep - existing)
+            ])
+        return missing
+
+    def parts_repair_cost(self):
+        """스냅샷 단가 합계(DB 집계)로 계산한 AS 비용"""
+        total = self.ticket_used_parts.aggregate(total=models.Sum("applied_price"))["total"]
+        return self.calculate_repair_cost(total or 0)
 
     def __str__(self):
         company_name = self.company.name if self.company_id else "미지정 업체"
@@ -397,6 +677,78 @@ class HoldTicket(ASTicket):
         verbose_name_plural = "수리보류 등록"
 
 
+# ──────────────────────────────────────────────
+# 통합 시리얼 색인 (AS 티켓 + 툴 재고)
+# 같은 시리얼이 AS 티켓(serial_number)과 툴 재고(serial)에 모두 있을 수 있으므로
+# 정규화한 시리얼과 원본 행을 한 테이블에 모아 포탈 시리얼 조회가 한 번에 찾도록 한다.
+# 저장/일괄 생성 시그널에서 갱신하고 원본 행 삭제 시 CASCADE로 함께 지워진다. (as_app.serials 참고)
+# ──────────────────────────────────────────────
+
+
+class SerialIndexQuerySet(models.QuerySet):
+    def search(self, term, infix=False):
+        """시리얼 검색 — 기본은 앞부분 일치, infix=True면 부분 일치 (검색어는 색인과 같은 방식으로 정규화)"""
+        from .serials import normalize_serial
+
+        key = normalize_serial(term)
+        if not key:
+            return self.none()
+        lookup = "serial_key__contains" if infix else "serial_key__startswith"
+        return self.filter(**{lookup: key})
+
+    def for_sources(self, sources):
+        """원본 종류("ticket"/"inventory") 중 주어진 종류의 색인 행만 (사용자 조회 권한 범위)"""
+        from .serials import SERIAL_SOURCES
+
+        sources = set(sources)
+        if sources >= set(SERIAL_SOURCES):
+            return self
+        condition = models.Q()
+        for source in sources:
+            condition |= models.Q(**{f"{source}__isnull": False})
+        return self.filter(condition) if sources else self.none()
+
+
+class SerialIndex(models.Model):
+    """시리얼 번호 → AS 티켓 / 툴 재고 행 색인 (원본 1행당 1행, 시리얼이 비어 있으면 색인하지 않음)"""
+
+    serial_key = models.CharField("시리얼 번호(정규화)", max_length=200, db_index=True)
+    ticket = models.OneToOneField(
+        ASTicket,
+        on_delete=models.CASCADE,
+        verbose_name="AS 티켓",
+        related_name="serial_index",
+        null=True,
+        blank=True,
+    )
+    inventory = models.OneToOneField(
+        "tool_inventory.Inventory",
+        on_delete=models.CASCADE,
+        verbose_name="툴 재고",
+        related_name="serial_index",
+        null=True,
+        blank=True,
+    )
+
+    objects = SerialIndexQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "시리얼 색인"
+        verbose_name_plural = "시리얼 색인"
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(ticket__isnull=False, inventory__isnull=True)
+                    | models.Q(ticket__isnull=True, inventory__isnull=False)
+                ),
+                name="serialindex_single_source",
+            ),
+        ]
+
+    def __str__(self):
+        return self.serial_key
+
+
 # ──────────────────────────────────────────────
 # 개선사항 요청 게시판 (Improvement Request Board)
 # ──────────────────────────────────────────────
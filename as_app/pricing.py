@@ -0,0 +1,237 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from .utils.cache_version import bump_version, get_version
+
+# ──────────────────────────────────────────────
+# 부품 단가 매트릭스
+# PartPrice 전체를 {단가 그룹 id: {부품 id: 단가}} 형태로 한 번에 읽어 캐시에 보관한다.
+# 수리/보류 폼처럼 부품 수십~수백 개의 업체 단가가 필요한 화면은
+# 부품별 group_prices 쿼리 대신 매트릭스 조회(쿼리 0회)로 처리한다.
+# PartPrice 저장/삭제 시그널과 PartPrice QuerySet의 일괄 변경에서 part_prices_changed()가
+# 매트릭스 버전을 올려 무효화하며(as_app.utils.cache_version), 같은 시점에 Part.default_price 비정규화 컬럼도 갱신된다.
+# ──────────────────────────────────────────────
+
+PRICE_MATRIX_VERSION_KEY = "as_app:part_price_matrix_version"
+PRICE_MATRIX_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class PriceMatrix:
+    """(부품, 단가 그룹) → 단가 조회표"""
+
+    def __init__(self, prices):
+        self._prices = prices
+
+    def price(self, part_id, category_id):
+        """단가 반환. 미설정 시 None"""
+        return self._prices.get(category_id, {}).get(part_id)
+
+    def prices_for(self, part_ids, category_id):
+        """여러 부품의 단가 그룹 단가를 {부품 id: 단가 또는 None} dict로 반환"""
+        group = self._prices.get(category_id, {})
+        return {part_id: group.get(part_id) for part_id in part_ids}
+
+    def prices_for_company(self, part_ids, company):
+        """업체의 단가 그룹 기준 단가 dict 반환 (단가 그룹 미지정 업체는 전부 None)"""
+        category_id = company.price_group_id if company else None
+        return self.prices_for(part_ids, category_id)
+
+    def total_for_company(self, part_ids, company):
+        """업체 단가 기준 합계 (미설정 단가는 0으로 계산)"""
+        return sum(price or 0 for price in self.prices_for_company(part_ids, company).values())
+
+
+def compute_price_matrix():
+    """PartPrice 전체를 단일 쿼리로 읽어 매트릭스 dict 생성"""
+    from .models import PartPrice
+
+    prices = {}
+    rows = PartPrice.objects.order_by().values_list("category_id", "part_id", "price")
+    for category_id, part_id, price in rows.iterator():
+        prices.setdefault(category_id, {})[part_id] = price
+    return prices
+
+
+def get_price_matrix():
+    """캐시된 단가 매트릭스 반환 (캐시 미스 시 단일 쿼리로 계산 후 저장)
+
+    한 요청 안에서는 반환된 PriceMatrix를 재사용한다.
+    """
+    key = f"as_app:part_price_matrix:{get_version(PRICE_MATRIX_VERSION_KEY)}"
+    prices = cache.get(key)
+    if prices is None:
+        prices = compute_price_matrix()
+        cache.set(key, prices, PRICE_MATRIX_CACHE_TIMEOUT)
+    return PriceMatrix(prices)
+
+
+def invalidate_price_matrix():
+    """단가 매트릭스 캐시 버전 갱신 (트랜잭션 커밋 이후 실행)"""
+    bump_version(PRICE_MATRIX_VERSION_KEY)
+
+
+def upsert_part_prices(entries, batch_size=1000):
+    """(part_id, category_id, price) 목록을 PartPrice에 일괄 반영 (INSERT ... ON CONFLICT UPDATE)
+
+    (부품, 단가 그룹) 단위로 이미 있으면 단가만 갱신한다.
+    기본 단가/매트릭스/카탈로그 갱신은 PartPriceQuerySet.bulk_create에서 한 번에 처리된다.
+    반환: 반영한 행 수
+    """
+    from .models import PartPrice
+
+    objs = [
+        PartPrice(part_id=part_id, category_id=category_id, price=price)
+        for part_id, category_id, price in entries
+    ]
+    if not objs:
+        return 0
+    PartPrice.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["part", "category"],
+        update_fields=["price"],
+    )
+    return len(objs)
+
+
+def part_prices_changed(part_ids=None):
+    """PartPrice 변경 후처리: 부품 기본 단가 컬럼 갱신 + 단가 매트릭스 캐시 무효화 + 카탈로그 버전 갱신
+
+    part_ids가 None이면 전체 부품의 기본 단가를 다시 계산한다. (단가 그룹명 변경 등)
+    """
+    from .catalog import bump_catalog_version
+    from .models import Part
+
+    parts = Part.objects.all() if part_ids is None else Part.objects.filter(pk__in=part_ids)
+    parts.refresh_default_prices()
+    invalidate_price_matrix()
+    bump_catalog_version()
+
+
+# ──────────────────────────────────────────────
+# 미출고 티켓 일괄 재단가
+# 단가표 개정이나 매출처 단가 그룹 변경 후, 출고 전(활성) 티켓의 사용 부품 스냅샷 단가와
+# AS 비용을 현재 단가 그룹 단가로 다시 계산한다.
+# 티켓 id 청크 단위로 상관 서브쿼리 UPDATE 2회(부품 단가 → AS 비용)만 실행한다.
+# AS 비용은 이번 실행에서 부품 단가가 바뀐 티켓만 다시 계산한다.
+# (사용 부품이 없는 티켓의 직접 입력 비용은 건드리지 않는다)
+# 현재 단가 그룹에 단가가 없는 부품은 기존 스냅샷 단가를 유지하고 보고서에 집계한다.
+# ──────────────────────────────────────────────
+
+REPRICE_CHUNK_SIZE = 1000
+
+
+class RepriceReport:
+    """재단가 결과 (dry_run이면 변경 예정 내역)"""
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.tickets_scanned = 0
+        self.parts_changed = 0
+        self.parts_missing_price = 0
+        self.tickets_changed = 0
+        self.cost_delta = 0
+
+    def summary(self):
+        prefix = "[미리보기] " if self.dry_run else ""
+        return (
+            f"{prefix}대상 티켓 {self.tickets_scanned:,}건 중 비용 변경 {self.tickets_changed:,}건 "
+            f"(합계 {self.cost_delta:+,}원), 부품 단가 변경 {self.parts_changed:,}건, "
+            f"단가 미설정으로 유지 {self.parts_missing_price:,}건"
+        )
+
+
+def _group_price_subquery():
+    """사용 부품 행 기준: 티켓 매출처의 현재 단가 그룹 단가"""
+    from django.db.models import OuterRef, Subquery
+
+    from .models import PartPrice
+
+    return Subquery(
+        PartPrice.objects.filter(
+            part_id=OuterRef("part_id"),
+            category__companies__tickets=OuterRef("ticket_id"),
+        ).values("price")[:1]
+    )
+
+
+def _repair_cost_expression(parts_price):
+    """티켓 기준: 사용 부품 단가(parts_price 식) 합계로 계산한 AS 비용 식
+
+    ASTicket.calculate_repair_cost와 동일한 정수 연산 (네고가 10% 할인 → 부가세 10%)
+    """
+    from django.db.models import IntegerField, OuterRef, Subquery, Sum, Value
+    from django.db.models.functions import Coalesce
+
+    from .models import TicketUsedPart
+
+    parts_total = Subquery(
+        TicketUsedPart.objects.filter(ticket_id=OuterRef("pk"))
+        .order_by()
+        .annotate(unit_price=parts_price)
+        .values("ticket_id")
+        .annotate(total=Sum("unit_price"))
+        .values("total"),
+        output_field=IntegerField(),
+    )
+    total = Coalesce(parts_total, Value(0))
+    return total * 9 / 10 * 11 / 10
+
+
+def reprice_open_tickets(tickets=None, dry_run=False, chunk_size=REPRICE_CHUNK_SIZE):
+    """출고 전 티켓의 사용 부품 단가 스냅샷과 AS 비용을 현재 단가로 재계산
+
+    tickets: 대상 ASTicket QuerySet (기본: 전체). 활성 상태(ACTIVE_STATUSES)만 처리한다.
+    반환: RepriceReport
+    """
+    from django.db.models import Count, F, Sum
+    from django.db.models.functions import Coalesce
+
+    from .models import ASTicket, TicketUsedPart
+
+    tickets = ASTicket.objects.all() if tickets is None else tickets
+    ticket_ids = list(
+        tickets.filter(status__in=ASTicket.ACTIVE_STATUSES)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    report = RepriceReport(dry_run)
+    report.tickets_scanned = len(ticket_ids)
+
+    for start in range(0, len(ticket_ids), chunk_size):
+        chunk = ticket_ids[start:start + chunk_size]
+        with transaction.atomic():
+            used_parts = TicketUsedPart.objects.filter(ticket_id__in=chunk).annotate(
+                group_price=_group_price_subquery()
+            )
+            report.parts_missing_price += used_parts.filter(group_price__isnull=True).count()
+            changed_parts = used_parts.filter(group_price__isnull=False).exclude(applied_price=F("group_price"))
+            repriced_ids = list(changed_parts.order_by().values_list("ticket_id", flat=True).distinct())
+            if not repriced_ids:
+                continue
+
+            # 비용 변경 집계: dry_run이면 새 단가(미설정 시 기존 단가)를 적용했다고 가정하고 계산
+            if dry_run:
+                parts_price = Coalesce(_group_price_subquery(), F("applied_price"))
+                report.parts_changed += changed_parts.count()
+            else:
+                parts_price = F("applied_price")
+                report.parts_changed += changed_parts.update(applied_price=_group_price_subquery())
+
+            changed_tickets = (
+                ASTicket.objects.filter(pk__in=repriced_ids)
+                .annotate(new_cost=_repair_cost_expression(parts_price))
+                .exclude(repair_cost=F("new_cost"))
+            )
+            stats = changed_tickets.aggregate(
+                count=Count("pk"),
+                delta=Sum(F("new_cost") - F("repair_cost")),
+            )
+            report.tickets_changed += stats["count"]
+            report.cost_delta += stats["delta"] or 0
+            if not dry_run and stats["count"]:
+                ASTicket.objects.filter(pk__in=changed_tickets.values("pk")).update(
+                    repair_cost=_repair_cost_expression(F("applied_price"))
+                )
+    return report
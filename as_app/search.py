@@ -0,0 +1,60 @@
+from django.db import connections
+from django.db.models import Q, Value
+from django.db.models.functions import Greatest
+
+# ──────────────────────────────────────────────
+# AS 이력 검색 (PostgreSQL 트라이그램)
+# 일치 여부는 기존 admin 검색과 같은 부분 일치(icontains)로 판정한다.
+# 시리얼 번호/요청사항·증상/비고와 장비 모델명은 UPPER(...) pg_trgm GIN 인덱스가 있어
+# icontains(LIKE '%...%')도 인덱스를 탄다. (0039, 0041 마이그레이션)
+# 한국어 복합어("모터고장")는 전문 검색 토큰으로 나뉘지 않으므로 별도 tsvector 없이
+# 순위도 트라이그램 유사도로 계산한다. (0042 마이그레이션에서 search_vector 컬럼/트리거 제거)
+# 매출처/장비 이름 조건은 작은 기준정보 테이블에서 id를 먼저 찾아 티켓을 id IN으로 거른다.
+# 인덱스는 마이그레이션이 PostgreSQL에서만 만든다. 그 외 DB는 기존 admin 검색을 쓴다.
+# ──────────────────────────────────────────────
+
+# 요청사항·증상/비고 단어 유사도의 순위 가중치 (시리얼 번호 유사도 = 1)
+TEXT_RANK_WEIGHT = 0.5
+
+
+def search_backend_enabled(using="default"):
+    """PostgreSQL 검색 백엔드 사용 여부"""
+    return connections[using].vendor == "postgresql"
+
+
+def search_tickets(queryset, search_term):
+    """ASTicket QuerySet에 검색 조건과 search_rank 주석을 적용해 반환
+
+    공백으로 나눈 검색어마다 아래 중 하나에 부분 일치하면 일치(검색어 간은 AND, admin 기본 검색과 동일):
+    시리얼 번호 / 요청사항·증상 / 비고 / 장비 모델명·브랜드 / 매출처 이름.
+    순위는 시리얼 번호 유사도 + 요청사항·증상/비고 단어 유사도(가중치 TEXT_RANK_WEIGHT)
+    PostgreSQL이 아니거나 검색어가 비어 있으면 None (호출 측에서 기본 검색 사용)
+    """
+    from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+
+    from .models import Company, Tool
+
+    terms = search_term.split()
+    if not terms or not search_backend_enabled(queryset.db):
+        return None
+
+    for term in terms:
+        tool_ids = Tool.objects.filter(
+            Q(model_name__icontains=term) | Q(brand__name__icontains=term)
+        ).values("pk")
+        company_ids = Company.objects.filter(name__icontains=term).values("pk")
+        queryset = queryset.filter(
+            Q(serial_number__icontains=term)
+            | Q(symptom__icontains=term)
+            | Q(repair_content__icontains=term)
+            | Q(tool__in=tool_ids)
+            | Q(company__in=company_ids)
+        )
+
+    # 순위: 시리얼 번호 유사도(시리얼 일치 항목이 위로) + 증상/비고에 검색어와 비슷한 단어가 있는 항목
+    text_rank = Greatest(
+        TrigramWordSimilarity(search_term, "symptom"),
+        TrigramWordSimilarity(search_term, "repair_content"),
+    )
+    rank = TrigramSimilarity("serial_number", search_term) + Value(TEXT_RANK_WEIGHT) * text_rank
+    return queryset.annotate(search_rank=rank)
@@ -0,0 +1,239 @@
+from django.db.models import Count, Q
+from django.urls import reverse
+
+# ──────────────────────────────────────────────
+# 통합 시리얼 조회 (AS 티켓 + 툴 재고)
+# SerialIndex 한 행 = 시리얼이 있는 ASTicket 또는 tool_inventory.Inventory 한 행.
+#   serial_key는 공백을 없애고 대문자로 바꾼 값이며, 앞부분 일치는 B-tree(PostgreSQL은 LIKE용
+#   varchar_pattern_ops 포함), 부분 일치는 pg_trgm GIN 인덱스를 탄다. (인덱스: 0040 마이그레이션)
+# 갱신: 개별 저장은 post_save 시그널(as_app/tool_inventory signals),
+#   입고 배치 일괄 생성은 tickets_bulk_created 시그널, 원본 삭제는 FK CASCADE.
+#   그 외 경로(SQL 직접 수정, 데이터 이관)로 어긋나면 rebuild_serial_index 명령으로 다시 만든다.
+# 타임라인은 색인 검색 + 양쪽 원본/기준정보 select_related 조인 쿼리 1회로 만든다.
+# ──────────────────────────────────────────────
+
+TIMELINE_LIMIT = 200
+LOOKUP_LIMIT = 20
+REBUILD_CHUNK_SIZE = 2000
+
+# 색인 원본 종류 → 조회 권한 (권한이 없는 종류의 색인 행은 조회 결과에서 제외)
+SERIAL_SOURCES = {
+    "ticket": "as_app.view_asticket",
+    "inventory": "tool_inventory.view_inventory",
+}
+
+
+def visible_sources(user):
+    """사용자가 조회 권한을 가진 색인 원본 종류 (빈 튜플이면 조회 불가)"""
+    return tuple(source for source, perm in SERIAL_SOURCES.items() if user.has_perm(perm))
+
+
+def normalize_serial(value):
+    """시리얼 비교용 키 — 공백 제거 + 대문자 (빈 값이면 빈 문자열)"""
+    return "".join((value or "").split()).upper()
+
+
+def _source(obj):
+    """원본 객체 → (SerialIndex FK 이름, 시리얼 값)"""
+    from tool_inventory.models import Inventory
+
+    from .models import ASTicket
+
+    if isinstance(obj, ASTicket):
+        if obj.serial_number.startswith(ASTicket.NO_SERIAL_PREFIX):
+            return "ticket", ""
+        return "ticket", obj.serial_number
+    if isinstance(obj, Inventory):
+        return "inventory", obj.serial
+    raise TypeError("시리얼 색인 대상이 아닙니다: %r" % type(obj))
+
+
+def index_serial(obj):
+    """원본 1행의 색인을 갱신 (UPDATE 1회, 색인이 없을 때만 INSERT)"""
+    from .models import SerialIndex
+
+    field, serial = _source(obj)
+    rows = SerialIndex.objects.filter(**{f"{field}_id": obj.pk})
+    key = normalize_serial(serial)
+    if not key:
+        rows.delete()
+    elif not rows.update(serial_key=key):
+        SerialIndex.objects.create(**{f"{field}_id": obj.pk, "serial_key": key})
+
+
+def index_serials(objs):
+    """같은 종류 원본 여러 행의 색인을 한 번에 갱신 (DELETE 1회 + bulk_create 1회)"""
+    from .models import SerialIndex
+
+    objs = [obj for obj in objs if obj.pk]
+    if not objs:
+        return
+    field, _ = _source(objs[0])
+    SerialIndex.objects.filter(**{f"{field}_id__in": [obj.pk for obj in objs]}).delete()
+    SerialIndex.objects.bulk_create([
+        SerialIndex(**{f"{field}_id": obj.pk, "serial_key": key})
+        for obj in objs
+        if (key := normalize_serial(_source(obj)[1]))
+    ])
+
+
+def build_serial_index(index_model, source_model, field, serial_field, chunk_size=REBUILD_CHUNK_SIZE,
+                       exclude_prefix=None):
+    """원본 테이블 전체를 읽어 색인 행 생성 — 생성 건수 반환 (rebuild_serial_index에서 사용)
+
+    원본은 iterator로 스트리밍하고 chunk_size마다 bulk_create한다.
+    exclude_prefix: 색인하지 않을 시리얼 접두어 (AS 티켓의 시리얼 없음 임시 번호)
+    """
+    empty = Q(**{f"{serial_field}__isnull": True}) | Q(**{serial_field: ""})
+    if exclude_prefix:
+        empty |= Q(**{f"{serial_field}__startswith": exclude_prefix})
+    rows = (
+        source_model._base_manager.exclude(empty)
+        .order_by()
+        .values_list("pk", serial_field)
+        .iterator(chunk_size=chunk_size)
+    )
+    created = 0
+    pending = []
+    for pk, serial in rows:
+        key = normalize_serial(serial)
+        if key:
+            pending.append(index_model(**{f"{field}_id": pk, "serial_key": key}))
+        if len(pending) >= chunk_size:
+            created += len(index_model._base_manager.bulk_create(pending))
+            pending = []
+    if pending:
+        created += len(index_model._base_manager.bulk_create(pending))
+    return created
+
+
+def rebuild_serial_index(chunk_size=REBUILD_CHUNK_SIZE):
+    """색인 전체 재생성 — {"ticket": 건수, "inventory": 건수} 반환"""
+    from tool_inventory.models import Inventory
+
+    from .models import ASTicket, SerialIndex
+
+    SerialIndex.objects.all().delete()
+    return {
+        "ticket": build_serial_index(
+            SerialIndex, ASTicket, "ticket", "serial_number", chunk_size, ASTicket.NO_SERIAL_PREFIX
+        ),
+        "inventory": build_serial_index(SerialIndex, Inventory, "inventory", "serial", chunk_size),
+    }
+
+
+# ── 조회 ──
+
+
+def lookup_serials(term, infix=False, limit=LOOKUP_LIMIT, sources=tuple(SERIAL_SOURCES)):
+    """검색어와 일치하는 시리얼 목록 (자동완성용) — [{"serial", "tickets", "inventories"}, ...]
+
+    sources: 조회할 원본 종류 (visible_sources(user) 결과)
+    """
+    from .models import SerialIndex
+
+    rows = (
+        SerialIndex.objects.search(term, infix)
+        .for_sources(sources)
+        .values("serial_key")
+        .annotate(tickets=Count("ticket_id"), inventories=Count("inventory_id"))
+        .order_by("serial_key")[:limit]
+    )
+    return [
+        {"serial": row["serial_key"], "tickets": row["tickets"], "inventories": row["inventories"]}
+        for row in rows
+    ]
+
+
+class SerialEvent:
+    """시리얼 타임라인의 이벤트 1건 (serial_timeline 결과)"""
+
+    __slots__ = ("date", "label", "source", "serial", "tool_label", "party", "detail", "status", "url")
+
+    def __init__(self, date, label, source, serial, tool_label, party="", detail="", status="", url=""):
+        self.date = date
+        self.label = label
+        self.source = source
+        self.serial = serial
+        self.tool_label = tool_label
+        self.party = party
+        self.detail = detail
+        self.status = status
+        self.url = url
+
+
+def _tool_label(tool):
+    return "%s > %s" % (tool.brand.name, tool.model_name)
+
+
+def _ticket_events(ticket):
+    """AS 티켓 1건 → 입고/수리의뢰/수리보류/수리완료·자체폐기/출고 이벤트
+
+    수리완료·자체폐기는 별도 날짜 컬럼이 없으므로 현재 그 상태인 티켓만 수정일 기준으로 표시한다.
+    """
+    from .models import ASTicket
+
+    common = {
+        "source": "AS",
+        "serial": ticket.serial_number,
+        "tool_label": _tool_label(ticket.tool),
+        "status": ticket.get_status_display(),
+        "url": reverse("admin:as_app_ashistory_change", args=[ticket.pk]),
+    }
+    yield SerialEvent(ticket.inbound_date, "AS 입고", party=ticket.company.name, detail=ticket.symptom, **common)
+    if ticket.outsource_date:
+        party = ticket.outsource_company.name if ticket.outsource_company else ""
+        yield SerialEvent(ticket.outsource_date, "수리의뢰", party=party, **common)
+    if ticket.hold_date:
+        yield SerialEvent(ticket.hold_date, "수리보류", **common)
+    if ticket.status in (ASTicket.Status.REPAIRED, ASTicket.Status.DISPOSED):
+        label = "수리완료" if ticket.status == ASTicket.Status.REPAIRED else "자체폐기"
+        yield SerialEvent(ticket.updated_at.date(), label, detail=ticket.repair_content, **common)
+    if ticket.outbound_date:
+        yield SerialEvent(ticket.outbound_date, "AS 출고", party=ticket.company.name, detail=ticket.repair_content, **common)
+
+
+def _inventory_events(inventory):
+    """툴 재고 1건 → 재고 입고/재고 출고 이벤트"""
+    common = {
+        "source": "툴 재고",
+        "serial": inventory.serial,
+        "tool_label": _tool_label(inventory.tool),
+        "status": inventory.get_status_display(),
+        "url": reverse("tool_admin:tool_inventory_inventory_change", args=[inventory.pk]),
+    }
+    yield SerialEvent(inventory.date, "재고 입고", party=inventory.supplier.name, **common)
+    if inventory.release_date:
+        party = inventory.release_company.name if inventory.release_company else ""
+        yield SerialEvent(
+            inventory.release_date, "재고 출고", party=party, detail=inventory.usage_process or "", **common
+        )
+
+
+def serial_timeline(term, infix=False, limit=TIMELINE_LIMIT, sources=tuple(SERIAL_SOURCES)):
+    """검색어와 일치하는 시리얼별 통합 타임라인 — ([(시리얼, [SerialEvent, ...]), ...], 잘림 여부)
+
+    색인 행을 최대 limit건까지 원본/기준정보와 함께 한 쿼리로 읽고,
+    이벤트는 시리얼별로 최근 날짜부터 정렬한다.
+    sources: 조회할 원본 종류 (visible_sources(user) 결과)
+    """
+    from .models import SerialIndex
+
+    rows = list(
+        SerialIndex.objects.search(term, infix)
+        .for_sources(sources)
+        .select_related(
+            "ticket__tool__brand", "ticket__company", "ticket__outsource_company",
+            "inventory__tool__brand", "inventory__supplier", "inventory__release_company",
+        )
+        .order_by("serial_key", "pk")[:limit + 1]
+    )
+    truncated = len(rows) > limit
+
+    timeline = {}
+    for row in rows[:limit]:
+        events = _ticket_events(row.ticket) if row.ticket_id else _inventory_events(row.inventory)
+        timeline.setdefault(row.serial_key, []).extend(events)
+    for events in timeline.values():
+        events.sort(key=lambda event: event.date, reverse=True)
+    return list(timeline.items()), truncated
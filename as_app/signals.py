@@ -0,0 +1,174 @@
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import ASTicket, CompanyCategory, InboundBatch, Part, PartPrice, RepairPreset, Tool
+
+
+# ──────────────────────────────────────────────
+# 티켓 일괄 생성 시그널
+# bulk_create는 티켓별 post_save를 보내지 않으므로 입고 배치 저장 시
+# 생성된 티켓 목록을 묶어 한 번 통지한다.
+# kwargs: tickets(생성된 ASTicket 리스트), batch(InboundBatch), user
+# ──────────────────────────────────────────────
+
+tickets_bulk_created = Signal()
+
+
+# ──────────────────────────────────────────────
+# 티켓 모델 목록 (ASTicket + 프록시 모델)
+# 프록시 모델(RepairTicket, OutboundTicket 등)로 저장/삭제하면 sender가 프록시 클래스이므로
+# 수신기는 모델마다 sender를 지정해 연결한다.
+# sender 없이 post_delete를 연결하면 프로젝트 전체 모델의 QuerySet.delete()가
+# 빠른 삭제(단일 DELETE) 대신 행 조회 + 행별 시그널 경로로 바뀌므로 사용하지 않는다.
+# ──────────────────────────────────────────────
+
+TICKET_MODELS = tuple(model for model in apps.get_models() if issubclass(model, ASTicket))
+
+
+def connect_ticket_receiver(receiver_func, *signals):
+    for signal in signals:
+        for model in TICKET_MODELS:
+            signal.connect(receiver_func, sender=model)
+    return receiver_func
+
+
+# ──────────────────────────────────────────────
+# 대시보드 지표 캐시 무효화
+# ──────────────────────────────────────────────
+
+
+def invalidate_dashboard_on_ticket_change(sender, **kwargs):
+    from .dashboard import invalidate_dashboard_metrics
+    invalidate_dashboard_metrics()
+
+
+connect_ticket_receiver(invalidate_dashboard_on_ticket_change, post_save, post_delete)
+
+
+# ──────────────────────────────────────────────
+# 활성 시리얼 집합 무효화 (바코드 스캔 입고용 프로세스 메모리 캐시, as_app.active_serials)
+# 상태/장비/시리얼을 포함하지 않는 update_fields 저장은 건너뛴다.
+# ──────────────────────────────────────────────
+
+
+def bump_active_serials_on_ticket_change(sender, update_fields=None, **kwargs):
+    from .active_serials import TRACKED_FIELDS, bump_active_serials_version
+    if update_fields is not None and not TRACKED_FIELDS.intersection(update_fields):
+        return
+    bump_active_serials_version()
+
+
+connect_ticket_receiver(bump_active_serials_on_ticket_change, post_save, post_delete)
+
+
+# ──────────────────────────────────────────────
+# 입고 배치 카운터 갱신
+# 입고 등록(일괄 생성)은 입고 배치 저장 경로(InboundBatchAdmin.save_formset)에서 갱신하고,
+# 다른 화면에서 티켓을 개별 생성/삭제하거나 입고 배치·장비를 바꾼 경우 커밋 이후 해당 배치만 다시 계산한다.
+# (여러 티켓을 한 번에 삭제해도 배치마다 한 번만 계산한다)
+# 상태 등 카운터와 무관한 필드만 바뀐 저장은 건너뛴다.
+# ──────────────────────────────────────────────
+
+
+BATCH_COUNTER_UPDATE_FIELDS = frozenset({"inbound_batch", "inbound_batch_id", "tool", "tool_id"})
+
+
+def refresh_inbound_batch_on_ticket_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not BATCH_COUNTER_UPDATE_FIELDS.intersection(update_fields):
+        return
+    loaded = getattr(instance, "_loaded_batch_values", None)
+    current = instance.batch_counter_values()
+    instance._loaded_batch_values = current
+    if loaded == current:
+        return
+    from .utils.batch_counters import schedule_refresh
+    schedule_refresh(InboundBatch, current["inbound_batch_id"])
+    if loaded and loaded["inbound_batch_id"] != current["inbound_batch_id"]:
+        schedule_refresh(InboundBatch, loaded["inbound_batch_id"])
+
+
+def refresh_inbound_batch_on_ticket_delete(sender, instance, **kwargs):
+    from .utils.batch_counters import schedule_refresh
+    schedule_refresh(InboundBatch, instance.inbound_batch_id)
+
+
+connect_ticket_receiver(refresh_inbound_batch_on_ticket_save, post_save)
+connect_ticket_receiver(refresh_inbound_batch_on_ticket_delete, post_delete)
+
+
+# ──────────────────────────────────────────────
+# 통합 시리얼 색인 갱신 (as_app.serials)
+# 시리얼 번호를 제외한 update_fields 저장은 건너뛴다. 티켓 삭제는 FK CASCADE로 색인도 삭제된다.
+# ──────────────────────────────────────────────
+
+
+def index_ticket_serial(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "serial_number" not in update_fields:
+        return
+    from .serials import index_serial
+    index_serial(instance)
+
+
+connect_ticket_receiver(index_ticket_serial, post_save)
+
+
+@receiver(tickets_bulk_created)
+def index_bulk_created_serials(sender, tickets, **kwargs):
+    from .serials import index_serials
+    index_serials(tickets)
+
+
+# ──────────────────────────────────────────────
+# 부품 기본 단가 / 단가 매트릭스 캐시 갱신
+# 기본 단가는 단가 그룹명(다스) 기준이므로 단가 그룹 이름이 바뀌면 전체를 다시 계산한다.
+# (QuerySet 일괄 변경은 PartPriceQuerySet에서 처리)
+# ──────────────────────────────────────────────
+
+
+@receiver(post_save, sender=PartPrice)
+@receiver(post_delete, sender=PartPrice)
+def refresh_part_prices_on_price_change(sender, instance, **kwargs):
+    from .pricing import part_prices_changed
+    part_prices_changed([instance.part_id])
+
+
+@receiver(post_save, sender=CompanyCategory)
+def refresh_part_prices_on_category_change(sender, created, **kwargs):
+    if created:
+        return
+    from .pricing import part_prices_changed
+    part_prices_changed()
+
+
+# ──────────────────────────────────────────────
+# 장비별 적용 부품/세트 카탈로그 버전 갱신
+# 적용 장비(tools) 변경, 부품 저장(이름/코드 등 API 응답 변경), 세트 생성,
+# 부품/세트/장비 삭제 시 버전을 올린다. (단가 변경은 part_prices_changed에서 처리)
+# ──────────────────────────────────────────────
+
+
+@receiver(m2m_changed, sender=Part.tools.through)
+@receiver(m2m_changed, sender=RepairPreset.tools.through)
+def bump_catalog_on_tools_change(sender, action, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    from .catalog import bump_catalog_version
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Part)
+@receiver(post_save, sender=RepairPreset)
+def bump_catalog_on_save(sender, created, **kwargs):
+    if sender is RepairPreset and not created:
+        return
+    from .catalog import bump_catalog_version
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=Part)
+@receiver(post_delete, sender=RepairPreset)
+@receiver(post_delete, sender=Tool)
+def bump_catalog_on_delete(sender, **kwargs):
+    from .catalog import bump_catalog_version
+    bump_catalog_version()
@@ -0,0 +1,167 @@
+document.addEventListener("DOMContentLoaded", function () {
+  /**
+   * 바코드 스캔 입고 화면
+   * - 스캔(Enter)마다 scan/check/로 활성 티켓 중복만 확인하고 목록은 브라우저에 보관
+   * - 새로고침에 대비해 목록을 localStorage에 저장
+   * - "일괄 입고 등록" 시 scan/commit/으로 한 번에 전송
+   */
+  const root = document.getElementById("scan-intake");
+  if (!root) return;
+
+  const STORAGE_KEY = "as_app.scan_intake.items";
+  const brandSelect = document.getElementById("scan-brand");
+  const toolSelect = document.getElementById("scan-tool");
+  const scanInput = document.getElementById("scan-input");
+  const feedback = document.getElementById("scan-feedback");
+  const rowsBody = document.getElementById("scan-rows");
+  const countLabel = document.getElementById("scan-count");
+  const submitBtn = document.getElementById("scan-submit");
+  const clearBtn = document.getElementById("scan-clear");
+  const csrfToken = root.querySelector("input[name='csrfmiddlewaretoken']").value;
+
+  let items = [];
+  try {
+    items = JSON.parse(localStorage.getItem(STORAGE_KEY)) || [];
+  } catch (e) {
+    items = [];
+  }
+
+  function itemKey(tool, serial) {
+    return tool + "|" + serial;
+  }
+
+  function save() {
+    localStorage.setItem(STORAGE_KEY, JSON.stringify(items));
+  }
+
+  function showFeedback(message, ok) {
+    feedback.textContent = message;
+    feedback.className = ok ? "ok" : "error";
+  }
+
+  function render(conflicts) {
+    const conflictKeys = new Set((conflicts || []).map((c) => itemKey(c.tool, c.serial)));
+    rowsBody.innerHTML = "";
+    items.forEach((item, index) => {
+      const row = document.createElement("tr");
+      if (conflictKeys.has(itemKey(item.tool, item.serial))) row.className = "conflict";
+      [items.length - index, item.toolLabel, item.serial].forEach((value) => {
+        const cell = document.createElement("td");
+        cell.textContent = value;
+        row.appendChild(cell);
+      });
+      const removeCell = document.createElement("td");
+      const removeBtn = document.createElement("button");
+      removeBtn.type = "button";
+      removeBtn.className = "scan-remove";
+      removeBtn.textContent = "✕";
+      removeBtn.addEventListener("click", () => {
+        items.splice(index, 1);
+        save();
+        render();
+      });
+      removeCell.appendChild(removeBtn);
+      row.appendChild(removeCell);
+      rowsBody.appendChild(row);
+    });
+    countLabel.textContent = items.length;
+    submitBtn.disabled = items.length === 0;
+  }
+
+  // 브랜드 → 장비 목록 (입고 등록 화면과 같은 API 사용)
+  brandSelect.addEventListener("change", () => {
+    toolSelect.innerHTML = '<option value="">---------</option>';
+    if (!brandSelect.value) return;
+    fetch(`/api/tools-by-brand/?brand_id=${brandSelect.value}`)
+      .then((response) => response.json())
+      .then((data) => {
+        data.tools.forEach((tool) => {
+          const option = document.createElement("option");
+          option.value = tool.id;
+          option.textContent = tool.model_name;
+          toolSelect.appendChild(option);
+        });
+      })
+      .catch((err) => console.error("Error fetching tools:", err));
+  });
+  toolSelect.addEventListener("change", () => scanInput.focus());
+
+  scanInput.addEventListener("keydown", (event) => {
+    if (event.key !== "Enter") return;
+    event.preventDefault();
+    const serial = scanInput.value.trim();
+    scanInput.value = "";
+    if (!serial) return;
+
+    const tool = toolSelect.value;
+    if (!tool) {
+      showFeedback("장비를 먼저 선택해 주세요.", false);
+      return;
+    }
+    if (items.some((item) => itemKey(item.tool, item.serial) === itemKey(tool, serial))) {
+      showFeedback(`${serial}: 이미 스캔 목록에 있습니다.`, false);
+      return;
+    }
+
+    const toolLabel = `${brandSelect.options[brandSelect.selectedIndex].text} > ${toolSelect.options[toolSelect.selectedIndex].text}`;
+    const params = new URLSearchParams({ tool: tool, serial: serial });
+    fetch(`${root.dataset.checkUrl}?${params}`, { credentials: "same-origin" })
+      .then((response) => response.json())
+      .then((data) => {
+        if (!data.ok) {
+          showFeedback(`${serial}: ${data.message}`, false);
+          return;
+        }
+        if (items.some((item) => itemKey(item.tool, item.serial) === itemKey(tool, data.serial))) return;
+        items.unshift({ tool: tool, toolLabel: toolLabel, serial: data.serial });
+        save();
+        render();
+        showFeedback(`${data.serial}: 추가됨`, true);
+      })
+      .catch(() => showFeedback(`${serial}: 확인 중 오류가 발생했습니다.`, false));
+  });
+
+  clearBtn.addEventListener("click", () => {
+    if (items.length && !confirm("스캔 목록을 모두 비우시겠습니까?")) return;
+    items = [];
+    save();
+    render();
+    scanInput.focus();
+  });
+
+  submitBtn.addEventListener("click", () => {
+    const value = (name) => (root.querySelector(`[name='${name}']`) || {}).value || "";
+    const payload = {
+      inbound_date: value("inbound_date"),
+      company: value("company"),
+      manager: value("manager"),
+      items: items.map((item) => ({ tool: item.tool, serial: item.serial })),
+    };
+    submitBtn.disabled = true;
+    fetch(root.dataset.commitUrl, {
+      method: "POST",
+      credentials: "same-origin",
+      headers: { "Content-Type": "application/json", "X-CSRFToken": csrfToken },
+      body: JSON.stringify(payload),
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (data.error) {
+          showFeedback(data.error, false);
+          render(data.conflicts);
+          return;
+        }
+        items = [];
+        save();
+        render();
+        showFeedback(data.message, true);
+      })
+      .catch(() => {
+        showFeedback("등록 중 오류가 발생했습니다. 목록은 그대로 보관됩니다.", false);
+        render();
+      });
+  });
+
+  render();
+  scanInput.focus();
+});
@@ -1,3 +1,573 @@
-from django.test import TestCase
+import datetime
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .active_serials import is_active_serial
+from .admin import InboundBatchAdmin
+from .models import (
+    ASTicket, Brand, Company, CompanyCategory, InboundBatch, Part, PartPrice, RepairPreset, RepairTicket,
+    SerialIndex, TicketUsedPart, Tool,
+)
+from .pricing import reprice_open_tickets
+from .signals import tickets_bulk_created
+from .utils import batch_counters, pdf_fonts
+
+
+class TicketFixtureMixin:
+    """업체/장비/부품 기본 데이터"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = CompanyCategory.objects.create(name="다스")
+        cls.company = Company.objects.create(
+            name="테스트상사", business_number="123-45-67890", representative="홍길동",
+            address="서울", price_group=cls.category,
+        )
+        cls.brand = Brand.objects.create(name="브랜드")
+        cls.tool = Tool.objects.create(brand=cls.brand, model_name="모델")
+        cls.part = Part.objects.create(brand=cls.brand, name="모터")
+
+    def create_ticket(self, serial, status=ASTicket.Status.REPAIRED, **kwargs):
+        return ASTicket.objects.create(
+            tool=self.tool, company=self.company, serial_number=serial, status=status,
+            inbound_date=datetime.date(2026, 10, 1), **kwargs,
+        )
+
+
+class AdminClientMixin:
+    """관리자 로그인 클라이언트 + 입고 등록 폼 전송"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_superuser("admin-test", "admin@example.com", None)
+        self.client.force_login(self.user)
+
+    def post_inbound(self, rows):
+        """입고 등록 화면에 품목 행(rows: 인라인 필드 dict 목록) 전송 → (응답, 메시지 목록)"""
+        data = {
+            "inbound_date": "2026-10-01", "company": self.company.pk, "manager": "입고팀",
+            "tickets-TOTAL_FORMS": len(rows), "tickets-INITIAL_FORMS": 0,
+            "tickets-MIN_NUM_FORMS": 1, "tickets-MAX_NUM_FORMS": 1000,
+        }
+        for i, row in enumerate(rows):
+            data[f"tickets-{i}-brand"] = self.brand.pk
+            data.update({f"tickets-{i}-{name}": value for name, value in row.items()})
+        response = self.client.post(reverse("admin:as_app_inboundbatch_add"), data)
+        return response, [str(message) for message in response.wsgi_request._messages]
+
+
+class RepairCostTests(SimpleTestCase):
+    def test_costs_are_integer_won_amounts(self):
+        self.assertEqual(ASTicket.calculate_nego_price(123457), 111111)
+        self.assertEqual(ASTicket.calculate_repair_cost(123457), 122222)
+        self.assertEqual(ASTicket.calculate_nego_price(10**15 + 1), 9 * 10**14)
+
+
+class RepriceOpenTicketsTests(TicketFixtureMixin, TestCase):
+    def setUp(self):
+        PartPrice.objects.create(part=self.part, category=self.category, price=20000)
+
+    def test_ticket_without_used_parts_keeps_manual_cost(self):
+        ticket = self.create_ticket("S1", repair_cost=55000)
+
+        preview = reprice_open_tickets(dry_run=True)
+        report = reprice_open_tickets()
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.repair_cost, 55000)
+        self.assertEqual(preview.tickets_changed, 0)
+        self.assertEqual(report.tickets_changed, 0)
+
+    def test_unchanged_parts_keep_manual_cost(self):
+        ticket = self.create_ticket("S2", repair_cost=55000)
+        TicketUsedPart.objects.create(ticket=ticket, part=self.part, applied_price=20000)
+
+        report = reprice_open_tickets()
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.repair_cost, 55000)
+        self.assertEqual(report.parts_changed, 0)
+
+    def test_changed_part_price_recomputes_cost(self):
+        ticket = self.create_ticket("S3", repair_cost=9900)
+        used = TicketUsedPart.objects.create(ticket=ticket, part=self.part, applied_price=10000)
+
+        preview = reprice_open_tickets(dry_run=True)
+        used.refresh_from_db()
+        self.assertEqual(used.applied_price, 10000)
+        self.assertEqual((preview.parts_changed, preview.tickets_changed), (1, 1))
+
+        report = reprice_open_tickets()
+        used.refresh_from_db()
+        ticket.refresh_from_db()
+        self.assertEqual(used.applied_price, 20000)
+        self.assertEqual(ticket.repair_cost, 19800)
+        self.assertEqual(report.cost_delta, 9900)
+
+
+class InboundBatchCounterTests(TicketFixtureMixin, TestCase):
+    def create_batch(self, count):
+        batch = InboundBatch.objects.create(inbound_date=datetime.date(2026, 10, 1), company=self.company)
+        ASTicket.objects.bulk_create([
+            ASTicket(
+                tool=self.tool, company=self.company, serial_number=f"B{batch.pk}-{i}",
+                status=ASTicket.Status.INBOUND, inbound_date=batch.inbound_date, inbound_batch=batch,
+            )
+            for i in range(count)
+        ])
+        InboundBatch.objects.filter(pk=batch.pk).refresh_counters()
+        return batch
+
+    def test_ticket_delete_refreshes_batch_counters(self):
+        batch = self.create_batch(5)
+        with self.captureOnCommitCallbacks(execute=True):
+            ASTicket.objects.filter(inbound_batch=batch)[:1].get().delete()
+        batch.refresh_from_db()
+        self.assertEqual(batch.ticket_count, 4)
+
+    def test_bulk_ticket_delete_refreshes_each_batch_once(self):
+        batches = [self.create_batch(3), self.create_batch(30)]
+        with self.captureOnCommitCallbacks() as callbacks:
+            ASTicket.objects.filter(inbound_batch__in=batches).delete()
+        with self.assertNumQueries(4):  # 배치 id 조회, 건수/장비 집계 2회, bulk_update 1회
+            for callback in callbacks:
+                callback()
+        self.assertEqual(
+            list(InboundBatch.objects.filter(pk__in=[b.pk for b in batches]).values_list("ticket_count", flat=True)),
+            [0, 0],
+        )
+
+
+    def test_moving_ticket_refreshes_both_batches(self):
+        source, target = self.create_batch(3), self.create_batch(1)
+        ticket = ASTicket.objects.filter(inbound_batch=source).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.inbound_batch = target
+            ticket.save()
+
+        source.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual((source.ticket_count, target.ticket_count), (2, 2))
+
+    def test_tool_change_refreshes_tools_summary(self):
+        batch = self.create_batch(1)
+        other_tool = Tool.objects.create(brand=self.brand, model_name="다른모델")
+        ticket = ASTicket.objects.get(inbound_batch=batch)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.tool = other_tool
+            ticket.save(update_fields=["tool"])
+
+        batch.refresh_from_db()
+        self.assertEqual(batch.tools_summary, "브랜드 > 다른모델")
+
+    def test_status_only_save_skips_refresh(self):
+        batch = self.create_batch(2)
+        InboundBatch.objects.filter(pk=batch.pk).update(ticket_count=99)
+        ticket = ASTicket.objects.filter(inbound_batch=batch).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.status = ASTicket.Status.REPAIRED
+            ticket.save()
+
+        batch.refresh_from_db()
+        self.assertEqual(batch.ticket_count, 99)
+
+    def test_rolled_back_refresh_is_not_carried_over(self):
+        rolled_back, committed = self.create_batch(2), self.create_batch(2)
+        InboundBatch.objects.filter(pk=rolled_back.pk).update(ticket_count=99)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            ASTicket.objects.filter(inbound_batch=rolled_back).first().delete()
+            raise RuntimeError
+        self.assertIsNone(batch_counters._pending.batches())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ASTicket.objects.filter(inbound_batch=committed).first().delete()
+
+        rolled_back.refresh_from_db()
+        committed.refresh_from_db()
+        self.assertEqual((rolled_back.ticket_count, committed.ticket_count), (99, 1))
+
+class TicketSignalTests(TicketFixtureMixin, TestCase):
+    def test_used_part_delete_is_fast_delete(self):
+        # 티켓 수신기가 sender 없이 연결되면 QuerySet.delete()가 행 조회 + 행별 시그널로 바뀐다
+        ticket = self.create_ticket("F1")
+        TicketUsedPart.objects.create(ticket=ticket, part=self.part, applied_price=1000)
+        with self.assertNumQueries(1):
+            TicketUsedPart.objects.filter(ticket=ticket).delete()
+
+    def test_proxy_save_refreshes_active_serials(self):
+        self.assertFalse(is_active_serial(self.tool.pk, "P1"))
+        with self.captureOnCommitCallbacks(execute=True):
+            RepairTicket.objects.create(
+                tool=self.tool, company=self.company, serial_number="P1",
+                status=ASTicket.Status.INBOUND, inbound_date=datetime.date(2026, 10, 1),
+            )
+        self.assertTrue(is_active_serial(self.tool.pk, "P1"))
+
+
+
+class ActiveSerialConstraintTests(TicketFixtureMixin, TestCase):
+    def test_second_active_ticket_violates_constraint(self):
+        self.create_ticket("C1", status=ASTicket.Status.INBOUND)
+
+        with self.assertRaises(IntegrityError) as ctx, transaction.atomic():
+            self.create_ticket("C1", status=ASTicket.Status.HOLD)
+        self.assertTrue(ASTicket.is_duplicate_serial_error(ctx.exception))
+
+    def test_closed_tickets_do_not_conflict(self):
+        self.create_ticket("C1", status=ASTicket.Status.SHIPPED)
+        self.create_ticket("C1", status=ASTicket.Status.DISPOSED)
+        self.create_ticket("C1", status=ASTicket.Status.INBOUND)
+
+        self.assertEqual(ASTicket.objects.filter(serial_number="C1").count(), 3)
+
+    def test_validate_constraints_reports_serial_field(self):
+        self.create_ticket("C1", status=ASTicket.Status.REPAIRED)
+        duplicate = ASTicket(
+            tool=self.tool, company=self.company, serial_number="C1",
+            status=ASTicket.Status.INBOUND, inbound_date=datetime.date(2026, 10, 1),
+        )
+
+        with self.assertRaises(ValidationError) as ctx:
+            duplicate.validate_constraints()
+        self.assertEqual(list(ctx.exception.error_dict), ["serial_number"])
+        self.assertEqual(ctx.exception.error_dict["serial_number"][0].code, ASTicket.DUPLICATE_SERIAL_CODE)
+
+class TicketTransitionTests(TicketFixtureMixin, TestCase):
+    def test_strict_transition_reports_sample_and_count(self):
+        for i in range(8):
+            self.create_ticket(f"H{i}", status=ASTicket.Status.SHIPPED)
+        self.create_ticket("H-ok", status=ASTicket.Status.INBOUND)
+
+        with self.assertNumQueries(2):  # 안내용 5건 + 건수
+            result = ASTicket.objects.all().apply_transition("hold", strict=True)
+
+        self.assertEqual((len(result.rejected), result.rejected_count, result.updated), (5, 8, 0))
+        self.assertFalse(ASTicket.objects.filter(status=ASTicket.Status.HOLD).exists())
+
+    def test_revert_repaired_clears_used_parts(self):
+        ticket = self.create_ticket("R1", repair_cost=19800, repair_content="모터 교체")
+        TicketUsedPart.objects.create(ticket=ticket, part=self.part, applied_price=20000)
+
+        result = ASTicket.objects.filter(pk=ticket.pk).apply_transition("revert_repaired", strict=True)
+
+        ticket.refresh_from_db()
+        self.assertEqual(result.updated, 1)
+        self.assertEqual((ticket.status, ticket.repair_cost, ticket.repair_content), (ASTicket.Status.INBOUND, 0, ""))
+        self.assertFalse(TicketUsedPart.objects.filter(ticket=ticket).exists())
+
+    def test_reactivation_conflict_blocks_whole_batch(self):
+        shipped = self.create_ticket("C1", status=ASTicket.Status.SHIPPED)
+        other = self.create_ticket("C2", status=ASTicket.Status.SHIPPED)
+        self.create_ticket("C1", status=ASTicket.Status.INBOUND)
+
+        result = ASTicket.objects.filter(pk__in=[shipped.pk, other.pk]).apply_transition("revert_shipped")
+
+        self.assertTrue(result.blocked)
+        self.assertEqual([t.pk for t in result.conflicts], [shipped.pk])
+        self.assertEqual(
+            set(ASTicket.objects.filter(pk__in=[shipped.pk, other.pk]).values_list("status", flat=True)),
+            {ASTicket.Status.SHIPPED},
+        )
+
+
+class TicketWorkflowIndexTests(TicketFixtureMixin, TestCase):
+    """업무 큐 쿼리가 복합 인덱스를 쓰는지 실행 계획으로 확인 (통계 없이도 인덱스를 고르는 SQLite 기준)"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor != "sqlite":
+            self.skipTest("실행 계획 형식이 DB마다 다르므로 SQLite에서만 확인")
+        self.assertIn(index_name, queryset.explain())
+
+    def test_status_queue_uses_status_inbound_index(self):
+        queue = ASTicket.objects.filter(status=ASTicket.Status.REPAIRED).order_by("-inbound_date", "-created_at")
+        self.assertUsesIndex(queue, "asticket_status_inbound_idx")
+
+    def test_outbound_range_uses_status_outbound_index(self):
+        shipped = ASTicket.objects.filter(
+            status=ASTicket.Status.SHIPPED,
+            outbound_date__range=(datetime.date(2026, 1, 1), datetime.date(2026, 12, 31)),
+        )
+        self.assertUsesIndex(shipped, "asticket_status_outbound_idx")
+
+    def test_company_filter_uses_company_status_index(self):
+        tickets = ASTicket.objects.filter(company=self.company, status=ASTicket.Status.INBOUND).order_by()
+        self.assertUsesIndex(tickets, "asticket_company_status_idx")
+
+
+class InboundSerialValidationTests(AdminClientMixin, TicketFixtureMixin, TestCase):
+    def test_duplicate_serial_in_batch_is_rejected(self):
+        response, messages = self.post_inbound([{"tool": self.tool.pk, "serial_number": "D1, D2, D1"}])
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("같은 배치 내에 중복된 품목", messages[-1])
+        self.assertFalse(ASTicket.objects.exists())
+        self.assertFalse(InboundBatch.objects.exists())
+
+    def test_active_serial_conflict_saves_nothing(self):
+        self.create_ticket("A2", status=ASTicket.Status.INBOUND)
+
+        response, messages = self.post_inbound([{"tool": self.tool.pk, "serial_number": "A1, A2, A3"}])
+
+        self.assertIn("이미 입고/수리 중인 장비", messages[-1])
+        self.assertIn("S/N: A2", messages[-1])
+        self.assertEqual(list(ASTicket.objects.values_list("serial_number", flat=True)), ["A2"])
+        self.assertFalse(InboundBatch.objects.exists())
+
+    def test_shipped_serial_can_be_received_again(self):
+        self.create_ticket("A1", status=ASTicket.Status.SHIPPED)
+
+        self.post_inbound([{"tool": self.tool.pk, "serial_number": "A1"}])
+
+        self.assertEqual(ASTicket.objects.filter(serial_number="A1").count(), 2)
+
+
+
+class ScanIntakeTests(AdminClientMixin, TicketFixtureMixin, TestCase):
+    """바코드 스캔 입고 — scan/check 중복 확인과 scan/commit 일괄 등록"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_ticket("ACTIVE1", status=ASTicket.Status.REPAIRED)
+        self.create_ticket("SHIPPED1", status=ASTicket.Status.SHIPPED)
+        cache.clear()  # 활성 시리얼 집합을 현재 티켓 기준으로 다시 만들도록 버전 초기화
+
+    def check(self, serial, tool=None):
+        return self.client.get(
+            reverse("admin:as_app_inboundbatch_scan_check"),
+            {"tool": self.tool.pk if tool is None else tool, "serial": serial},
+        )
+
+    def commit(self, serials):
+        payload = {
+            "inbound_date": "2026-10-01", "company": self.company.pk, "manager": "스캔",
+            "items": [{"tool": self.tool.pk, "serial": serial} for serial in serials],
+        }
+        return self.client.post(
+            reverse("admin:as_app_inboundbatch_scan_commit"), json.dumps(payload), content_type="application/json",
+        )
+
+    def test_check_flags_active_serial_only(self):
+        self.assertEqual(self.check("ACTIVE1").json(), {
+            "ok": False, "serial": "ACTIVE1", "message": "이미 입고/수리 중인 장비입니다.",
+        })
+        self.assertEqual(self.check("SHIPPED1").json(), {"ok": True, "serial": "SHIPPED1"})
+        self.assertEqual(self.check("NEW1").json(), {"ok": True, "serial": "NEW1"})
+        self.assertEqual(self.check("NEW1", tool="").status_code, 400)
+
+    def test_commit_creates_batch_and_tickets(self):
+        response = self.commit(["NEW1", "NEW2", "SHIPPED1"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 3)
+        batch = InboundBatch.objects.get(pk=response.json()["batch"])
+        self.assertEqual(batch.ticket_count, 3)
+        self.assertEqual(SerialIndex.objects.filter(ticket__inbound_batch=batch).count(), 3)
+
+    def test_commit_with_active_serial_returns_conflict(self):
+        response = self.commit(["NEW1", "ACTIVE1"])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([c["serial"] for c in response.json()["conflicts"]], ["ACTIVE1"])
+        self.assertFalse(InboundBatch.objects.exists())
+        self.assertFalse(ASTicket.objects.filter(serial_number="NEW1").exists())
+
+    def test_commit_conflict_missed_by_memory_set_is_caught_by_constraint(self):
+        with mock.patch("as_app.active_serials.is_active_serial", return_value=False):
+            response = self.commit(["NEW1", "ACTIVE1"])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([c["serial"] for c in response.json()["conflicts"]], ["ACTIVE1"])
+        self.assertFalse(InboundBatch.objects.exists())
+
+    def test_commit_rejects_duplicates_and_oversized_lists(self):
+        self.assertEqual(self.commit(["NEW1", "NEW1"]).status_code, 400)
+
+        limit = InboundBatchAdmin.SCAN_COMMIT_LIMIT
+        response = self.commit([f"BULK{i}" for i in range(limit + 1)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(limit), response.json()["error"])
+        self.assertFalse(InboundBatch.objects.exists())
+
+class InboundBulkCreateTests(AdminClientMixin, TicketFixtureMixin, TestCase):
+    def test_expanded_rows_are_bulk_created_with_followups(self):
+        received = []
+
+        def on_bulk_created(sender, tickets, batch, **kwargs):
+            received.append(len(tickets))
+
+        tickets_bulk_created.connect(on_bulk_created)
+        self.addCleanup(tickets_bulk_created.disconnect, on_bulk_created)
+
+        response, messages = self.post_inbound([
+            {"tool": self.tool.pk, "serial_number": "K1, K2, K3"},
+            {"tool": self.tool.pk, "no_serial_number": "on", "quantity": 4},
+        ])
+
+        self.assertEqual(response.status_code, 302)
+        batch = InboundBatch.objects.get()
+        tickets = ASTicket.objects.filter(inbound_batch=batch)
+        self.assertEqual(tickets.count(), 7)
+        self.assertEqual(received, [7])
+        self.assertEqual(
+            set(tickets.values_list("status", "inbound_date", "company_id", "manager")),
+            {(ASTicket.Status.INBOUND, batch.inbound_date, self.company.pk, "입고팀")},
+        )
+        # admin 로그: 티켓별 추가 기록
+        ticket_logs = LogEntry.objects.filter(
+            action_flag=ADDITION,
+            content_type=ContentType.objects.get_for_model(ASTicket),
+            object_id__in=[str(pk) for pk in tickets.values_list("pk", flat=True)],
+        )
+        self.assertEqual(ticket_logs.count(), 7)
+        # 시리얼 색인: 시리얼 없음 임시 번호는 색인하지 않는다
+        self.assertEqual(
+            sorted(SerialIndex.objects.filter(ticket__inbound_batch=batch).values_list("serial_key", flat=True)),
+            ["K1", "K2", "K3"],
+        )
+        # 배치 카운터
+        self.assertEqual(batch.ticket_count, 7)
+        self.assertEqual(batch.tools_summary, "브랜드 > 모델")
+        self.assertIn("총 7건", messages[-2])
+
+
+
+class RepairPresetTotalTests(AdminClientMixin, TicketFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        labor = Part.objects.create(brand=self.brand, name="공임", part_type="labor")
+        Part.objects.filter(pk=self.part.pk).update(default_price=30000)
+        Part.objects.filter(pk=labor.pk).update(default_price=12000)
+        self.preset = RepairPreset.objects.create(brand=self.brand, name="모터 교체")
+        self.preset.parts.add(self.part, labor)
+
+    def test_default_manager_has_no_total_subquery(self):
+        self.assertNotIn("parts_total", str(RepairPreset.objects.all().query))
+        self.assertEqual(RepairPreset.objects.get().total_price, 42000)
+
+    def test_with_totals_labels_without_extra_queries(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(str(RepairPreset.objects.with_totals().get()), "모터 교체 (42,000원)")
+
+    def test_admin_changelist_shows_totals(self):
+        response = self.client.get(reverse("admin:as_app_repairpreset_changelist"))
+        self.assertContains(response, "42,000원")
+
+
+
+class PartsForToolCatalogTests(AdminClientMixin, TicketFixtureMixin, TestCase):
+    """장비별 부품 목록 API — 단가 변경 시 ETag가 바뀌어 이전 캐시가 재사용되지 않는지 확인"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()  # 테스트 롤백과 무관하게 남는 카탈로그 버전/캐시 초기화
+        self.price = PartPrice.objects.create(part=self.part, category=self.category, price=30000)
+        self.url = reverse("admin:api_parts_for_tool", args=[self.tool.pk])
+
+    def get_parts(self, **headers):
+        return self.client.get(self.url, {"price_group": self.category.pk}, headers=headers)
+
+    def assert_price_change_refreshes_etag(self, change_price):
+        response = self.get_parts()
+        etag = response["ETag"]
+        self.assertEqual(response.json()["parts"][0]["price"], 30000)
+        self.assertEqual(self.get_parts(if_none_match=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change_price(35000)
+
+        response = self.get_parts(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["parts"][0]["price"], 35000)
+
+    def test_part_price_save_changes_etag(self):
+        def change_price(price):
+            self.price.price = price
+            self.price.save()
+
+        self.assert_price_change_refreshes_etag(change_price)
+
+    def test_part_price_queryset_update_changes_etag(self):
+        self.assert_price_change_refreshes_etag(
+            lambda price: PartPrice.objects.filter(pk=self.price.pk).update(price=price)
+        )
+
+
+
+@override_settings(AUTHENTICATION_BACKENDS=["django.contrib.auth.backends.ModelBackend"])
+class SerialLookupPermissionTests(TicketFixtureMixin, TestCase):
+    """통합 시리얼 조회 — 조회 권한이 있는 원본(AS 티켓/툴 재고)만 보이는지 확인"""
+
+    def setUp(self):
+        from master_data.models import OutsourceCompany
+        from tool_inventory.models import Inventory
+
+        self.create_ticket("P100")
+        Inventory.objects.create(
+            supplier=OutsourceCompany.objects.create(name="입고처"), tool=self.tool,
+            date=datetime.date(2026, 10, 2), serial="P100",
+        )
+
+    def login(self, *perms):
+        user = User.objects.create_user("staff-test", is_staff=True)
+        for perm in perms:
+            app_label, codename = perm.split(".")
+            user.user_permissions.add(Permission.objects.get(content_type__app_label=app_label, codename=codename))
+        self.client.force_login(user)
+
+    def timeline_sources(self):
+        response = self.client.get(reverse("serial_search_view"), {"q": "P100"})
+        return {event.source for _, events in response.context["timeline"] for event in events}
+
+    def test_inventory_only_user_sees_inventory_rows(self):
+        self.login("tool_inventory.view_inventory")
+
+        response = self.client.get(reverse("api_serial_lookup"), {"q": "P1"})
+
+        self.assertEqual(response.json()["results"], [{"serial": "P100", "tickets": 0, "inventories": 1}])
+        self.assertEqual(self.timeline_sources(), {"툴 재고"})
+
+    def test_ticket_only_user_sees_ticket_rows(self):
+        self.login("as_app.view_asticket")
+
+        response = self.client.get(reverse("api_serial_lookup"), {"q": "P1"})
+
+        self.assertEqual(response.json()["results"], [{"serial": "P100", "tickets": 1, "inventories": 0}])
+        self.assertEqual(self.timeline_sources(), {"AS"})
+
+    def test_user_without_either_permission_is_forbidden(self):
+        self.login()
+
+        self.assertEqual(self.client.get(reverse("api_serial_lookup"), {"q": "P1"}).status_code, 403)
+        self.assertEqual(self.client.get(reverse("serial_search_view"), {"q": "P1"}).status_code, 403)
+
+@override_settings(PDF_FONT_PATHS=["/nonexistent/font.ttf"], PDF_BOLD_FONT_PATHS=[])
+class PdfFontTests(SimpleTestCase):
+    def setUp(self):
+        pdf_fonts.get_pdf_fonts.cache_clear()
+        self.addCleanup(pdf_fonts.get_pdf_fonts.cache_clear)
+
+    def test_missing_korean_font_falls_back_with_single_warning(self):
+        with mock.patch.object(pdf_fonts.shutil, "which", return_value=None), \
+                self.assertLogs("as_app.utils.pdf_fonts", "WARNING") as logs:
+            self.assertEqual(pdf_fonts.get_pdf_fonts(), ("Helvetica", "Helvetica-Bold"))
+            pdf_fonts.get_pdf_fonts()
+        self.assertEqual(len(logs.records), 1)
+
+    def test_unreadable_candidate_is_skipped(self):
+        with mock.patch.object(pdf_fonts, "_fontconfig_fonts", return_value=[(__file__, 0)]):
+            self.assertIsNone(pdf_fonts.load_font("Broken", []))
@@ -0,0 +1,144 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+# ──────────────────────────────────────────────
+# AS 티켓 상태 전이
+# 전이마다 허용 출발 상태, 도착 상태, 함께 바꿀 필드(날짜 기록/초기화), 사용 부품 삭제 여부를 선언하고
+# 임의의 티켓 QuerySet에 "UPDATE ... WHERE status IN (출발 상태)" 한 문장으로 적용한다.
+#   1) 출발 상태가 아닌 선택 행 조회 (안내용 앞 5건, 5건 이상이면 건수 COUNT 1회 추가)
+#   2) (사용 부품 삭제 전이만) TicketUsedPart DELETE 1회
+#   3) 가드 조건을 붙인 UPDATE 1회
+# 출고/폐기 티켓을 활성 상태로 되돌리는 전이는 활성 시리얼 유일 제약에 걸릴 수 있으며,
+# 이 경우 전체를 롤백하고 충돌 티켓을 결과에 담는다.
+# 대시보드 캐시/활성 시리얼 집합 무효화는 ASTicketQuerySet.update에서 처리된다.
+# ──────────────────────────────────────────────
+
+REJECTED_SAMPLE_SIZE = 5
+
+
+class Transition:
+    """상태 전이 선언
+
+    sources: 허용 출발 상태 / target: 도착 상태
+    reset: 함께 초기화할 필드 값 / date_field: 전이일(on, 기본 오늘)을 기록할 필드
+    clear_used_parts: 사용 부품/공임 스냅샷(TicketUsedPart) 삭제 여부
+    """
+
+    def __init__(self, label, sources, target, reset=None, date_field=None, clear_used_parts=False):
+        self.label = label
+        self.sources = tuple(sources)
+        self.target = target
+        self.reset = dict(reset or {})
+        self.date_field = date_field
+        self.clear_used_parts = clear_used_parts
+
+    @property
+    def reactivates(self):
+        """비활성(출고/폐기) → 활성 상태 전이 여부 (활성 시리얼 유일 제약 검사 대상)"""
+        from .models import ASTicket
+
+        active = set(ASTicket.ACTIVE_STATUSES)
+        return self.target in active and any(source not in active for source in self.sources)
+
+    def values(self, on=None):
+        values = {"status": self.target, **self.reset}
+        if self.date_field:
+            values[self.date_field] = on or timezone.localdate()
+        return values
+
+
+class TransitionResult:
+    """상태 전이 적용 결과
+
+    updated: 변경된 티켓 수
+    rejected: 출발 상태가 아니어서 제외된 티켓 (앞 REJECTED_SAMPLE_SIZE건) / rejected_count: 제외된 전체 건수
+    conflicts: 활성 시리얼 유일 제약에 걸린 티켓 목록 / blocked: 제약 위반으로 전체 롤백 여부
+    """
+
+    __slots__ = ("transition", "updated", "rejected", "rejected_count", "conflicts", "blocked")
+
+    def __init__(self, transition, updated=0, rejected=(), rejected_count=0, conflicts=(), blocked=False):
+        self.transition = transition
+        self.updated = updated
+        self.rejected = list(rejected)
+        self.rejected_count = rejected_count
+        self.conflicts = list(conflicts)
+        self.blocked = blocked
+
+
+def _build_transitions():
+    from .models import ASTicket
+
+    Status = ASTicket.Status
+    return {
+        "ship": Transition("출고", [Status.REPAIRED], Status.SHIPPED, date_field="outbound_date"),
+        "revert_shipped": Transition("출고 취소", [Status.SHIPPED], Status.REPAIRED, reset={"outbound_date": None}),
+        "revert_repaired": Transition(
+            "수리완료 취소", [Status.REPAIRED], Status.INBOUND,
+            reset={"repair_cost": 0, "repair_content": ""}, clear_used_parts=True,
+        ),
+        "revert_outsourced": Transition(
+            "수리의뢰 취소", [Status.OUTSOURCED], Status.INBOUND,
+            reset={"outsource_company": None, "outsource_date": None},
+        ),
+        "revert_disposed": Transition("자체폐기 취소", [Status.DISPOSED], Status.INBOUND),
+        "hold": Transition(
+            "수리보류", [Status.INBOUND, Status.OUTSOURCED, Status.REPAIRED], Status.HOLD, date_field="hold_date",
+        ),
+        "release_hold": Transition("수리보류 해제", [Status.HOLD], Status.REPAIRED, reset={"hold_date": None}),
+        "dispose": Transition("자체폐기", [Status.INBOUND], Status.DISPOSED),
+    }
+
+
+_transitions = None
+
+
+def get_transition(name):
+    global _transitions
+    if _transitions is None:
+        _transitions = _build_transitions()
+    try:
+        return _transitions[name]
+    except KeyError:
+        raise ValueError("알 수 없는 상태 전이입니다: %s" % name)
+
+
+def apply_transition(queryset, name, on=None, strict=False):
+    """티켓 QuerySet에 상태 전이 적용 — TransitionResult 반환
+
+    출발 상태가 아닌 행은 UPDATE 가드 조건으로 제외되고 rejected로 보고된다.
+    strict=True면 거부 행이 하나라도 있을 때 아무것도 변경하지 않는다. (혼합 선택 방지)
+    on: date_field에 기록할 날짜 (기본 오늘)
+    """
+    from .models import ASTicket, TicketUsedPart
+
+    transition = get_transition(name)
+    queryset = queryset.order_by().select_related(None).prefetch_related(None)
+    rejected_rows = queryset.exclude(status__in=transition.sources)
+    rejected = list(
+        rejected_rows.select_related("tool", "tool__brand")
+        .only("pk", "status", "serial_number", "tool__model_name", "tool__brand__name")
+        .order_by("pk")[:REJECTED_SAMPLE_SIZE]
+    )
+    rejected_count = rejected_rows.count() if len(rejected) == REJECTED_SAMPLE_SIZE else len(rejected)
+    if strict and rejected:
+        return TransitionResult(transition, rejected=rejected, rejected_count=rejected_count)
+
+    guarded = queryset.filter(status__in=transition.sources)
+    try:
+        with transaction.atomic():
+            if transition.clear_used_parts:
+                TicketUsedPart.objects.filter(ticket__in=guarded.values("pk")).delete()
+            updated = guarded.update(**transition.values(on))
+    except IntegrityError as exc:
+        if not (transition.reactivates and ASTicket.is_duplicate_serial_error(exc)):
+            raise
+        tickets = list(guarded.select_related("tool", "tool__brand"))
+        conflict_pairs = ASTicket.objects.active_serial_conflicts(
+            (t.tool_id, t.serial_number) for t in tickets
+        )
+        conflicts = [t for t in tickets if (t.tool_id, t.serial_number) in conflict_pairs]
+        return TransitionResult(
+            transition, rejected=rejected, rejected_count=rejected_count, conflicts=conflicts, blocked=True,
+        )
+    return TransitionResult(transition, updated=updated, rejected=rejected, rejected_count=rejected_count)
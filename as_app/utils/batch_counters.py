@@ -0,0 +1,108 @@
+import threading
+import weakref
+
+from django.db import transaction
+from django.db.models import Count
+
+# ──────────────────────────────────────────────
+# 배치 비정규화 카운터 (품목 수 / 장비 요약)
+# 입고 배치(InboundBatch), 툴 입고/출고 배치(InventoryBatch/OutboundBatch)의
+# __str__과 목록 화면이 행마다 하위 행 count()/values_list()를 실행하지 않도록
+# 품목 수와 "브랜드 > 모델" 요약(앞 3개 + " 외 N건")을 배치 컬럼에 보관한다.
+# 배치 저장 경로와 하위 행 삭제 시그널에서 갱신하며,
+# 어긋난 값은 rebuild_batch_counters 명령으로 다시 계산한다.
+# ──────────────────────────────────────────────
+
+TOOLS_SUMMARY_LIMIT = 3
+REFRESH_CHUNK_SIZE = 1000
+
+
+def format_tools_summary(labels, limit=TOOLS_SUMMARY_LIMIT):
+    """장비 라벨 목록 → "A > a, B > b, C > c 외 N건" (없으면 빈 문자열)"""
+    labels = list(labels)
+    summary = ", ".join(labels[:limit])
+    if len(labels) > limit:
+        summary += " 외 %d건" % (len(labels) - limit)
+    return summary
+
+
+def refresh_batch_counters(batches, related_name, count_field, chunk_size=REFRESH_CHUNK_SIZE):
+    """배치 QuerySet의 품목 수(count_field)와 장비 요약(tools_summary)을 다시 계산해 저장
+
+    related_name: 하위 행 역참조 이름 (하위 모델은 tool FK를 가져야 한다)
+    배치 id 청크마다 집계 2회(건수, 장비 목록) + bulk_update 1회로 처리한다.
+    반환: 갱신한 배치 수
+    """
+    model = batches.model
+    relation = model._meta.get_field(related_name)
+    fk_name = relation.field.name
+    children = relation.related_model._base_manager.order_by()
+
+    batch_ids = list(batches.order_by().values_list("pk", flat=True))
+    for start in range(0, len(batch_ids), chunk_size):
+        chunk = batch_ids[start:start + chunk_size]
+        rows = children.filter(**{f"{fk_name}__in": chunk})
+        counts = dict(
+            rows.values(fk_name).annotate(total=Count("pk")).values_list(fk_name, "total")
+        )
+        labels = {}
+        tools = (
+            rows.values_list(fk_name, "tool__brand__name", "tool__model_name")
+            .order_by(fk_name, "tool__brand__name", "tool__model_name")
+            .distinct()
+        )
+        for batch_id, brand_name, model_name in tools:
+            labels.setdefault(batch_id, []).append("%s > %s" % (brand_name, model_name))
+
+        model._base_manager.bulk_update(
+            [
+                model(pk=pk, **{
+                    count_field: counts.get(pk, 0),
+                    "tools_summary": format_tools_summary(labels.get(pk, ())),
+                })
+                for pk in chunk
+            ],
+            [count_field, "tools_summary"],
+        )
+    return len(batch_ids)
+
+
+# ──────────────────────────────────────────────
+# 하위 행 변경 후 카운터 갱신 예약
+# 배치를 삭제하면 하위 행 N개가 CASCADE로 함께 삭제되며 행마다 post_delete가 발생한다.
+# 행마다 바로 다시 계산하는 대신 배치 id를 모아 두었다가 커밋 이후 배치별로 한 번만 계산한다.
+# 함께 삭제된 배치는 커밋 시점에 남아 있지 않으므로 계산 대상에서 빠진다.
+# 모아 둔 배치 id는 on_commit 콜백만 강하게 참조하므로, 트랜잭션이 롤백되어 콜백이 버려지면
+# 함께 사라지고 다음 트랜잭션으로 넘어가지 않는다. (스레드 로컬에는 약한 참조만 보관)
+# ──────────────────────────────────────────────
+
+_pending = threading.local()
+
+
+class _PendingBatches(dict):
+    """커밋 대기 중인 배치 id 묶음 {배치 모델: {id, ...}}"""
+
+    def refresh(self):
+        # 같은 묶음을 참조하는 콜백이 여러 개여도 첫 콜백이 모두 처리하고 비운다.
+        pending = dict(self)
+        self.clear()
+        for batch_model, batch_ids in pending.items():
+            batch_model.objects.filter(pk__in=batch_ids).refresh_counters()
+
+
+def schedule_refresh(batch_model, batch_id):
+    """배치 카운터 갱신을 트랜잭션 커밋 이후로 예약 (같은 배치는 한 번만 계산)"""
+    if not batch_id:
+        return
+    ref = getattr(_pending, "batches", None)
+    pending = ref() if ref is not None else None
+    if pending is None:
+        pending = _PendingBatches()
+        _pending.batches = weakref.ref(pending)
+    batch_ids = pending.setdefault(batch_model, set())
+    if batch_id in batch_ids:
+        return
+    batch_ids.add(batch_id)
+    # 세이브포인트가 롤백되면 그 안에서 등록한 콜백만 버려지므로 새로 추가한 id마다 등록한다.
+    # robust: 카운터 갱신이 실패해도 뒤따르는 다른 커밋 후처리(캐시 버전 갱신 등)는 실행
+    transaction.on_commit(pending.refresh, robust=True)
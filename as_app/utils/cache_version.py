@@ -0,0 +1,30 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# ──────────────────────────────────────────────
+# 캐시 버전 키
+# 캐시 값을 지우는 대신 키에 버전을 넣고, 원본이 바뀌면 커밋 이후 버전만 올린다.
+# 커밋 전에 계산을 시작한 요청이 뒤늦게 저장한 값은 이전 버전 키에 남아 더 이상 읽히지 않는다.
+# 버전은 시각(마이크로초) 기반이라 캐시가 비워진 뒤 새로 발급해도 이전 값과 겹치지 않는다.
+# (대시보드 지표, 단가 매트릭스, 장비별 카탈로그, 활성 시리얼 집합에서 사용)
+# ──────────────────────────────────────────────
+
+
+def _new_version():
+    return time.time_ns() // 1000
+
+
+def get_version(key):
+    """현재 버전 (없으면 새로 발급)"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """버전 갱신 (트랜잭션 커밋 이후 실행)"""
+    transaction.on_commit(lambda: cache.set(key, _new_version(), None))
@@ -0,0 +1,240 @@
+import base64
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+# ──────────────────────────────────────────────
+# 대용량 이력 목록용 키셋(seek) 페이지네이션
+# 기본 정렬(예: 입고일 ↓, 생성일 ↓, id ↓)로 볼 때 "다음/이전" 링크에 경계 행의 정렬 키를
+# 커서로 담아 WHERE (정렬 키) < 커서 + LIMIT로 조회한다. OFFSET이 없으므로 몇 번째 페이지든
+# 첫 페이지와 같은 비용이다.
+# 전체 건수는 조건 없는 조회면 PostgreSQL 통계 추정치, 그 외에는 COUNT_CAP까지만 센다.
+# 열 정렬을 바꾸거나 검색 순위(search_rank)로 정렬하면 OFFSET 방식으로 돌아가되 건수는 같은 방식으로 계산한다.
+# ──────────────────────────────────────────────
+
+CURSOR_VAR = "cursor"
+SEARCH_RANK = "search_rank"
+COUNT_CAP = 10_000
+
+
+def _encode_cursor(direction, values):
+    payload = json.dumps([direction, [v.isoformat() if hasattr(v, "isoformat") else v for v in values]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise IncorrectLookupParameters("잘못된 페이지 커서입니다.")
+    if direction not in ("after", "before"):
+        raise IncorrectLookupParameters("잘못된 페이지 커서입니다.")
+    return direction, values
+
+
+def estimate_count(queryset, cap=COUNT_CAP):
+    """목록 건수 계산 — (건수, 구분) 반환. 구분: "exact" / "estimate"(통계 추정) / "capped"(cap 이상)
+
+    조건 없는 전체 조회는 PostgreSQL 통계(pg_class.reltuples)를 먼저 보고,
+    그 외에는 LIMIT cap+1 서브쿼리로 cap까지만 센다.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if not queryset.query.where and connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] > cap:
+            return row[0], "estimate"
+    count = queryset.values("pk")[:cap + 1].count()
+    if count > cap:
+        return cap, "capped"
+    return count, "exact"
+
+
+class KeysetPaginator(Paginator):
+    """건수를 미리 계산해 받는 Paginator (unfold pagination 템플릿 지정용)"""
+
+    template_name = "unfold/helpers/pagination_keyset.html"
+
+    def __init__(self, object_list, per_page, count):
+        super().__init__(object_list, per_page)
+        self.count = count
+
+    def get_elided_page_range(self, number=1, *args, **kwargs):
+        # 번호 링크는 쓰지 않는다 (추정 건수로 페이지 범위를 검증하면 깊은 페이지에서 오류)
+        return []
+
+
+class KeysetChangeList(ChangeList):
+    """model_admin.keyset_ordering과 실제 정렬이 같으면 키셋 방식으로 결과를 조회하는 ChangeList"""
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # 필터/정렬/검색 링크는 커서 없이 첫 페이지부터 보여준다
+        return super().get_query_string(new_params, [CURSOR_VAR, *(remove or [])])
+
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        # 검색 백엔드가 순위(search_rank)를 붙인 경우 열 정렬을 고르지 않았다면 순위 우선
+        if SEARCH_RANK in queryset.query.annotations and not self.params.get(ORDER_VAR):
+            ordering = ["-" + SEARCH_RANK, *(o for o in ordering if o != "-" + SEARCH_RANK)]
+        return ordering
+
+    def _keyset_ordering(self):
+        ordering = tuple(self.model_admin.keyset_ordering or ())
+        if ordering and tuple(self.queryset.query.order_by) == ordering and not self.show_all:
+            return ordering
+        return None
+
+    def get_results(self, request):
+        result_count, count_kind = estimate_count(self.queryset)
+        ordering = self._keyset_ordering()
+        if ordering is None and self.cursor:
+            raise IncorrectLookupParameters("현재 정렬에서는 페이지 커서를 사용할 수 없습니다.")
+
+        per_page = self.list_per_page
+        self.page_num = max(self.page_num, 1)
+        if ordering is None:
+            offset = (self.page_num - 1) * per_page
+            rows = list(self.queryset[offset:offset + per_page + 1])
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+            has_previous = self.page_num > 1
+        else:
+            rows, has_previous, has_next = self._seek(ordering, per_page)
+
+        self.result_count = result_count
+        self.result_count_kind = count_kind
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_previous or has_next
+        self.paginator = KeysetPaginator(self.queryset, per_page, result_count)
+
+        # 이전/다음 링크 (키셋 모드는 경계 행의 정렬 키를 커서로 전달)
+        self.previous_url = self.next_url = None
+        if has_previous:
+            params = {PAGE_VAR: self.page_num - 1 if self.page_num > 2 else None}
+            if ordering is not None and self.page_num > 2:
+                params[CURSOR_VAR] = _encode_cursor("before", self._row_key(rows[0], ordering))
+            self.previous_url = self.get_query_string(params)
+        if has_next:
+            params = {PAGE_VAR: self.page_num + 1}
+            if ordering is not None:
+                params[CURSOR_VAR] = _encode_cursor("after", self._row_key(rows[-1], ordering))
+            self.next_url = self.get_query_string(params)
+
+    # ── 키셋 조회 ──
+
+    def _seek(self, ordering, per_page):
+        """커서 기준 한 페이지 조회 — (행 목록, 이전 페이지 여부, 다음 페이지 여부)"""
+        if not self.cursor:
+            if self.page_num > 1:
+                # 커서 없이 페이지 번호만 온 경우(북마크 등)는 OFFSET으로 처리
+                offset = (self.page_num - 1) * per_page
+                rows = list(self.queryset[offset:offset + per_page + 1])
+                return rows[:per_page], True, len(rows) > per_page
+            rows = list(self.queryset[:per_page + 1])
+            return rows[:per_page], False, len(rows) > per_page
+
+        direction, values = _decode_cursor(self.cursor)
+        if len(values) != len(ordering):
+            raise IncorrectLookupParameters("잘못된 페이지 커서입니다.")
+        values = [self._to_python(name, value) for name, value in zip(ordering, values)]
+        if direction == "after":
+            qs = self.queryset.filter(self._seek_filter(ordering, values, forward=True))
+            rows = list(qs[:per_page + 1])
+            return rows[:per_page], True, len(rows) > per_page
+
+        # 이전 페이지: 정렬을 뒤집어 커서 앞쪽 행을 가져온 뒤 원래 순서로 되돌림
+        reversed_ordering = [name[1:] if name.startswith("-") else "-" + name for name in ordering]
+        qs = (
+            self.queryset.filter(self._seek_filter(ordering, values, forward=False))
+            .order_by(*reversed_ordering)
+        )
+        rows = list(qs[:per_page + 1])
+        return rows[:per_page][::-1], len(rows) > per_page, True
+
+    @staticmethod
+    def _seek_filter(ordering, values, forward):
+        """(a, b, c) 정렬 키 기준 커서 다음(forward) 또는 이전 행 조건
+
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) 형태 (필드별 정렬 방향 반영)
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, values):
+            descending = name.startswith("-")
+            field = name.lstrip("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _resolve_field(self, name):
+        opts = self.lookup_opts
+        parts = name.lstrip("-").split(LOOKUP_SEP)
+        field = None
+        for part in parts:
+            field = opts.pk if part == "pk" else opts.get_field(part)
+            if field.is_relation:
+                opts = field.related_model._meta
+        return field
+
+    def _to_python(self, name, value):
+        try:
+            return self._resolve_field(name).to_python(value)
+        except Exception:
+            raise IncorrectLookupParameters("잘못된 페이지 커서입니다.")
+
+    @staticmethod
+    def _row_key(obj, ordering):
+        key = []
+        for name in ordering:
+            value = obj
+            for part in name.lstrip("-").split(LOOKUP_SEP):
+                value = getattr(value, part)
+            key.append(value)
+        return key
+
+    @property
+    def result_count_label(self):
+        if self.result_count_kind == "estimate":
+            return f"약 {self.result_count:,}건"
+        if self.result_count_kind == "capped":
+            return f"{self.result_count:,}건 이상"
+        return f"{self.result_count:,}건"
+
+
+class KeysetPaginationMixin:
+    """ModelAdmin 믹스인 — keyset_ordering을 지정하면 기본 정렬 목록을 키셋 방식으로 페이지 이동
+
+    keyset_ordering은 ChangeList가 만드는 최종 정렬(기본 정렬 + 결정적 정렬용 -pk)과 같아야 하며,
+    정렬 키 필드는 NULL이 없어야 한다.
+    """
+
+    keyset_ordering = None
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -6,11 +6,9 @@ from reportlab.lib.units import mm
 from reportlab.platypus import (
     SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from reportlab.lib import colors
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
+
+from .pdf_fonts import get_estimate_styles, get_pdf_fonts
 
 # ── 이미지 경로 ──
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,15 +18,6 @@ LOGO_YOKOTA_APEX = os.path.join(IMG_DIR, "YOKOTA,APEX 로고.png")
 STAMP_IMG = os.path.join(IMG_DIR, "회사직인.png")
 
 
-def _register_fonts():
-    font_path = "C:\\Windows\\Fonts\\malgun.ttf"
-    font_bold_path = "C:\\Windows\\Fonts\\malgunbd.ttf"
-    if os.path.exists(font_path):
-        pdfmetrics.registerFont(TTFont('Malgun', font_path))
-    if os.path.exists(font_bold_path):
-        pdfmetrics.registerFont(TTFont('Malgun-Bold', font_bold_path))
-
-
 def _safe_image(path, width=None, height=None):
     """이미지 파일이 존재하면 Image 객체 반환, 없으면 빈 문자열"""
     if os.path.exists(path):
@@ -46,7 +35,6 @@ def generate_pdf_estimate(tickets) -> io.BytesIO:
     
     업체별 단가 그룹에 따른 차등 가격이 자동 적용됩니다.
     """
-    _register_fonts()
     buffer = io.BytesIO()
 
     doc = SimpleDocTemplate(
@@ -59,62 +47,28 @@ def generate_pdf_estimate(tickets) -> io.BytesIO:
     )
 
     elements = []
-    font_name = 'Malgun' if 'Malgun' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
-    font_bold = 'Malgun-Bold' if 'Malgun-Bold' in pdfmetrics.getRegisteredFontNames() else font_name
-
-    # ── 스타일 정의 ──
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'TitleStyle', parent=styles['Normal'],
-        fontName=font_bold, fontSize=26, leading=32,
-        alignment=TA_CENTER, spaceAfter=8,
-    )
-    company_large_style = ParagraphStyle(
-        'CompanyLarge', parent=styles['Normal'],
-        fontName=font_bold, fontSize=20, leading=26,
-        alignment=TA_RIGHT,
-    )
-    info_style = ParagraphStyle(
-        'InfoStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=10, leading=14,
-    )
-    info_right_style = ParagraphStyle(
-        'InfoRight', parent=styles['Normal'],
-        fontName=font_name, fontSize=10, leading=14,
-        alignment=TA_LEFT,
-    )
-    note_style = ParagraphStyle(
-        'NoteStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=13,
-    )
-    cell_style = ParagraphStyle(
-        'CellStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-    )
-    cell_center = ParagraphStyle(
-        'CellCenter', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-        alignment=TA_CENTER,
-    )
-    cell_right = ParagraphStyle(
-        'CellRight', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-        alignment=TA_RIGHT,
-    )
-    cell_bold = ParagraphStyle(
-        'CellBold', parent=styles['Normal'],
-        fontName=font_bold, fontSize=9, leading=12,
-        alignment=TA_CENTER,
-    )
-    header_style = ParagraphStyle(
-        'HeaderStyle', parent=styles['Normal'],
-        fontName=font_bold, fontSize=10, leading=13,
-        alignment=TA_CENTER,
-    )
+    font_name, font_bold = get_pdf_fonts()
+
+    # ── 스타일 (프로세스당 1회 생성 후 재사용) ──
+    styles = get_estimate_styles()
+    title_style = styles["title"]
+    company_large_style = styles["company_large"]
+    info_style = styles["info"]
+    info_right_style = styles["info_right"]
+    note_style = styles["note"]
+    cell_style = styles["cell"]
+    cell_center = styles["cell_center"]
+    cell_right = styles["cell_right"]
+    cell_bold = styles["cell_bold"]
+    header_style = styles["header"]
 
     page_width = A4[0] - 50  # 좌우 여백 25씩
 
+    # 업체별 단가 조회용 매트릭스 (티켓 수와 무관하게 1회 로드)
+    from as_app.models import ASTicket
+    from as_app.pricing import get_price_matrix
+    matrix = get_price_matrix()
+
     for idx, ticket in enumerate(tickets):
         if idx > 0:
             from reportlab.platypus import PageBreak
@@ -127,9 +81,9 @@ def generate_pdf_estimate(tickets) -> io.BytesIO:
         sn = ticket.serial_number if ticket.serial_number else ""
         parts = list(ticket.used_parts.all())
         # 업체별 단가 그룹에 따른 차등 가격 적용
-        part_prices = {p: (p.get_price_for_company(company) or 0) for p in parts}
+        part_prices = {p: (p.get_price_for_company(company, matrix=matrix) or 0) for p in parts}
         total_price = sum(part_prices.values())
-        nego_price = int(total_price * 0.9)
+        nego_price = ASTicket.calculate_nego_price(total_price)
         today = datetime.now()
 
         # ═══════════════════════════════════════════
@@ -342,7 +296,6 @@ def generate_pdf_estimate(tickets) -> io.BytesIO:
 
 def generate_custom_pdf_estimate(custom_data_list) -> io.BytesIO:
     """커스텀 딕셔너리 데이터를 기반으로 다스 공구실 견적서 PDF 생성"""
-    _register_fonts()
     buffer = io.BytesIO()
 
     doc = SimpleDocTemplate(
@@ -355,59 +308,20 @@ def generate_custom_pdf_estimate(custom_data_list) -> io.BytesIO:
     )
 
     elements = []
-    font_name = 'Malgun' if 'Malgun' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
-    font_bold = 'Malgun-Bold' if 'Malgun-Bold' in pdfmetrics.getRegisteredFontNames() else font_name
-
-    # ── 스타일 정의 ──
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'TitleStyle', parent=styles['Normal'],
-        fontName=font_bold, fontSize=26, leading=32,
-        alignment=TA_CENTER, spaceAfter=8,
-    )
-    company_large_style = ParagraphStyle(
-        'CompanyLarge', parent=styles['Normal'],
-        fontName=font_bold, fontSize=20, leading=26,
-        alignment=TA_RIGHT,
-    )
-    info_style = ParagraphStyle(
-        'InfoStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=10, leading=14,
-    )
-    info_right_style = ParagraphStyle(
-        'InfoRight', parent=styles['Normal'],
-        fontName=font_name, fontSize=10, leading=14,
-        alignment=TA_LEFT,
-    )
-    note_style = ParagraphStyle(
-        'NoteStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=13,
-    )
-    cell_style = ParagraphStyle(
-        'CellStyle', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-    )
-    cell_center = ParagraphStyle(
-        'CellCenter', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-        alignment=TA_CENTER,
-    )
-    cell_right = ParagraphStyle(
-        'CellRight', parent=styles['Normal'],
-        fontName=font_name, fontSize=9, leading=12,
-        alignment=TA_RIGHT,
-    )
-    cell_bold = ParagraphStyle(
-        'CellBold', parent=styles['Normal'],
-        fontName=font_bold, fontSize=9, leading=12,
-        alignment=TA_CENTER,
-    )
-    header_style = ParagraphStyle(
-        'HeaderStyle', parent=styles['Normal'],
-        fontName=font_bold, fontSize=10, leading=13,
-        alignment=TA_CENTER,
-    )
+    font_name, font_bold = get_pdf_fonts()
+
+    # ── 스타일 (프로세스당 1회 생성 후 재사용) ──
+    styles = get_estimate_styles()
+    title_style = styles["title"]
+    company_large_style = styles["company_large"]
+    info_style = styles["info"]
+    info_right_style = styles["info_right"]
+    note_style = styles["note"]
+    cell_style = styles["cell"]
+    cell_center = styles["cell_center"]
+    cell_right = styles["cell_right"]
+    cell_bold = styles["cell_bold"]
+    header_style = styles["header"]
 
     page_width = A4[0] - 50  # 좌우 여백 25씩
 
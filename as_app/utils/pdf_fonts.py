@@ -0,0 +1,189 @@
+import functools
+import logging
+import os
+import shutil
+import subprocess
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────
+# PDF 공용 한글 폰트 / 스타일
+# 폰트(TTF 파싱·등록)와 ParagraphStyle은 프로세스당 한 번만 만들고 모든 PDF 출력에서 재사용한다.
+# 폰트 후보 순서:
+#   1) settings.PDF_FONT_PATHS / PDF_BOLD_FONT_PATHS — 경로 또는 (경로, 서브폰트 인덱스) (.ttc용)
+#   2) fontconfig(fc-list :lang=ko)가 찾은 시스템 한글 폰트
+# 앞에서부터 실제로 읽히는 첫 폰트를 쓴다. (ReportLab이 읽지 못하는 CFF/OTF 폰트는 건너뜀)
+# ──────────────────────────────────────────────
+
+FONT_NAME = "KoreanFont"
+FONT_NAME_BOLD = "KoreanFont-Bold"
+
+REGULAR_WEIGHT = 80  # fontconfig weight: regular
+BOLD_WEIGHT = 200  # fontconfig weight: bold
+
+
+def _configured_fonts(paths):
+    """설정 경로 후보 → 존재하는 (경로, 서브폰트 인덱스)"""
+    for entry in paths:
+        if not entry:
+            continue
+        path, index = entry if isinstance(entry, (tuple, list)) else (entry, 0)
+        if os.path.exists(path):
+            yield str(path), int(index)
+
+
+def _fontconfig_fonts(bold=False):
+    """fontconfig에 등록된 한글 지원 폰트 — 요청한 굵기에 가까운 순"""
+    fc_list = shutil.which("fc-list")
+    if not fc_list:
+        return []
+    try:
+        output = subprocess.run(
+            [fc_list, "--format=%{file}\t%{index}\t%{weight}\n", ":lang=ko"],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+
+    target = BOLD_WEIGHT if bold else REGULAR_WEIGHT
+    fonts = []
+    for line in output.splitlines():
+        path, index, weight = (line.split("\t") + ["", ""])[:3]
+        try:
+            index, weight = int(index or 0), int(float(weight or REGULAR_WEIGHT))
+        except ValueError:
+            continue
+        if bold and weight < BOLD_WEIGHT:
+            continue
+        # 같은 굵기면 TrueType(.ttf/.ttc) 우선 — ReportLab은 CFF 윤곽선(.otf 등)을 읽지 못함
+        fonts.append((abs(weight - target), not path.lower().endswith((".ttf", ".ttc")), path, index))
+    return [(path, index) for *_, path, index in sorted(fonts)]
+
+
+def load_font(name, paths, bold=False):
+    """후보 중 처음으로 읽히는 폰트를 TTFont로 반환 (없으면 None)"""
+    candidates = list(_configured_fonts(paths))
+    candidates += [font for font in _fontconfig_fonts(bold) if font not in candidates]
+    for path, index in candidates:
+        try:
+            return TTFont(name, path, subfontIndex=index)
+        except (TTFError, OSError, ValueError):
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_pdf_fonts():
+    """(본문 폰트명, 굵은 폰트명) 반환 — 최초 호출 시 한글 폰트를 찾아 등록
+
+    한글 폰트를 찾지 못하면 경고를 한 번 남기고 Helvetica로 대체한다. (한글은 깨져서 출력됨)
+    """
+    regular = load_font(FONT_NAME, getattr(settings, "PDF_FONT_PATHS", []))
+    if regular is None:
+        logger.warning(
+            "PDF용 한글 폰트를 찾지 못해 Helvetica로 출력합니다 (한글 깨짐). "
+            "PDF_FONT_PATH 환경변수를 지정하거나 fonts-nanum 패키지를 설치하세요."
+        )
+        return "Helvetica", "Helvetica-Bold"
+    pdfmetrics.registerFont(regular)
+
+    bold = load_font(FONT_NAME_BOLD, getattr(settings, "PDF_BOLD_FONT_PATHS", []), bold=True)
+    if bold is None:
+        return FONT_NAME, FONT_NAME
+    pdfmetrics.registerFont(bold)
+    return FONT_NAME, FONT_NAME_BOLD
+
+
+@functools.lru_cache(maxsize=None)
+def get_report_styles():
+    """재고/입출고 보고서(tool_inventory) 공용 스타일"""
+    font_name, font_name_bold = get_pdf_fonts()
+    base = getSampleStyleSheet()["Normal"]
+
+    normal = ParagraphStyle("ReportNormal", parent=base, fontName=font_name, fontSize=9, leading=14)
+    bold = ParagraphStyle("ReportBold", parent=base, fontName=font_name_bold, fontSize=10, leading=14)
+    center = ParagraphStyle("ReportCenter", parent=normal, alignment=TA_CENTER)
+    return {
+        "normal": normal,
+        "bold": bold,
+        "center": center,
+        "title": ParagraphStyle(
+            "ReportTitle", parent=base, fontName=font_name_bold, fontSize=18, alignment=TA_CENTER, spaceAfter=20,
+        ),
+        "date": ParagraphStyle(
+            "ReportDate", parent=base, fontName=font_name, fontSize=10,
+            textColor=colors.gray, alignment=TA_RIGHT, spaceAfter=15,
+        ),
+        "period": ParagraphStyle(
+            "ReportPeriod", parent=base, fontName=font_name, fontSize=11, alignment=TA_CENTER, spaceAfter=25,
+        ),
+        # 입출고 이력 보고서(기간 표시) / 선택 내역 출력(일자 목록 표시)용 간격 조정본
+        "history_title": ParagraphStyle(
+            "ReportHistoryTitle", parent=base, fontName=font_name_bold, fontSize=18, alignment=TA_CENTER, spaceAfter=15,
+        ),
+        "history_date": ParagraphStyle(
+            "ReportHistoryDate", parent=base, fontName=font_name, fontSize=10,
+            textColor=colors.gray, alignment=TA_RIGHT, spaceAfter=5,
+        ),
+        "selection_title": ParagraphStyle(
+            "ReportSelectionTitle", parent=base, fontName=font_name_bold, fontSize=18, alignment=TA_CENTER, spaceAfter=5,
+        ),
+        "selection_dates": ParagraphStyle(
+            "ReportSelectionDates", parent=base, fontName=font_name, fontSize=11, alignment=TA_CENTER, spaceAfter=20,
+        ),
+        # 표 헤더 (왼쪽/가운데 정렬)
+        "header": ParagraphStyle("ReportHeader", parent=normal, fontName=font_name_bold),
+        "header_center": ParagraphStyle("ReportHeaderCenter", parent=center, fontName=font_name_bold),
+        # 총합계 행
+        "total": ParagraphStyle("ReportTotal", parent=bold, alignment=TA_CENTER),
+        # 입고(초록) / 출고(파랑) 구역 제목
+        "inbound_header": ParagraphStyle(
+            "ReportInboundHeader", parent=base, fontName=font_name_bold, fontSize=13,
+            textColor=colors.HexColor("#059669"), spaceAfter=10,
+        ),
+        "outbound_header": ParagraphStyle(
+            "ReportOutboundHeader", parent=base, fontName=font_name_bold, fontSize=13,
+            textColor=colors.HexColor("#2563eb"), spaceAfter=10,
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_estimate_styles():
+    """견적서(as_app.utils.pdf_export) 공용 스타일"""
+    font_name, font_bold = get_pdf_fonts()
+    base = getSampleStyleSheet()["Normal"]
+    return {
+        "title": ParagraphStyle(
+            "TitleStyle", parent=base, fontName=font_bold, fontSize=26, leading=32,
+            alignment=TA_CENTER, spaceAfter=8,
+        ),
+        "company_large": ParagraphStyle(
+            "CompanyLarge", parent=base, fontName=font_bold, fontSize=20, leading=26, alignment=TA_RIGHT,
+        ),
+        "info": ParagraphStyle("InfoStyle", parent=base, fontName=font_name, fontSize=10, leading=14),
+        "info_right": ParagraphStyle(
+            "InfoRight", parent=base, fontName=font_name, fontSize=10, leading=14, alignment=TA_LEFT,
+        ),
+        "note": ParagraphStyle("NoteStyle", parent=base, fontName=font_name, fontSize=9, leading=13),
+        "cell": ParagraphStyle("CellStyle", parent=base, fontName=font_name, fontSize=9, leading=12),
+        "cell_center": ParagraphStyle(
+            "CellCenter", parent=base, fontName=font_name, fontSize=9, leading=12, alignment=TA_CENTER,
+        ),
+        "cell_right": ParagraphStyle(
+            "CellRight", parent=base, fontName=font_name, fontSize=9, leading=12, alignment=TA_RIGHT,
+        ),
+        "cell_bold": ParagraphStyle(
+            "CellBold", parent=base, fontName=font_bold, fontSize=9, leading=12, alignment=TA_CENTER,
+        ),
+        "header": ParagraphStyle(
+            "HeaderStyle", parent=base, fontName=font_bold, fontSize=10, leading=13, alignment=TA_CENTER,
+        ),
+    }
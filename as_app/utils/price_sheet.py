@@ -0,0 +1,163 @@
+import csv
+import io
+
+from openpyxl import load_workbook
+
+# ──────────────────────────────────────────────
+# 단가표 일괄 등록 (CSV / XLSX)
+# 첫 행은 헤더: 부품코드 | (부품명) | 단가 그룹명 ... (그룹명은 단가 그룹 이름과 일치)
+# 각 행의 단가 그룹 칸을 PartPrice로 upsert 한다. 빈 칸은 기존 단가를 유지한다.
+# ──────────────────────────────────────────────
+
+CODE_HEADERS = ("부품코드", "code")
+NAME_HEADERS = ("부품명", "name")
+
+
+class PriceSheetError(Exception):
+    """단가표 파일 형식 오류 (헤더 누락/읽기 실패 등)"""
+
+
+class PriceSheetResult:
+    """단가표 반영 결과"""
+
+    def __init__(self):
+        self.rows = 0
+        self.upserted = 0
+        self.unknown_codes = []
+        self.duplicate_codes = []
+        self.invalid_cells = []
+        self.unknown_groups = []
+
+    def summary(self):
+        return f"단가표 {self.rows:,}행 처리: 단가 {self.upserted:,}건 반영"
+
+    def warnings(self):
+        messages = []
+        if self.unknown_groups:
+            messages.append(f"등록되지 않은 단가 그룹 열(무시됨): {', '.join(self.unknown_groups)}")
+        if self.unknown_codes:
+            messages.append(f"존재하지 않는 부품코드 {len(self.unknown_codes)}개: {_preview(self.unknown_codes)}")
+        if self.duplicate_codes:
+            messages.append(f"여러 부품에 중복된 부품코드 {len(self.duplicate_codes)}개(건너뜀): {_preview(self.duplicate_codes)}")
+        if self.invalid_cells:
+            messages.append(f"숫자가 아닌 단가 {len(self.invalid_cells)}칸(건너뜀): {_preview(self.invalid_cells)}")
+        return messages
+
+
+def _preview(values, limit=10):
+    text = ", ".join(str(v) for v in values[:limit])
+    return text + (" 외" if len(values) > limit else "")
+
+
+def _read_csv(data):
+    # 엑셀에서 저장한 CSV는 BOM 포함 UTF-8 또는 CP949인 경우가 많음
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise PriceSheetError("CSV 파일 인코딩을 읽을 수 없습니다. (UTF-8 또는 CP949로 저장해주세요)")
+    return list(csv.reader(io.StringIO(text)))
+
+
+def _read_xlsx(data):
+    try:
+        wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    except Exception as exc:
+        raise PriceSheetError(f"엑셀 파일을 읽을 수 없습니다: {exc}")
+    try:
+        return [list(row) for row in wb.active.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def read_price_sheet(uploaded_file):
+    """업로드 파일(CSV/XLSX)을 행 리스트로 읽기"""
+    name = (uploaded_file.name or "").lower()
+    data = uploaded_file.read()
+    if name.endswith(".csv"):
+        return _read_csv(data)
+    if name.endswith(".xlsx"):
+        return _read_xlsx(data)
+    raise PriceSheetError("CSV 또는 XLSX 파일만 업로드할 수 있습니다.")
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def import_price_sheet(rows):
+    """단가표 행을 PartPrice에 일괄 반영 (부품/단가 그룹 조회 각 1회 + 일괄 upsert)
+
+    반환: PriceSheetResult
+    """
+    from as_app.models import CompanyCategory, Part
+    from as_app.pricing import upsert_part_prices
+
+    if not rows:
+        raise PriceSheetError("빈 파일입니다.")
+    header = [_cell_text(v) for v in rows[0]]
+    code_col = next((i for i, h in enumerate(header) if h in CODE_HEADERS), None)
+    if code_col is None:
+        raise PriceSheetError("첫 행에 '부품코드' 열이 필요합니다.")
+
+    result = PriceSheetResult()
+    groups = dict(CompanyCategory.objects.values_list("name", "id"))
+    group_cols = {}
+    for i, h in enumerate(header):
+        if i == code_col or not h or h in NAME_HEADERS:
+            continue
+        if h in groups:
+            group_cols[i] = groups[h]
+        else:
+            result.unknown_groups.append(h)
+    if not group_cols:
+        raise PriceSheetError("단가 그룹 이름과 일치하는 열이 없습니다.")
+
+    body = [row for row in rows[1:] if any(_cell_text(v) for v in row)]
+    result.rows = len(body)
+    codes = {_cell_text(row[code_col]) for row in body if code_col < len(row)}
+    codes.discard("")
+    part_ids = {}
+    duplicates = set()
+    for code, pk in Part.objects.filter(code__in=codes).values_list("code", "pk"):
+        if code in part_ids:
+            duplicates.add(code)
+        part_ids[code] = pk
+
+    # 같은 (부품, 단가 그룹)이 여러 행에 있으면 마지막 행 기준
+    entries = {}
+    for line_no, row in enumerate(body, start=2):
+        code = _cell_text(row[code_col]) if code_col < len(row) else ""
+        if not code:
+            continue
+        if code in duplicates:
+            if code not in result.duplicate_codes:
+                result.duplicate_codes.append(code)
+            continue
+        if code not in part_ids:
+            result.unknown_codes.append(code)
+            continue
+        for col, category_id in group_cols.items():
+            text = _cell_text(row[col]) if col < len(row) else ""
+            if not text:
+                continue
+            try:
+                price = int(text.replace(",", ""))
+                if price < 0:
+                    raise ValueError
+            except ValueError:
+                result.invalid_cells.append(f"{line_no}행 {header[col]}")
+                continue
+            entries[(part_ids[code], category_id)] = price
+
+    result.upserted = upsert_part_prices(
+        (part_id, category_id, price) for (part_id, category_id), price in entries.items()
+    )
+    return result
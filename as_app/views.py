@@ -11,3 +11,22 @@ def get_tools_by_brand(request):
     
     tools = Tool.objects.filter(brand_id=brand_id).values("id", "model_name")
     return JsonResponse({"tools": list(tools)})
+
+
+@staff_member_required
+def serial_lookup(request):
+    """시리얼 검색어(q)로 AS 티켓/툴 재고 통합 색인을 조회해 일치하는 시리얼 목록을 JSON으로 반환
+
+    기본은 앞부분 일치, infix=1이면 부분 일치
+    """
+    from django.core.exceptions import PermissionDenied
+
+    from .serials import lookup_serials, visible_sources
+
+    # AS 티켓/툴 재고 중 조회 권한이 있는 쪽만 검색 (둘 다 없으면 403)
+    sources = visible_sources(request.user)
+    if not sources:
+        raise PermissionDenied
+    term = request.GET.get("q", "")
+    infix = request.GET.get("infix") == "1"
+    return JsonResponse({"results": lookup_serials(term, infix=infix, sources=sources)})
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 from django.templatetags.static import static
 from django.urls import reverse_lazy
@@ -102,6 +103,57 @@ DATABASES = {
     )
 }
 
+# SQLite(로컬 대체 DB)는 행 잠금(select_for_update)을 지원하지 않으므로
+# 트랜잭션 시작 시점에 쓰기 잠금을 잡아 동시 출고 배정 등이 순서대로 처리되게 한다.
+# 의도적으로 모든 atomic 블록에 적용되는 전역 설정이다 (SQLite는 연결 단위로만 지정 가능).
+# 쓰기 트랜잭션이 DB 전체에서 직렬화되므로 로컬/단일 사용자 환경 전용이며,
+# 운영 DB(PostgreSQL)는 행 잠금을 쓰므로 영향이 없다.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].setdefault("OPTIONS", {})["transaction_mode"] = "IMMEDIATE"
+
+
+# ──────────────────────────────────────────────
+# 캐시 (대시보드 지표 등)
+# 기본값은 파일 캐시: gunicorn 워커 간에 캐시와 무효화가 공유된다.
+# 단일 프로세스 환경에서는 CACHE_BACKEND=django.core.cache.backends.locmem.LocMemCache 로 변경 가능
+# ──────────────────────────────────────────────
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "as_project_cache")),
+    }
+}
+
+
+# ──────────────────────────────────────────────
+# PDF 한글 폰트 (as_app.utils.pdf_fonts)
+# 앞에서부터 실제로 읽히는 첫 번째 파일을 사용하고, 없으면 fontconfig(fc-list :lang=ko)에서 찾는다.
+# 항목은 경로 또는 (경로, 서브폰트 인덱스) — .ttc 컬렉션은 인덱스로 한국어 글꼴을 고른다.
+# - PDF_FONT_PATH / PDF_BOLD_FONT_PATH 환경변수: 서버별 지정 경로
+# - BASE_DIR/fonts: 프로젝트에 함께 배포하는 폰트 파일 위치
+# - Linux: fonts-nanum 패키지 (apt install fonts-nanum)
+# - Linux: fonts-noto-cjk (NotoSansCJK .ttc, 인덱스 1 = KR) — CFF 윤곽선 빌드는 ReportLab이 읽지 못해 건너뜀
+# - Windows: 맑은 고딕
+# ──────────────────────────────────────────────
+PDF_FONT_PATHS = [
+    os.environ.get("PDF_FONT_PATH"),
+    BASE_DIR / "fonts" / "NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    ("/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc", 1),
+    ("/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc", 1),
+    "C:\\Windows\\Fonts\\malgun.ttf",
+]
+PDF_BOLD_FONT_PATHS = [
+    os.environ.get("PDF_BOLD_FONT_PATH"),
+    BASE_DIR / "fonts" / "NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/nanum/NanumGothicBold.ttf",
+    ("/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc", 1),
+    ("/usr/share/fonts/google-noto-cjk/NotoSansCJK-Bold.ttc", 1),
+    "C:\\Windows\\Fonts\\malgunbd.ttf",
+]
+
 
 # ──────────────────────────────────────────────
 # 인증 백엔드 (작업자 이상 = 전체 업무 권한 자동 부여)
@@ -38,8 +38,10 @@ urlpatterns = [
     path("hr/api/", include("hr_app.urls")), # API and custom views for HR
     path("hr/", hr_admin_site.urls),
     path("signup/", as_project_views.signup_view, name="signup_view"),
+    path("serials/", as_project_views.serial_search_view, name="serial_search_view"),
     path("api/tools-by-brand/", as_views.get_tools_by_brand, name="api_tools_by_brand"),
     path("api/inventory-by-tool/", tool_views.get_inventory_by_tool, name="api_inventory_by_tool"),
+    path("api/serials/", as_views.serial_lookup, name="api_serial_lookup"),
 ]
 
 admin.site.site_header = "AS 관리"
@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import login as auth_login, logout as auth_logout
+from django.contrib.admin.views.decorators import staff_member_required
 
 def signup_view(request):
     """회원가입 뷰 - 가입 승인을 위해 is_active 플래그를 False로 저장"""
@@ -81,3 +82,25 @@ def portal_view(request):
         'form': form,
         'recent_requests': recent_requests,
     })
+
+
+@staff_member_required(login_url="portal_view")
+def serial_search_view(request):
+    """포탈 통합 시리얼 조회 — AS 티켓(입고/수리/의뢰/출고)과 툴 재고(입고/출고) 이력을 한 화면에 표시"""
+    from django.core.exceptions import PermissionDenied
+
+    from as_app.serials import serial_timeline, visible_sources
+
+    # AS 티켓/툴 재고 중 조회 권한이 있는 쪽 이력만 표시 (둘 다 없으면 403)
+    sources = visible_sources(request.user)
+    if not sources:
+        raise PermissionDenied
+    query = request.GET.get("q", "").strip()
+    infix = request.GET.get("infix") == "1"
+    timeline, truncated = serial_timeline(query, infix=infix, sources=sources) if query else ([], False)
+    return render(request, 'serial_search.html', {
+        'query': query,
+        'infix': infix,
+        'timeline': timeline,
+        'truncated': truncated,
+    })
@@ -10,6 +10,8 @@ from django.utils.html import format_html
 from .models import Inventory, InventoryBatch, InboundInventory, OutboundInventory
 from .forms import InventoryForm
 from master_data.models import OutsourceCompany, Company, Tool, Brand
+from as_app.utils.keyset_pagination import KeysetPaginationMixin
+from as_app.utils.xlsx_export import XlsxColumn, xlsx_response
 
 class ToolInventoryAdminSite(UnfoldAdminSite):
     site_title = "장비/툴 관리 시스템"
@@ -30,16 +32,12 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
 
     def dashboard_stock_pdf(self, request):
         """대시보드 원클릭: 현재 재고 현황 PDF 다운로드"""
-        import io, os
+        import io
         from django.http import FileResponse
         from reportlab.lib.pagesizes import A4
         from reportlab.lib import colors
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        from django.db.models import Q
-        from master_data.models import Tool
+        from as_app.utils.pdf_fonts import get_report_styles
         from .models import Inventory
         from django.utils import timezone
 
@@ -47,54 +45,25 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=40, bottomMargin=40)
         elements = []
 
-        font_name = 'Helvetica'
-        font_name_bold = 'Helvetica-Bold'
-        try:
-            font_path = "c:\\Windows\\Fonts\\malgun.ttf"
-            font_path_bd = "c:\\Windows\\Fonts\\malgunbd.ttf"
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('Malgun', font_path))
-                font_name = 'Malgun'
-                font_name_bold = 'Malgun' # Fallback
-            if os.path.exists(font_path_bd):
-                pdfmetrics.registerFont(TTFont('MalgunBold', font_path_bd))
-                font_name_bold = 'MalgunBold'
-        except Exception:
-            pass
-
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=18, alignment=1, spaceAfter=20
-        )
-        date_style = ParagraphStyle(
-            'CustomDate', parent=styles['Normal'],
-            fontName=font_name, fontSize=10, textColor=colors.gray, alignment=2, spaceAfter=15
-        )
-        normal_style = ParagraphStyle(
-            'CustomNormal', parent=styles['Normal'],
-            fontName=font_name, fontSize=9, leading=14
-        )
-        bold_style = ParagraphStyle(
-            'CustomBold', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=10, leading=14
-        )
-        center_style = ParagraphStyle(
-            'CustomCenter', parent=normal_style, alignment=1
-        )
+        # 한글 폰트/스타일 (프로세스당 1회 등록·생성 후 재사용)
+        styles = get_report_styles()
+        title_style = styles["title"]
+        date_style = styles["date"]
+        normal_style = styles["normal"]
+        bold_style = styles["bold"]
+        center_style = styles["center"]
 
         elements.append(Paragraph("현재 재고 현황", title_style))
         elements.append(Paragraph(f"출력일시: {timezone.now().strftime('%Y-%m-%d %H:%M')}", date_style))
 
-        tools_with_stock = Tool.objects.filter(
-            inventory__status='재고'
-        ).distinct().select_related('brand').order_by('brand__name', 'model_name')
+        # 전체 재고를 정렬된 단일 쿼리로 스트리밍하여 브랜드 > 장비별로 묶음
+        snapshot = Inventory.objects.stock_snapshot()
 
         data = []
         data.append([
-            Paragraph("<b>품목명 (Model)</b>", ParagraphStyle('H1', parent=normal_style, fontName=font_name_bold)),
-            Paragraph("<b>수량 (Qty)</b>", ParagraphStyle('H2', parent=center_style, fontName=font_name_bold)),
-            Paragraph("<b>시리얼 내역 (S/N)</b>", ParagraphStyle('H3', parent=normal_style, fontName=font_name_bold))
+            Paragraph("<b>품목명 (Model)</b>", styles["header"]),
+            Paragraph("<b>수량 (Qty)</b>", styles["header_center"]),
+            Paragraph("<b>시리얼 내역 (S/N)</b>", styles["header"])
         ])
 
         table_style = TableStyle([
@@ -111,33 +80,22 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
         total_qty = 0
         row_idx = 1
 
-        for tool in tools_with_stock:
-            if tool.brand != current_brand:
-                current_brand = tool.brand
-                brand_name = current_brand.name if current_brand else "미지정 브랜드"
-                data.append([Paragraph(f"■ {brand_name}", bold_style), "", ""])
+        for row in snapshot:
+            if row.brand_id != current_brand:
+                current_brand = row.brand_id
+                data.append([Paragraph(f"■ {row.brand_name}", bold_style), "", ""])
                 table_style.add('SPAN', (0, row_idx), (-1, row_idx))
                 table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#f1f5f9'))
                 table_style.add('BOTTOMPADDING', (0, row_idx), (-1, row_idx), 6)
                 table_style.add('TOPPADDING', (0, row_idx), (-1, row_idx), 6)
                 row_idx += 1
             
-            invs = Inventory.objects.filter(tool=tool, status='재고').order_by('date')
-            count = invs.count()
+            count = row.stock_count
             total_qty += count
-            
-            serials = [inv.serial for inv in invs if inv.serial]
-            no_serial_count = invs.filter(Q(serial__isnull=True) | Q(serial__exact='')).count()
-            parts = []
-            if serials:
-                parts.append(", ".join(serials))
-            if no_serial_count > 0:
-                parts.append(f"S/N 없음: {no_serial_count}개")
-            
-            serial_text = " / ".join(parts) if parts else "-"
+            serial_text = row.stock_serial_summary()
 
             data.append([
-                Paragraph(tool.model_name, normal_style),
+                Paragraph(row.model_name, normal_style),
                 Paragraph(str(count), center_style),
                 Paragraph(serial_text, normal_style)
             ])
@@ -146,8 +104,8 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
             row_idx += 1
 
         data.append([
-            Paragraph("<b>총합계 (Total)</b>", ParagraphStyle('T1', parent=bold_style, alignment=1)),
-            Paragraph(f"<b>{total_qty}</b>", ParagraphStyle('T2', parent=bold_style, alignment=1)),
+            Paragraph("<b>총합계 (Total)</b>", styles["total"]),
+            Paragraph(f"<b>{total_qty}</b>", styles["total"]),
             ""
         ])
         table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#f8fafc'))
@@ -168,15 +126,13 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
 
     def dashboard_history_pdf(self, request):
         """대시보드: 기간별 입출고 이력 PDF 다운로드"""
-        import io, os
+        import io
         from datetime import date, datetime
         from django.http import FileResponse
         from reportlab.lib.pagesizes import A4
         from reportlab.lib import colors
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
+        from as_app.utils.pdf_fonts import get_report_styles
         from .models import Inventory
         from django.utils import timezone
 
@@ -215,55 +171,16 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=40, bottomMargin=40)
         elements = []
 
-        font_name = 'Helvetica'
-        font_name_bold = 'Helvetica-Bold'
-        try:
-            font_path = "c:\\Windows\\Fonts\\malgun.ttf"
-            font_path_bd = "c:\\Windows\\Fonts\\malgunbd.ttf"
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('Malgun', font_path))
-                font_name = 'Malgun'
-                font_name_bold = 'Malgun'
-            if os.path.exists(font_path_bd):
-                pdfmetrics.registerFont(TTFont('MalgunBold', font_path_bd))
-                font_name_bold = 'MalgunBold'
-        except Exception:
-            pass
-
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=18, alignment=1, spaceAfter=15
-        )
-        date_style = ParagraphStyle(
-            'CustomDate', parent=styles['Normal'],
-            fontName=font_name, fontSize=10, textColor=colors.gray, alignment=2, spaceAfter=5
-        )
-        period_style = ParagraphStyle(
-            'CustomPeriod', parent=styles['Normal'],
-            fontName=font_name, fontSize=11, alignment=1, spaceAfter=25
-        )
-        normal_style = ParagraphStyle(
-            'CustomNormal', parent=styles['Normal'],
-            fontName=font_name, fontSize=9, leading=14
-        )
-        bold_style = ParagraphStyle(
-            'CustomBold', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=10, leading=14
-        )
-        center_style = ParagraphStyle(
-            'CustomCenter', parent=normal_style, alignment=1
-        )
-        
-        # Subtitles (Green for inbound, Blue for outbound)
-        inbound_header_style = ParagraphStyle(
-            'InboundHeader', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=13, textColor=colors.HexColor('#059669'), spaceAfter=10
-        )
-        outbound_header_style = ParagraphStyle(
-            'OutboundHeader', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=13, textColor=colors.HexColor('#2563eb'), spaceAfter=10
-        )
+        # 한글 폰트/스타일 (프로세스당 1회 등록·생성 후 재사용)
+        styles = get_report_styles()
+        title_style = styles["history_title"]
+        date_style = styles["history_date"]
+        period_style = styles["period"]
+        normal_style = styles["normal"]
+        bold_style = styles["bold"]
+        center_style = styles["center"]
+        inbound_header_style = styles["inbound_header"]
+        outbound_header_style = styles["outbound_header"]
 
         period_label = f"{start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}"
 
@@ -291,10 +208,10 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
         
         if qs_inbound.exists():
             inbound_data = [[
-                Paragraph("<b>입고일</b>", ParagraphStyle('H1', parent=center_style, fontName=font_name_bold)),
-                Paragraph("<b>품목명 (Model)</b>", ParagraphStyle('H2', parent=normal_style, fontName=font_name_bold)),
-                Paragraph("<b>입고처 (Supplier)</b>", ParagraphStyle('H3', parent=normal_style, fontName=font_name_bold)),
-                Paragraph("<b>시리얼 내역 (S/N)</b>", ParagraphStyle('H4', parent=normal_style, fontName=font_name_bold))
+                Paragraph("<b>입고일</b>", styles["header_center"]),
+                Paragraph("<b>품목명 (Model)</b>", styles["header"]),
+                Paragraph("<b>입고처 (Supplier)</b>", styles["header"]),
+                Paragraph("<b>시리얼 내역 (S/N)</b>", styles["header"])
             ]]
             for inv in qs_inbound:
                 date_str = inv.date.strftime('%Y-%m-%d') if inv.date else "-"
@@ -322,10 +239,10 @@ class ToolInventoryAdminSite(UnfoldAdminSite):
         
         if qs_outbound.exists():
             outbound_data = [[
-                Paragraph("<b>출고일</b>", ParagraphStyle('H1', parent=center_style, fontName=font_name_bold)),
-                Paragraph("<b>품목명 (Model)</b>", ParagraphStyle('H2', parent=normal_style, fontName=font_name_bold)),
-                Paragraph("<b>출고처 (Company)</b>", ParagraphStyle('H3', parent=normal_style, fontName=font_name_bold)),
-                Paragraph("<b>시리얼 내역 (S/N)</b>", ParagraphStyle('H4', parent=normal_style, fontName=font_name_bold))
+                Paragraph("<b>출고일</b>", styles["header_center"]),
+                Paragraph("<b>품목명 (Model)</b>", styles["header"]),
+                Paragraph("<b>출고처 (Company)</b>", styles["header"]),
+                Paragraph("<b>시리얼 내역 (S/N)</b>", styles["header"])
             ]]
             for inv in qs_outbound:
                 date_str = inv.release_date.strftime('%Y-%m-%d') if inv.release_date else "-"
@@ -387,16 +304,39 @@ class ToolToolAdmin(ModelAdmin):
     def has_module_permission(self, request): return False
 
 @admin.register(Inventory, site=tool_admin_site)
-class InventoryAdmin(ModelAdmin):
+class InventoryAdmin(KeysetPaginationMixin, ModelAdmin):
     list_display = (
         'display_status', 'date', 'supplier_text', 'release_date', 'release_company', 
         'tool_text', 'serial', 'usage_process', 'display_edit_button'
     )
     list_display_links = None
     actions = ['cancel_outbound', 'export_selected_to_pdf', 'export_selected_to_excel']
+
+    # 엑셀 내보내기 컬럼 (export_selected_to_excel)
+    xlsx_columns = [
+        XlsxColumn("브랜드", lambda obj: obj.tool.brand.name, width=15),
+        XlsxColumn("모델명", lambda obj: obj.tool.model_name, width=25),
+        XlsxColumn("시리얼번호", lambda obj: obj.serial or "S/N 없음", width=25),
+        XlsxColumn("상태", lambda obj: obj.get_status_display(), width=10),
+        XlsxColumn(
+            "처리일자",
+            lambda obj: str((obj.release_date if obj.status == '출고' else obj.date) or "-"),
+            width=15,
+        ),
+        XlsxColumn(
+            "거래처",
+            lambda obj: (
+                (obj.release_company.name if obj.release_company else "-")
+                if obj.status == '출고' else obj.supplier.name
+            ),
+            width=20,
+        ),
+    ]
     list_filter = ('status', 'supplier', 'release_company')
     search_fields = ('tool__model_name', 'tool__brand__name', 'serial', 'supplier__name', 'release_company__name', 'usage_process')
     list_per_page = 50
+    # 기본 정렬(입고일자 ↓, 품목명)로 볼 때는 OFFSET 대신 키셋 페이지 이동 (출고일자 정렬은 NULL이 있어 제외)
+    keyset_ordering = ("-date", "tool__model_name", "-pk")
     autocomplete_fields = ('tool', 'supplier', 'release_company')
 
     def get_ordering(self, request):
@@ -443,14 +383,12 @@ class InventoryAdmin(ModelAdmin):
 
     @unfold_action(description="📄 선택한 내역 PDF 다운로드", url_path="export-selected-pdf", attrs={"style": "background-color: #9333ea; color: white; border: none;"})
     def export_selected_to_pdf(self, request, queryset):
-        import io, os
+        import io
         from django.http import FileResponse
         from reportlab.lib.pagesizes import A4
         from reportlab.lib import colors
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
+        from as_app.utils.pdf_fonts import get_report_styles
         from django.utils import timezone
         from itertools import groupby
         
@@ -486,45 +424,14 @@ class InventoryAdmin(ModelAdmin):
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=40, bottomMargin=40)
         elements = []
         
-        font_name = 'Helvetica'
-        font_name_bold = 'Helvetica-Bold'
-        try:
-            font_path = "c:\\Windows\\Fonts\\malgun.ttf"
-            font_path_bd = "c:\\Windows\\Fonts\\malgunbd.ttf"
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('Malgun', font_path))
-                font_name = 'Malgun'
-                font_name_bold = 'Malgun'
-            if os.path.exists(font_path_bd):
-                pdfmetrics.registerFont(TTFont('MalgunBold', font_path_bd))
-                font_name_bold = 'MalgunBold'
-        except Exception:
-            pass
-
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=18, alignment=1, spaceAfter=5
-        )
-        date_range_style = ParagraphStyle(
-            'CustomDateRange', parent=styles['Normal'],
-            fontName=font_name, fontSize=11, alignment=1, spaceAfter=20
-        )
-        date_style = ParagraphStyle(
-            'CustomDate', parent=styles['Normal'],
-            fontName=font_name, fontSize=10, textColor=colors.gray, alignment=2, spaceAfter=15
-        )
-        normal_style = ParagraphStyle(
-            'CustomNormal', parent=styles['Normal'],
-            fontName=font_name, fontSize=9, leading=14
-        )
-        bold_style = ParagraphStyle(
-            'CustomBold', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=10, leading=14
-        )
-        center_style = ParagraphStyle(
-            'CustomCenter', parent=normal_style, alignment=1
-        )
+        # 한글 폰트/스타일 (프로세스당 1회 등록·생성 후 재사용)
+        styles = get_report_styles()
+        title_style = styles["selection_title"]
+        date_range_style = styles["selection_dates"]
+        date_style = styles["date"]
+        normal_style = styles["normal"]
+        bold_style = styles["bold"]
+        center_style = styles["center"]
         
         # 문서 헤더 구성
         elements.append(Paragraph(title, title_style))
@@ -550,9 +457,9 @@ class InventoryAdmin(ModelAdmin):
 
         # 테이블 헤더
         data = [[
-            Paragraph("<b>품목명 (Model)</b>", ParagraphStyle('H1', parent=normal_style, fontName=font_name_bold)),
-            Paragraph("<b>수량 (Qty)</b>", ParagraphStyle('H2', parent=center_style, fontName=font_name_bold)),
-            Paragraph("<b>시리얼 내역 (S/N)</b>", ParagraphStyle('H3', parent=normal_style, fontName=font_name_bold))
+            Paragraph("<b>품목명 (Model)</b>", styles["header"]),
+            Paragraph("<b>수량 (Qty)</b>", styles["header_center"]),
+            Paragraph("<b>시리얼 내역 (S/N)</b>", styles["header"])
         ]]
 
         def get_tool_name(obj):
@@ -612,8 +519,8 @@ class InventoryAdmin(ModelAdmin):
 
         # 총합
         data.append([
-            Paragraph("<b>총합계 (Total)</b>", ParagraphStyle('T1', parent=bold_style, alignment=1)),
-            Paragraph(f"<b>{total_qty}</b>", ParagraphStyle('T2', parent=bold_style, alignment=1)),
+            Paragraph("<b>총합계 (Total)</b>", styles["total"]),
+            Paragraph(f"<b>{total_qty}</b>", styles["total"]),
             ""
         ])
         table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#f8fafc'))
@@ -636,19 +543,19 @@ class InventoryAdmin(ModelAdmin):
 
     @unfold_action(description="📊 선택한 내역 엑셀 다운로드", url_path="export-selected-excel", attrs={"style": "background-color: #10b981; color: white; border: none;"})
     def export_selected_to_excel(self, request, queryset):
-        import io
-        import urllib.parse
-        import openpyxl
-        from django.http import HttpResponse
         from django.utils import timezone
-        from openpyxl.styles import Font, Alignment
         
         # 품명 기준으로 정렬 (브랜드 -> 모델명 우선)
-        queryset = queryset.order_by('tool__brand__name', 'tool__model_name', 'date')
+        queryset = queryset.select_related(
+            'tool__brand', 'supplier', 'release_company'
+        ).order_by('tool__brand__name', 'tool__model_name', 'date')
         
-        # 출고 업체명 확인하여 파일명 구성
-        outbound_companies = list(set([obj.release_company.name for obj in queryset if obj.release_company and obj.status == '출고']))
-        is_all_outbound = all(obj.status == '출고' for obj in queryset)
+        # 출고 업체명 확인하여 파일명 구성 (전체 행을 읽지 않도록 DB에서 판별)
+        is_all_outbound = not queryset.exclude(status='출고').exists()
+        outbound_companies = list(
+            queryset.filter(status='출고', release_company__isnull=False)
+            .order_by().values_list('release_company__name', flat=True).distinct()[:2]
+        )
         
         if is_all_outbound and len(outbound_companies) == 1:
             title = f"({outbound_companies[0]}) 출고리스트"
@@ -657,56 +564,9 @@ class InventoryAdmin(ModelAdmin):
         else:
             title = "입출고이력내역"
         
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "입출고이력"
-        
-        headers = ["브랜드", "모델명", "시리얼번호", "상태", "처리일자", "거래처"]
-        ws.append(headers)
-        
-        # 헤더 스타일
-        header_font = Font(bold=True)
-        for col_num, cell in enumerate(ws[1], 1):
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        for obj in queryset:
-            brand_name = obj.tool.brand.name if obj.tool and obj.tool.brand else "-"
-            model_name = obj.tool.model_name if obj.tool else "미지정 품목"
-            serial_text = obj.serial if obj.serial else "S/N 없음"
-            status_text = obj.get_status_display()
-            
-            if obj.status == '출고':
-                date_str = str(obj.release_date) if obj.release_date else "-"
-                company_text = obj.release_company.name if obj.release_company else "-"
-            else:
-                date_str = str(obj.date) if obj.date else "-"
-                company_text = obj.supplier.name if obj.supplier else "-"
-                
-            ws.append([brand_name, model_name, serial_text, status_text, date_str, company_text])
-            
-        # 열 너비 설정
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 10
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 20
-        
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
         safe_title = title.replace(' ', '_').replace('()', '')
         filename = f"{safe_title}_{timezone.now().strftime('%Y%m%d_%H%M')}.xlsx"
-        encoded_filename = urllib.parse.quote(filename.encode('utf-8'))
-        
-        response = HttpResponse(
-            buffer,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
-        return response
+        return xlsx_response(filename, self.xlsx_columns, queryset, sheet_title="입출고이력")
 
     def has_add_permission(self, request):
         return False
@@ -798,7 +658,7 @@ class InventoryInline(TabularInline):
 
 @admin.register(InventoryBatch, site=tool_admin_site)
 class InventoryBatchAdmin(ModelAdmin):
-    list_display = ["inbound_date", "supplier", "created_at"]
+    list_display = ["inbound_date", "supplier", "display_inventory_count", "tools_summary", "created_at"]
     list_filter = ["inbound_date", "supplier"]
     search_fields = ["supplier__name"]
     autocomplete_fields = ["supplier"]
@@ -825,6 +685,10 @@ class InventoryBatchAdmin(ModelAdmin):
         context["show_save_and_continue"] = False
         return super().render_change_form(request, context, add, change, form_url, obj)
 
+    @display(description="품목 수", ordering="inventory_count")
+    def display_inventory_count(self, obj):
+        return f"{obj.inventory_count}건"
+
     def response_add(self, request, obj, post_url_continue=None):
         if getattr(request, "_formset_validation_failed", False):
             if obj.pk and obj.inventories.count() == 0:
@@ -894,6 +758,7 @@ class InventoryBatchAdmin(ModelAdmin):
             instance.save()
             saved_count += 1
         formset.save_m2m()
+        batch.refresh_counters()
         
         original_count = len(instances)
         if saved_count > original_count:
@@ -915,7 +780,7 @@ class OutboundTicketInline(TabularInline):
 
 @admin.register(OutboundBatch, site=tool_admin_site)
 class OutboundBatchAdmin(ModelAdmin):
-    list_display = ["release_date", "release_company", "created_at"]
+    list_display = ["release_date", "release_company", "display_ticket_count", "tools_summary", "created_at"]
     list_filter = ["release_date", "release_company"]
     search_fields = ["release_company__name"]
     autocomplete_fields = ["release_company"]
@@ -929,47 +794,100 @@ class OutboundBatchAdmin(ModelAdmin):
     def get_model_perms(self, request):
         return {}
 
+    @display(description="품목 수", ordering="ticket_count")
+    def display_ticket_count(self, obj):
+        return f"{obj.ticket_count}건"
+
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
-        
+
+    def response_add(self, request, obj, post_url_continue=None):
+        if getattr(request, "_formset_validation_failed", False):
+            # 배정 실패: 품목 저장은 되돌렸으므로 빈 배치 삭제 후 등록 화면으로
+            if obj.pk and not obj.tickets.exists():
+                obj.delete()
+            return HttpResponseRedirect(request.path)
+        return super().response_add(request, obj, post_url_continue)
+
+    def response_change(self, request, obj):
+        if getattr(request, "_formset_validation_failed", False):
+            return HttpResponseRedirect(request.path)
+        return super().response_change(request, obj)
+
+    def _report_allocation(self, request, result):
+        """배정 결과 안내 — 다른 출고로 빠진 선택 시리얼 / 재고 부족 수량"""
+        from django.contrib import messages
+
+        ticket = result.ticket
+        if result.unavailable:
+            serials = Inventory.objects.filter(pk__in=result.unavailable).values_list("serial", flat=True)
+            messages.warning(
+                request,
+                f"{ticket.tool}: 선택한 재고 중 다른 출고로 이미 빠져나간 항목은 제외되었습니다. "
+                f"(S/N: {', '.join(serial or '없음' for serial in serials)})"
+            )
+        elif result.shortfall > 0:
+            messages.warning(
+                request,
+                f"{ticket.tool}: 요청 수량 {result.requested}개 중 재고 {result.allocated}개만 출고되었습니다."
+            )
+
     def save_formset(self, request, form, formset, change):
-        super().save_formset(request, form, formset, change)
-        if formset.model == OutboundTicket:
-            for inline_form in formset.forms:
-                instance = inline_form.instance
-                
-                # 삭제 대상이거나 빈 폼(cleaned_data가 없는 경우)은 건너뜀
-                if instance in formset.deleted_objects or not getattr(inline_form, 'cleaned_data', None):
-                    continue
-                
-                selected_inventories = list(instance.inventories.all())
-                
-                # 시리얼 번호가 골라지지 않았을 때는 선입선출 자동 배정
-                if not selected_inventories:
-                    qty = instance.quantity or 1
-                    auto_inventories = Inventory.objects.filter(
-                        tool=instance.tool, 
-                        status='재고'
-                    ).order_by('date')[:qty]
-                    
-                    for inv in auto_inventories:
-                        inv.release_date = instance.batch.release_date
-                        inv.release_company = instance.batch.release_company
-                        inv.status = '출고'
-                        inv.usage_process = instance.usage_process
-                        inv.save()
-                        instance.inventories.add(inv)
-                else:
-                    # 유저가 직접 다중 선택한 경우
-                    for inv in selected_inventories:
-                        inv.release_date = instance.batch.release_date
-                        inv.release_company = instance.batch.release_company
-                        inv.status = '출고'
-                        inv.usage_process = instance.usage_process
-                        inv.save()
-                        
-                instance.quantity = instance.inventories.count()
-                instance.save()
+        if formset.model != OutboundTicket:
+            return super().save_formset(request, form, formset, change)
+
+        from django.contrib import messages
+        from django.db import transaction
+
+        # 수정 화면: 이미 이 티켓으로 출고된 재고는 재배정 대상에서 제외하기 위해 저장 전 연결 상태 기록
+        owned = {}
+        for inline_form in formset.forms:
+            if inline_form.instance.pk:
+                owned[inline_form.instance.pk] = set(
+                    inline_form.instance.inventories.values_list("pk", flat=True)
+                )
+
+        results = []
+        try:
+            # 품목 저장과 배정을 한 세이브포인트로 묶어, 배정 실패 시 이 배치의 변경만 되돌림
+            with transaction.atomic():
+                super().save_formset(request, form, formset, change)
+                for inline_form in formset.forms:
+                    instance = inline_form.instance
+
+                    # 삭제 대상이거나 빈 폼(cleaned_data가 없는 경우)은 건너뜀
+                    if instance in formset.deleted_objects or not getattr(inline_form, 'cleaned_data', None):
+                        continue
+
+                    # 선택된 시리얼 출고 또는 선입선출 자동 배정 (행 잠금 + 일괄 UPDATE)
+                    result = instance.allocate_inventories(
+                        batch=form.instance,
+                        owned_ids=owned.get(instance.pk, ()),
+                    )
+                    if result.conflict:
+                        raise _OutboundSaveAborted(instance)
+                    results.append(result)
+                form.instance.refresh_counters()
+        except _OutboundSaveAborted as exc:
+            # 동시 출고와 계속 겹침: 500 대신 다시 시도하도록 안내
+            request._formset_validation_failed = True
+            messages.error(
+                request,
+                f"{exc.ticket.tool}: 다른 출고 등록과 동시에 처리되어 저장하지 않았습니다. 다시 시도해 주세요."
+            )
+            return
+
+        for result in results:
+            self._report_allocation(request, result)
+
+
+class _OutboundSaveAborted(Exception):
+    """출고 배정 재시도 소진 — save_formset 세이브포인트 롤백용"""
+
+    def __init__(self, ticket):
+        super().__init__(ticket)
+        self.ticket = ticket
+
 
 @admin.register(OutboundInventory, site=tool_admin_site)
 class OutboundInventoryAdmin(ModelAdmin):
@@ -1021,6 +939,14 @@ class ToolStockSummaryAdmin(ModelAdmin):
     list_per_page = 50
     actions = ["export_stock_pdf", "export_stock_excel"]
 
+    # 엑셀 내보내기 컬럼 (export_stock_excel, 재고 스냅샷 행 기준)
+    xlsx_columns = [
+        XlsxColumn("브랜드", lambda row: row.brand_name, width=15),
+        XlsxColumn("모델명", lambda row: row.model_name, width=30),
+        XlsxColumn("수량", lambda row: row.stock_count, width=10),
+        XlsxColumn("재고 내역(시리얼)", lambda row: row.stock_serial_summary(empty="재고 없음"), width=50),
+    ]
+
     def has_add_permission(self, request):
         return False
         
@@ -1031,12 +957,12 @@ class ToolStockSummaryAdmin(ModelAdmin):
         return False
 
     def get_queryset(self, request):
-        # 재고가 있는 장비만 표시
-        return super().get_queryset(request).filter(inventory__status='재고').distinct()
+        # 재고가 있는 장비만 표시 (재고 수량/시리얼 목록을 함께 집계)
+        return super().get_queryset(request).select_related('brand').with_stock()
 
-    @display(description="현재 재고 수량")
+    @display(description="현재 재고 수량", ordering="stock_count")
     def stock_count(self, obj):
-        count = Inventory.objects.filter(tool=obj, status='재고').count()
+        count = obj.stock_count
         return format_html(
             '<span style="font-weight: bold; color: {};">{}개</span>',
             '#10b981' if count > 0 else '#ef4444', 
@@ -1045,83 +971,42 @@ class ToolStockSummaryAdmin(ModelAdmin):
 
     @display(description="보유 시리얼 목록")
     def serial_list(self, obj):
-        from django.db.models import Q
-        invs = Inventory.objects.filter(tool=obj, status='재고').order_by('date')
-        serials = [inv.serial for inv in invs if inv.serial]
-        no_serial_count = invs.filter(Q(serial__isnull=True) | Q(serial__exact='')).count()
-        
-        parts = []
-        if serials:
-            parts.append(", ".join(serials))
-        if no_serial_count > 0:
-            parts.append(f"(S/N 없음: {no_serial_count}개)")
-            
-        return " / ".join(parts) if parts else "-"
+        return obj.stock_serial_summary(no_serial_format="(S/N 없음: {}개)")
 
     @unfold_action(description="재고 내역 출력 (PDF)", attrs={"style": "background-color: #9333ea; color: white; border: none;"})
     def export_stock_pdf(self, request, queryset):
-        import io, os
+        import io
         from django.http import FileResponse
         from reportlab.lib.pagesizes import A4
         from reportlab.lib import colors
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        from django.db.models import Q
-        from .models import Inventory
+        from as_app.utils.pdf_fonts import get_report_styles
         from django.utils import timezone
+        from .models import Inventory
         
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=40, bottomMargin=40)
         elements = []
         
-        font_name = 'Helvetica'
-        font_name_bold = 'Helvetica-Bold'
-        try:
-            font_path = "c:\\Windows\\Fonts\\malgun.ttf"
-            font_path_bd = "c:\\Windows\\Fonts\\malgunbd.ttf"
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont('Malgun', font_path))
-                font_name = 'Malgun'
-                font_name_bold = 'Malgun'
-            if os.path.exists(font_path_bd):
-                pdfmetrics.registerFont(TTFont('MalgunBold', font_path_bd))
-                font_name_bold = 'MalgunBold'
-        except Exception:
-            pass
-            
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=18, alignment=1, spaceAfter=20
-        )
-        date_style = ParagraphStyle(
-            'CustomDate', parent=styles['Normal'],
-            fontName=font_name, fontSize=10, textColor=colors.gray, alignment=2, spaceAfter=15
-        )
-        normal_style = ParagraphStyle(
-            'CustomNormal', parent=styles['Normal'],
-            fontName=font_name, fontSize=9, leading=14
-        )
-        bold_style = ParagraphStyle(
-            'CustomBold', parent=styles['Normal'],
-            fontName=font_name_bold, fontSize=10, leading=14
-        )
-        center_style = ParagraphStyle(
-            'CustomCenter', parent=normal_style, alignment=1
-        )
+        # 한글 폰트/스타일 (프로세스당 1회 등록·생성 후 재사용)
+        styles = get_report_styles()
+        title_style = styles["title"]
+        date_style = styles["date"]
+        normal_style = styles["normal"]
+        bold_style = styles["bold"]
+        center_style = styles["center"]
 
         elements.append(Paragraph("선택 장비 재고 내역", title_style))
         elements.append(Paragraph(f"출력일시: {timezone.now().strftime('%Y-%m-%d %H:%M')}", date_style))
 
-        queryset = queryset.select_related('brand').order_by('brand__name', 'model_name')
+        # 선택 장비의 재고를 정렬된 단일 쿼리로 스트리밍하여 브랜드 > 장비별로 묶음
+        snapshot = Inventory.objects.filter(tool__in=queryset.values('pk')).stock_snapshot()
         
         data = []
         data.append([
-            Paragraph("<b>품목명 (Model)</b>", ParagraphStyle('H1', parent=normal_style, fontName=font_name_bold)),
-            Paragraph("<b>수량 (Qty)</b>", ParagraphStyle('H2', parent=center_style, fontName=font_name_bold)),
-            Paragraph("<b>시리얼 내역 (S/N)</b>", ParagraphStyle('H3', parent=normal_style, fontName=font_name_bold))
+            Paragraph("<b>품목명 (Model)</b>", styles["header"]),
+            Paragraph("<b>수량 (Qty)</b>", styles["header_center"]),
+            Paragraph("<b>시리얼 내역 (S/N)</b>", styles["header"])
         ])
 
         table_style = TableStyle([
@@ -1138,34 +1023,22 @@ class ToolStockSummaryAdmin(ModelAdmin):
         total_qty = 0
         row_idx = 1
         
-        for tool in queryset:
-            if tool.brand != current_brand:
-                current_brand = tool.brand
-                brand_name = current_brand.name if current_brand else "미지정 브랜드"
-                data.append([Paragraph(f"■ {brand_name}", bold_style), "", ""])
+        for row in snapshot:
+            if row.brand_id != current_brand:
+                current_brand = row.brand_id
+                data.append([Paragraph(f"■ {row.brand_name}", bold_style), "", ""])
                 table_style.add('SPAN', (0, row_idx), (-1, row_idx))
                 table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#f1f5f9'))
                 table_style.add('BOTTOMPADDING', (0, row_idx), (-1, row_idx), 6)
                 table_style.add('TOPPADDING', (0, row_idx), (-1, row_idx), 6)
                 row_idx += 1
             
-            invs = Inventory.objects.filter(tool=tool, status='재고').order_by('date')
-            count = invs.count()
+            count = row.stock_count
             total_qty += count
-            
-            serials = [inv.serial for inv in invs if inv.serial]
-            no_serial_count = invs.filter(Q(serial__isnull=True) | Q(serial__exact='')).count()
-            
-            parts = []
-            if serials:
-                parts.append(", ".join(serials))
-            if no_serial_count > 0:
-                parts.append(f"S/N 없음: {no_serial_count}개")
-            
-            serial_text = " / ".join(parts) if parts else "-"
+            serial_text = row.stock_serial_summary()
 
             data.append([
-                Paragraph(tool.model_name, normal_style),
+                Paragraph(row.model_name, normal_style),
                 Paragraph(str(count), center_style),
                 Paragraph(serial_text, normal_style)
             ])
@@ -1174,8 +1047,8 @@ class ToolStockSummaryAdmin(ModelAdmin):
             row_idx += 1
 
         data.append([
-            Paragraph("<b>총합계 (Total)</b>", ParagraphStyle('T1', parent=bold_style, alignment=1)),
-            Paragraph(f"<b>{total_qty}</b>", ParagraphStyle('T2', parent=bold_style, alignment=1)),
+            Paragraph("<b>총합계 (Total)</b>", styles["total"]),
+            Paragraph(f"<b>{total_qty}</b>", styles["total"]),
             ""
         ])
         table_style.add('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor('#f8fafc'))
@@ -1196,66 +1069,13 @@ class ToolStockSummaryAdmin(ModelAdmin):
 
     @unfold_action(description="재고 내역 출력 (Excel)", attrs={"style": "background-color: #10b981; color: white; border: none;"})
     def export_stock_excel(self, request, queryset):
-        import io
-        import openpyxl
-        from django.http import HttpResponse
         from django.utils import timezone
-        from openpyxl.styles import Font, Alignment
-        from django.db.models import Q
-        
-        queryset = queryset.select_related('brand').order_by('brand__name', 'model_name')
-        
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "재고현황"
-        
-        headers = ["브랜드", "모델명", "수량", "재고 내역(시리얼)"]
-        ws.append(headers)
-        
-        header_font = Font(bold=True)
-        for col_num, cell in enumerate(ws[1], 1):
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        for tool in queryset:
-            brand_name = tool.brand.name if tool.brand else "미지정"
-            model_name = tool.model_name
-            
-            invs = Inventory.objects.filter(tool=tool, status='재고').order_by('date')
-            count = invs.count()
-            
-            serials = [inv.serial for inv in invs if inv.serial]
-            no_serial_count = invs.filter(Q(serial__isnull=True) | Q(serial__exact='')).count()
-            
-            parts = []
-            if serials:
-                parts.append(", ".join(serials))
-            if no_serial_count > 0:
-                parts.append(f"S/N 없음: {no_serial_count}개")
-            
-            serial_text = " / ".join(parts) if parts else "재고 없음"
-            
-            ws.append([brand_name, model_name, count, serial_text])
-            
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 10
-        ws.column_dimensions['D'].width = 50
-        
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
+        from .models import Inventory
         
-        import urllib.parse
+        # 선택 장비의 재고를 정렬된 단일 쿼리로 스트리밍하여 장비별로 묶음
+        snapshot = Inventory.objects.filter(tool__in=queryset.values('pk')).stock_snapshot()
         filename = f"선택_재고내역_{timezone.now().strftime('%Y%m%d_%H%M')}.xlsx"
-        encoded_filename = urllib.parse.quote(filename.encode('utf-8'))
-        
-        response = HttpResponse(
-            buffer,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
-        return response
+        return xlsx_response(filename, self.xlsx_columns, snapshot, sheet_title="재고현황")
 
 # ── 투두리스트 관리 ──
 from .models import TodoItem
@@ -1,7 +1,16 @@
+import itertools
 import uuid
-from django.db import models
+from django.db import models, transaction
 # Removing legacy Supplier, ReleaseSupplier, ItemName classes since we map to as_app models now.
 
+class InventoryBatchQuerySet(models.QuerySet):
+    def refresh_counters(self):
+        """품목 수(inventory_count)/장비 요약(tools_summary) 컬럼을 재고 행 기준으로 다시 계산"""
+        from as_app.utils.batch_counters import refresh_batch_counters
+
+        return refresh_batch_counters(self, "inventories", "inventory_count")
+
+
 class InventoryBatch(models.Model):
     """입고 배치 - 한 번에 여러 툴/장비를 입고 등록"""
     inbound_date = models.DateField("입고 날짜")
@@ -13,13 +22,35 @@ class InventoryBatch(models.Model):
     )
     created_at = models.DateTimeField("생성일", auto_now_add=True)
 
+    # ── 비정규화 카운터 (배치 저장/재고 삭제 시 refresh_counters()로 갱신) ──
+    inventory_count = models.PositiveIntegerField("품목 수", default=0, editable=False)
+    tools_summary = models.TextField("입고 장비", blank=True, editable=False)
+
+    objects = InventoryBatchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "입고 등록"
         verbose_name_plural = "입고 등록"
         ordering = ["-inbound_date", "-created_at"]
 
     def __str__(self):
-        return f"{self.inbound_date} | {self.supplier.name} ({self.inventories.count()}건)"
+        return f"{self.inbound_date} | {self.supplier.name} ({self.inventory_count}건)"
+
+    def refresh_counters(self):
+        """이 배치의 카운터 컬럼을 다시 계산하고 인스턴스 값도 갱신"""
+        if not self.pk:
+            return
+        InventoryBatch.objects.filter(pk=self.pk).refresh_counters()
+        self.refresh_from_db(fields=["inventory_count", "tools_summary"])
+
+
+class OutboundBatchQuerySet(models.QuerySet):
+    def refresh_counters(self):
+        """품목 수(ticket_count)/장비 요약(tools_summary) 컬럼을 출고 티켓 기준으로 다시 계산"""
+        from as_app.utils.batch_counters import refresh_batch_counters
+
+        return refresh_batch_counters(self, "tickets", "ticket_count")
+
 
 class OutboundBatch(models.Model):
     """출고 배치 - 한 번에 여러 툴/장비를 출고 등록"""
@@ -32,13 +63,26 @@ class OutboundBatch(models.Model):
     )
     created_at = models.DateTimeField("생성일", auto_now_add=True)
 
+    # ── 비정규화 카운터 (배치 저장/출고 티켓 삭제 시 refresh_counters()로 갱신) ──
+    ticket_count = models.PositiveIntegerField("품목 수", default=0, editable=False)
+    tools_summary = models.TextField("출고 장비", blank=True, editable=False)
+
+    objects = OutboundBatchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "출고 등록"
         verbose_name_plural = "출고 등록"
         ordering = ["-release_date", "-created_at"]
 
     def __str__(self):
-        return f"{self.release_date} | {self.release_company.name} ({self.tickets.count()}건)"
+        return f"{self.release_date} | {self.release_company.name} ({self.ticket_count}건)"
+
+    def refresh_counters(self):
+        """이 배치의 카운터 컬럼을 다시 계산하고 인스턴스 값도 갱신"""
+        if not self.pk:
+            return
+        OutboundBatch.objects.filter(pk=self.pk).refresh_counters()
+        self.refresh_from_db(fields=["ticket_count", "tools_summary"])
 
 class OutboundTicket(models.Model):
     batch = models.ForeignKey(
@@ -78,6 +122,154 @@ class OutboundTicket(models.Model):
     def __str__(self):
         return f"{self.tool.model_name} ({self.quantity}개)"
 
+    def allocate_inventories(self, batch=None, owned_ids=(), max_attempts=3):
+        """출고 대상 재고를 확정하고 '출고' 상태로 일괄 변경 — AllocationResult 반환
+
+        - 시리얼을 직접 선택한 경우: 선택된 행을 잠근 뒤 아직 '재고'인 행만 출고 처리
+          (owned_ids: 수정 화면에서 이미 이 티켓으로 출고된 행 — 출고 정보만 갱신)
+          그 사이 다른 출고로 빠져나간 행은 연결을 해제하고 결과의 unavailable로 알린다.
+        - 선택이 없는 경우: quantity만큼 입고일 순(선입선출)으로 자동 배정.
+          select_for_update(skip_locked=True)로 다른 출고 등록이 잡고 있는 행은 건너뛰며,
+          재고가 모자라면 배정된 만큼만 출고하고 결과의 shortfall로 알린다.
+        상태 변경은 UPDATE 1회, M2M 연결은 through 테이블 bulk_create 1회로 처리한다.
+        동시 출고와 계속 겹쳐 max_attempts번 모두 실패하면 아무것도 바꾸지 않고 conflict=True를 반환한다.
+        """
+        batch = batch or self.batch
+        for _ in range(max_attempts):
+            try:
+                with transaction.atomic():
+                    return self._allocate_inventories(batch, set(owned_ids))
+            except _AllocationConflict:
+                # 행 잠금을 지원하지 않는 DB(SQLite)에서 동시 출고와 겹친 경우 재시도
+                continue
+        return AllocationResult(self, requested=self.quantity or 1, conflict=True)
+
+    def _allocate_inventories(self, batch, owned_ids):
+        through = OutboundTicket.inventories.through
+        in_stock = Inventory.objects.filter(status='재고')
+        selected = set(self.inventories.values_list("pk", flat=True))
+
+        if selected:
+            new_ids = set(
+                in_stock.select_for_update()
+                .filter(pk__in=selected - owned_ids)
+                .values_list("pk", flat=True)
+            )
+            owned_ids &= selected
+            # 그 사이 다른 출고로 빠져나간 재고는 연결 해제
+            unavailable = selected - new_ids - owned_ids
+            if unavailable:
+                through.objects.filter(outboundticket_id=self.pk, inventory_id__in=unavailable).delete()
+            requested = len(selected)
+            links = []
+        else:
+            requested = self.quantity or 1
+            new_ids = set(
+                in_stock.select_for_update(skip_locked=True)
+                .filter(tool_id=self.tool_id)
+                .order_by("date", "pk")
+                .values_list("pk", flat=True)[:requested]
+            )
+            owned_ids = set()
+            unavailable = set()
+            links = new_ids
+
+        updated = Inventory.objects.filter(
+            models.Q(pk__in=new_ids, status='재고') | models.Q(pk__in=owned_ids)
+        ).update(
+            status='출고',
+            release_date=batch.release_date,
+            release_company_id=batch.release_company_id,
+            usage_process=self.usage_process,
+        )
+        if updated != len(new_ids) + len(owned_ids):
+            raise _AllocationConflict
+
+        through.objects.bulk_create(
+            [through(outboundticket_id=self.pk, inventory_id=pk) for pk in links]
+        )
+        self.quantity = updated
+        self.save(update_fields=["quantity"])
+        return AllocationResult(self, requested=requested, allocated=updated, unavailable=unavailable)
+
+
+class AllocationResult:
+    """출고 배정 결과
+
+    requested: 요청 수량(선택한 시리얼 수 또는 선입선출 수량) / allocated: 실제 출고된 수량
+    unavailable: 선택했지만 다른 출고로 빠져나가 연결 해제된 재고 id
+    conflict: 동시 출고와 계속 겹쳐 배정하지 못함 (아무것도 변경되지 않음)
+    """
+
+    __slots__ = ("ticket", "requested", "allocated", "unavailable", "conflict")
+
+    def __init__(self, ticket, requested, allocated=0, unavailable=(), conflict=False):
+        self.ticket = ticket
+        self.requested = requested
+        self.allocated = allocated
+        self.unavailable = set(unavailable)
+        self.conflict = conflict
+
+    @property
+    def shortfall(self):
+        return self.requested - self.allocated
+
+
+class _AllocationConflict(Exception):
+    """선입선출 배정 중 다른 트랜잭션이 같은 재고를 먼저 출고한 경우 (내부 재시도용)"""
+
+def format_stock_serials(serial_text, no_serial_count, empty="-", no_serial_format="S/N 없음: {}개"):
+    """보유 시리얼 + 시리얼 없음 수량 요약 문자열 (재고 목록/PDF/Excel 공용)"""
+    parts = []
+    if serial_text:
+        parts.append(serial_text)
+    if no_serial_count > 0:
+        parts.append(no_serial_format.format(no_serial_count))
+    return " / ".join(parts) if parts else empty
+
+
+class StockSnapshotRow:
+    """재고 스냅샷의 장비 1건 요약 (InventoryQuerySet.stock_snapshot 결과)"""
+
+    __slots__ = ("brand_id", "brand_name", "tool_id", "model_name", "stock_count", "serials", "no_serial_count")
+
+    def __init__(self, brand_id, brand_name, tool_id, model_name, serials, no_serial_count):
+        self.brand_id = brand_id
+        self.brand_name = brand_name
+        self.tool_id = tool_id
+        self.model_name = model_name
+        self.serials = serials
+        self.no_serial_count = no_serial_count
+        self.stock_count = len(serials) + no_serial_count
+
+    def stock_serial_summary(self, empty="-", no_serial_format="S/N 없음: {}개"):
+        return format_stock_serials(", ".join(self.serials), self.no_serial_count, empty, no_serial_format)
+
+
+class InventoryQuerySet(models.QuerySet):
+    def stock_snapshot(self, chunk_size=2000):
+        """현재 재고를 브랜드 > 장비 순으로 묶어 장비별 StockSnapshotRow를 차례로 반환 (generator)
+
+        정렬된 단일 쿼리를 iterator(chunk_size)로 스트리밍하면서 장비가 바뀔 때마다 한 행씩 내보내므로
+        전체 재고 수와 무관하게 한 번에 메모리에 올라가는 것은 장비 한 건 분량이다.
+        """
+        rows = (
+            self.filter(status='재고')
+            .order_by("tool__brand__name", "tool__brand_id", "tool__model_name", "tool_id", "date", "pk")
+            .values_list("tool__brand_id", "tool__brand__name", "tool_id", "tool__model_name", "serial")
+            .iterator(chunk_size=chunk_size)
+        )
+        for key, items in itertools.groupby(rows, key=lambda row: row[:4]):
+            serials = []
+            no_serial_count = 0
+            for *_, serial in items:
+                if serial:
+                    serials.append(serial)
+                else:
+                    no_serial_count += 1
+            yield StockSnapshotRow(*key, serials, no_serial_count)
+
+
 class Inventory(models.Model):
     """메인 방비/툴 재고 리스트"""
     STATUS_CHOICES = [
@@ -128,6 +320,8 @@ class Inventory(models.Model):
     status = models.CharField("상태", max_length=10, choices=STATUS_CHOICES, default='재고')
     usage_process = models.CharField("적용공정/용도", max_length=50, blank=True, null=True)
 
+    objects = InventoryQuerySet.as_manager()
+
     class Meta:
         verbose_name = "통합 입출고 이력"
         verbose_name_plural = "통합 입출고 이력"
@@ -157,13 +351,64 @@ class OutboundInventory(Inventory):
 
 from master_data.models import Tool
 
+
+class ToolStockSummaryQuerySet(models.QuerySet):
+    def with_stock(self):
+        """재고 수량 / 시리얼 없음 수량 / 보유 시리얼 목록을 한 번에 조회 (재고 있는 장비만)
+
+        PostgreSQL은 StringAgg로 시리얼을 DB에서 합치고,
+        그 외 DB(SQLite)는 재고 시리얼을 한 번의 prefetch로 읽어 Python에서 장비별로 묶는다.
+        """
+        from django.db import connections
+
+        in_stock = models.Q(inventory__status='재고')
+        no_serial = models.Q(inventory__serial__isnull=True) | models.Q(inventory__serial='')
+        qs = self.annotate(
+            stock_count=models.Count("inventory", filter=in_stock),
+            no_serial_count=models.Count("inventory", filter=in_stock & no_serial),
+        ).filter(stock_count__gt=0)
+
+        if connections[self.db].vendor == "postgresql":
+            from django.contrib.postgres.aggregates import StringAgg
+            return qs.annotate(
+                serial_agg=StringAgg(
+                    "inventory__serial", ", ",
+                    filter=in_stock & ~no_serial,
+                    order_by=("inventory__date",),
+                ),
+            )
+        return qs.prefetch_related(
+            models.Prefetch(
+                "inventory_set",
+                queryset=Inventory.objects.filter(status='재고')
+                .exclude(models.Q(serial__isnull=True) | models.Q(serial=''))
+                .order_by("date")
+                .only("id", "tool_id", "serial"),
+                to_attr="in_stock_serials",
+            )
+        )
+
+
 class ToolStockSummary(Tool):
     """툴별 현재 재고 수량 및 시리얼 조회를 위한 프록시 모델"""
+
+    objects = ToolStockSummaryQuerySet.as_manager()
+
     class Meta:
         proxy = True
         verbose_name = "재고 현황"
         verbose_name_plural = "재고"
 
+    @property
+    def stock_serial_text(self):
+        """with_stock()으로 조회한 보유 시리얼 (입고일 순, 쉼표 구분)"""
+        if hasattr(self, "in_stock_serials"):
+            return ", ".join(inv.serial for inv in self.in_stock_serials)
+        return getattr(self, "serial_agg", None) or ""
+
+    def stock_serial_summary(self, empty="-", no_serial_format="S/N 없음: {}개"):
+        return format_stock_serials(self.stock_serial_text, self.no_serial_count, empty, no_serial_format)
+
 
 class TodoItem(models.Model):
     """대시보드 투두리스트 항목"""
@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from as_app.utils.batch_counters import schedule_refresh
+
+from .models import Inventory, InventoryBatch, OutboundBatch, OutboundTicket
+
+# 프록시 모델(InboundInventory 등)로 저장/삭제하면 sender가 프록시 클래스이므로 모델마다 연결한다.
+# (sender 없는 post_delete 수신기는 프로젝트 전체의 빠른 삭제를 막는다)
+INVENTORY_MODELS = tuple(model for model in apps.get_models() if issubclass(model, Inventory))
+
+
+# ──────────────────────────────────────────────
+# 입고/출고 배치 카운터 갱신
+# 생성/수정은 배치 저장 경로(InventoryBatchAdmin/OutboundBatchAdmin.save_formset)에서 갱신하고,
+# 다른 화면에서 재고 행이나 출고 티켓을 삭제한 경우 커밋 이후 해당 배치만 다시 계산한다.
+# (배치 삭제로 CASCADE된 행은 배치가 남지 않으므로 계산하지 않는다)
+# ──────────────────────────────────────────────
+
+
+def refresh_inventory_batch_on_delete(sender, instance, **kwargs):
+    schedule_refresh(InventoryBatch, instance.batch_id)
+
+
+for model in INVENTORY_MODELS:
+    post_delete.connect(refresh_inventory_batch_on_delete, sender=model)
+
+
+@receiver(post_delete, sender=OutboundTicket)
+def refresh_outbound_batch_on_delete(sender, instance, **kwargs):
+    schedule_refresh(OutboundBatch, instance.batch_id)
+
+
+# ──────────────────────────────────────────────
+# 통합 시리얼 색인 갱신 (as_app.serials)
+# 시리얼 번호를 제외한 update_fields 저장은 건너뛴다. 재고 삭제는 FK CASCADE로 색인도 삭제된다.
+# ──────────────────────────────────────────────
+
+
+def index_inventory_serial(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "serial" not in update_fields:
+        return
+    from as_app.serials import index_serial
+    index_serial(instance)
+
+
+for model in INVENTORY_MODELS:
+    post_save.connect(index_inventory_serial, sender=model)
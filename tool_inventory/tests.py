@@ -1,3 +1,190 @@
-from django.test import TestCase
+import datetime
+import threading
+import unittest
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from master_data.models import Brand, Company, OutsourceCompany, Tool
+
+from .models import AllocationResult, Inventory, OutboundBatch, OutboundTicket
+
+TODAY = datetime.date(2026, 10, 1)
+
+
+class OutboundFixtureMixin:
+    """재고/출고 기본 데이터 (TransactionTestCase에서도 쓰도록 setUp에서 생성)"""
+
+    def setUp(self):
+        super().setUp()
+        self.brand = Brand.objects.create(name="브랜드")
+        self.tool = Tool.objects.create(brand=self.brand, model_name="모델")
+        self.supplier = OutsourceCompany.objects.create(name="입고처")
+        self.company = Company.objects.create(
+            name="출고처", business_number="123-45-67890", representative="홍길동", address="서울",
+        )
+
+    def create_stock(self, count, prefix="S"):
+        Inventory.objects.bulk_create([
+            Inventory(supplier=self.supplier, tool=self.tool, date=TODAY, serial=f"{prefix}{i:04d}")
+            for i in range(count)
+        ])
+        return list(Inventory.objects.filter(serial__startswith=prefix).order_by("pk"))
+
+    def create_ticket(self, quantity=1):
+        batch = OutboundBatch.objects.create(release_date=TODAY, release_company=self.company)
+        return OutboundTicket.objects.create(batch=batch, tool=self.tool, quantity=quantity)
+
+
+class OutboundAllocationTests(OutboundFixtureMixin, TestCase):
+    def test_fifo_allocation_releases_oldest_stock(self):
+        stock = self.create_stock(5)
+        ticket = self.create_ticket(quantity=3)
+
+        result = ticket.allocate_inventories()
+
+        self.assertEqual((result.requested, result.allocated, result.shortfall), (3, 3, 0))
+        self.assertEqual(
+            set(ticket.inventories.values_list("pk", flat=True)), {inv.pk for inv in stock[:3]}
+        )
+        self.assertEqual(Inventory.objects.filter(status="출고").count(), 3)
+
+    def test_fifo_shortfall_is_reported(self):
+        self.create_stock(2)
+        ticket = self.create_ticket(quantity=5)
+
+        result = ticket.allocate_inventories()
+
+        ticket.refresh_from_db()
+        self.assertEqual((result.allocated, result.shortfall), (2, 3))
+        self.assertEqual(ticket.quantity, 2)
+
+    def test_selected_serial_taken_elsewhere_is_reported(self):
+        first, second = self.create_stock(2)
+        other = self.create_ticket()
+        other.inventories.add(first)
+        other.allocate_inventories()
+
+        ticket = self.create_ticket(quantity=2)
+        ticket.inventories.add(first, second)
+        result = ticket.allocate_inventories()
+
+        self.assertEqual(result.unavailable, {first.pk})
+        self.assertEqual(result.allocated, 1)
+        self.assertEqual(list(ticket.inventories.values_list("pk", flat=True)), [second.pk])
+
+
+class OutboundBatchAdminTests(OutboundFixtureMixin, TestCase):
+    """출고 등록 화면 — 배정 결과가 메시지로 안내되는지 확인"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser("admin-test", "admin@example.com", None))
+
+    def post_outbound(self, quantity, inventories=()):
+        data = {
+            "release_date": TODAY.isoformat(),
+            "release_company": self.company.pk,
+            "tickets-TOTAL_FORMS": "1",
+            "tickets-INITIAL_FORMS": "0",
+            "tickets-MIN_NUM_FORMS": "1",
+            "tickets-MAX_NUM_FORMS": "1000",
+            "tickets-0-brand": self.brand.pk,
+            "tickets-0-tool": self.tool.pk,
+            "tickets-0-quantity": quantity,
+            "tickets-0-inventories": [inv.pk for inv in inventories],
+        }
+        response = self.client.post(reverse("tool_admin:tool_inventory_outboundbatch_add"), data)
+        return response, [(m.level_tag, str(m)) for m in get_messages(response.wsgi_request)]
+
+    def test_outbound_registration_releases_stock(self):
+        self.create_stock(3)
+
+        response, messages = self.post_outbound(2)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse([m for m in messages if m[0] in ("warning", "error")])
+        self.assertEqual(Inventory.objects.filter(status="출고").count(), 2)
+
+    def test_shortfall_is_reported_as_warning(self):
+        self.create_stock(3)
+        partial = lambda ticket, **kwargs: AllocationResult(ticket, requested=3, allocated=1)
+
+        with mock.patch.object(OutboundTicket, "allocate_inventories", autospec=True, side_effect=partial):
+            response, messages = self.post_outbound(3)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(("warning", f"{self.tool}: 요청 수량 3개 중 재고 1개만 출고되었습니다."), messages)
+
+    def test_allocation_conflict_rolls_back_batch(self):
+        self.create_stock(3)
+        conflict = lambda ticket, **kwargs: AllocationResult(ticket, requested=1, conflict=True)
+
+        with mock.patch.object(OutboundTicket, "allocate_inventories", autospec=True, side_effect=conflict):
+            response, messages = self.post_outbound(1)
+
+        self.assertRedirects(response, reverse("tool_admin:tool_inventory_outboundbatch_add"), fetch_redirect_response=False)
+        self.assertTrue(any(level == "error" and "다시 시도" in text for level, text in messages))
+        self.assertFalse(OutboundBatch.objects.exists())
+        self.assertFalse(Inventory.objects.filter(status="출고").exists())
+
+
+class ConcurrentOutboundAllocationTests(OutboundFixtureMixin, TransactionTestCase):
+    """여러 출고 등록이 같은 장비를 동시에 선입선출 배정해도 같은 재고가 두 번 출고되지 않는지 확인"""
+
+    WORKERS = 6
+    QUANTITY = 10
+
+    @classmethod
+    def setUpClass(cls):
+        # 메모리 SQLite 테스트 DB는 스레드 간 동시 쓰기를 지원하지 않음 (PostgreSQL 또는 파일 SQLite에서 실행)
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            raise unittest.SkipTest("메모리 SQLite 테스트 DB에서는 동시성 테스트를 건너뜀")
+        super().setUpClass()
+
+    def run_parallel(self, stock_count):
+        self.create_stock(stock_count)
+        tickets = [self.create_ticket(quantity=self.QUANTITY) for _ in range(self.WORKERS)]
+        barrier = threading.Barrier(self.WORKERS)
+        results, errors = {}, []
+
+        def allocate(ticket):
+            try:
+                barrier.wait()
+                results[ticket.pk] = ticket.allocate_inventories()
+            except Exception as exc:  # 스레드 예외는 메인 스레드에서 실패로 보고
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=allocate, args=(ticket,)) for ticket in tickets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return tickets, results
+
+    def assert_no_double_release(self, tickets, results, stock_count):
+        allocated = [set(ticket.inventories.values_list("pk", flat=True)) for ticket in tickets]
+        released = set().union(*allocated)
+        self.assertEqual(sum(len(ids) for ids in allocated), len(released), "같은 재고가 두 번 배정됨")
+        expected = min(stock_count, self.WORKERS * self.QUANTITY)
+        self.assertEqual(len(released), expected)
+        self.assertEqual(Inventory.objects.filter(status="출고").count(), expected)
+        self.assertEqual(sum(result.allocated for result in results.values()), expected)
+        self.assertFalse(any(result.conflict for result in results.values()))
+
+    def test_parallel_fifo_allocation_with_enough_stock(self):
+        stock_count = self.WORKERS * self.QUANTITY + 5
+        tickets, results = self.run_parallel(stock_count)
+        self.assert_no_double_release(tickets, results, stock_count)
+
+    def test_parallel_fifo_allocation_with_short_stock(self):
+        stock_count = self.WORKERS * self.QUANTITY // 2
+        tickets, results = self.run_parallel(stock_count)
+        self.assert_no_double_release(tickets, results, stock_count)